@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Agent Definition Index
+Compiles plugins/*/agents/*.md frontmatter into one index with body offsets.
+
+Agent definitions are 100-640 lines of markdown behind a YAML frontmatter
+block (name, description, tools, model, category, version, ...). Listing or
+routing agents used to mean opening and YAML-parsing every file. The build
+step parses each file once and writes .ai/index/agents.json: the
+frontmatter of every agent plus the byte offset and length of its body and
+of each `## ` section in it.
+
+Listing, filtering by category/model and cross-checking against
+VARIABLES.yaml `agents:` read only the index. A body (or one section) is
+read on demand with a single seek + read when an agent is activated.
+
+The index is a local build artifact (gitignored, like .ai/.cache/) and
+is built on first use. Each entry records its file's (mtime, size) and
+content hash. list and verify stat every agent file: a file whose stat
+changed is re-hashed, a touched file only gets its stat refreshed, and an
+edited, added or removed file triggers a rebuild. Either way the index is
+written back, so the next listing reads only the index again.
+
+Like sync_marketplace_from_variables.py the build is content-addressed:
+source_hash covers every agent file, and an unchanged tree is not
+re-parsed. Agents without a `category` in their frontmatter take the one
+from VARIABLES.yaml when listing.
+
+Usage:
+    python3 .ai/scripts/agent_index.py build [--check]       # Write the index (--check: exit 1 if stale)
+    python3 .ai/scripts/agent_index.py list [--category development] [--model sonnet] [--json]
+    python3 .ai/scripts/agent_index.py show backend [--section "Core Responsibilities"]
+    python3 .ai/scripts/agent_index.py verify                # Index vs. VARIABLES.yaml agents:
+
+Library:
+    from agent_index import AgentIndex
+    AgentIndex().body("backend")
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "config"))
+
+INDEX_PATH = BASE_DIR / ".ai" / "index" / "agents.json"
+AGENT_GLOB = "plugins/*/agents/*.md"
+INDEX_VERSION = 2
+
+# Frontmatter fields kept at the top level of each entry; the rest go under "extra"
+CORE_FIELDS = ("name", "description", "tools", "model", "category", "version")
+
+
+def parse_yaml(text):
+    try:
+        from variables import parse_yaml as parse
+    except ImportError:
+        import yaml
+        return yaml.safe_load(text) or {}
+    return parse(text)
+
+
+def split_frontmatter(raw):
+    """(frontmatter text, body byte offset) for a markdown file's bytes; ("", 0) without frontmatter."""
+    if not raw.startswith(b"---\n"):
+        return "", 0
+    end = raw.find(b"\n---\n", 3)
+    if end == -1:
+        return "", 0
+    return raw[4:end + 1].decode("utf-8"), end + 5
+
+
+def section_offsets(raw, start):
+    """[[heading, offset, length]] for `## ` sections of the body (outside code fences)."""
+    sections, fenced, offset = [], False, start
+    for line in raw[start:].splitlines(keepends=True):
+        if line.startswith(b"```"):
+            fenced = not fenced
+        elif line.startswith(b"## ") and not fenced:
+            if sections:
+                sections[-1][2] = offset - sections[-1][1]
+            sections.append([line[3:].decode("utf-8").strip(), offset, 0])
+        offset += len(line)
+    if sections:
+        sections[-1][2] = len(raw) - sections[-1][1]
+    return sections
+
+
+def heading_key(heading):
+    """Comparable heading text: '🔧 Core Responsibilities' → 'core responsibilities'."""
+    start = next((i for i, c in enumerate(heading) if c.isalnum()), len(heading))
+    return heading[start:].strip().lower()
+
+
+def normalize_tools(tools):
+    if isinstance(tools, str):
+        return [tool.strip() for tool in tools.split(",") if tool.strip()]
+    return list(tools or [])
+
+
+def parse_agent(path, root=BASE_DIR):
+    """Index entry for one agent file."""
+    raw = path.read_bytes()
+    st = path.stat()
+    frontmatter, body_offset = split_frontmatter(raw)
+    meta = parse_yaml(frontmatter) if frontmatter else {}
+    if not isinstance(meta, dict):
+        meta = {}
+    entry = {field: meta.get(field) for field in CORE_FIELDS}
+    entry["name"] = entry["name"] or path.stem
+    entry["tools"] = normalize_tools(entry["tools"])
+    entry.update({
+        "plugin": path.parent.parent.name,
+        "path": str(path.relative_to(root)),
+        "stat": [st.st_mtime_ns, st.st_size],
+        "sha": hashlib.sha256(raw).hexdigest(),
+        "body_offset": body_offset,
+        "body_bytes": len(raw) - body_offset,
+        "sections": section_offsets(raw, body_offset),
+        "extra": {key: value for key, value in meta.items() if key not in CORE_FIELDS},
+    })
+    return entry
+
+
+def agent_files(root=BASE_DIR):
+    return sorted(root.glob(AGENT_GLOB))
+
+
+def compute_source_hash(files, root=BASE_DIR):
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.relative_to(root)).encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def render_index(index):
+    """Compact JSON, one agent per line (small diffs when one agent changes)."""
+    agents = ",\n".join(json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
+                        for entry in index["agents"])
+    return (f'{{"version":{index["version"]},"source_hash":"{index["source_hash"]}","agents":[\n'
+            f'{agents}\n]}}\n')
+
+
+def write_index(index, index_path=INDEX_PATH):
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(render_index(index))
+    os.replace(tmp, index_path)
+
+
+def refresh_stats(index, root=BASE_DIR):
+    """Bring recorded (mtime, size) up to date for files whose content is unchanged. Returns True if any moved."""
+    moved = False
+    for entry in index["agents"]:
+        st = os.stat(root / entry["path"])
+        if entry["stat"] != [st.st_mtime_ns, st.st_size]:
+            entry["stat"] = [st.st_mtime_ns, st.st_size]
+            moved = True
+    return moved
+
+
+def build_index(root=BASE_DIR, index_path=INDEX_PATH, check=False):
+    """(status, index): status is 'unchanged', 'stale' (check only) or 'written'.
+    An index whose content is current but whose recorded stats are not (a fresh clone,
+    a checkout) gets its stats rewritten."""
+    files = agent_files(root)
+    source_hash = compute_source_hash(files, root)
+    try:
+        with open(index_path, 'r') as f:
+            existing = json.load(f)
+    except (OSError, ValueError):
+        existing = None
+    if existing and existing.get("version") == INDEX_VERSION and existing.get("source_hash") == source_hash:
+        if check or not refresh_stats(existing, root):
+            return "unchanged", existing
+        write_index(existing, index_path)
+        return "written", existing
+    index = {"version": INDEX_VERSION, "source_hash": source_hash,
+             "agents": [parse_agent(path, root) for path in files]}
+    if check:
+        return "stale", index
+    write_index(index, index_path)
+    return "written", index
+
+
+class AgentIndex:
+    """Read side: the index file only, bodies on demand."""
+
+    def __init__(self, index_path=INDEX_PATH, root=BASE_DIR):
+        self.root = root
+        self.index_path = index_path
+        try:
+            with open(index_path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = None
+        if not data or data.get("version") != INDEX_VERSION:
+            # Not built yet (or an older format): build it once rather than fail
+            _, data = build_index(root, index_path)
+        self._load(data)
+
+    def _load(self, data):
+        self.data = data
+        self.agents = {entry["name"]: entry for entry in data["agents"]}
+        self._registry = None
+
+    def _check(self, entry):
+        """'fresh', 'touched' (stat moved, same content; stat updated in place) or 'edited'."""
+        path = self.root / entry["path"]
+        st = os.stat(path)
+        if [st.st_mtime_ns, st.st_size] == entry["stat"]:
+            return "fresh"
+        if st.st_size == entry["stat"][1] and hashlib.sha256(path.read_bytes()).hexdigest() == entry["sha"]:
+            entry["stat"] = [st.st_mtime_ns, st.st_size]
+            return "touched"
+        return "edited"
+
+    def refresh(self):
+        """Re-check every agent file against the index and write back what moved.
+        Returns the number of files that were edited, added or removed (0: only stats, if anything)."""
+        known = {entry["path"] for entry in self.agents.values()}
+        current = {str(path.relative_to(self.root)) for path in agent_files(self.root)}
+        changed = len(known ^ current)
+        touched = False
+        for entry in self.agents.values():
+            if entry["path"] not in current:
+                continue
+            state = self._check(entry)
+            changed += state == "edited"
+            touched |= state == "touched"
+        if changed:
+            _, data = build_index(self.root, self.index_path)
+            self._load(data)
+        elif touched:
+            write_index(self.data, self.index_path)
+        return changed
+
+    @property
+    def registry(self):
+        """VARIABLES.yaml agents: by plugin directory (core and optional teams)."""
+        if self._registry is None:
+            try:
+                from variables import get
+                teams = get("agents", {}) or {}
+            except ImportError:
+                teams = {}
+            self._registry = {agent.get("plugin"): agent
+                              for members in teams.values() if isinstance(members, list)
+                              for agent in members}
+        return self._registry
+
+    def category(self, entry):
+        return entry.get("category") or self.registry.get(entry["plugin"], {}).get("category")
+
+    def list(self, category=None, model=None):
+        entries = list(self.agents.values())
+        if category:
+            entries = [e for e in entries if (self.category(e) or "").lower() == category.lower()]
+        if model:
+            entries = [e for e in entries if model.lower() in (e.get("model") or "").lower()]
+        return entries
+
+    def get(self, name):
+        try:
+            return self.agents[name]
+        except KeyError:
+            raise KeyError(f"Unknown agent '{name}' (have: {', '.join(self.agents)})")
+
+    def body(self, name, section=None):
+        """Body text (or one `## ` section) of an agent, read by offset."""
+        entry = self.get(name)
+        state = self._check(entry)
+        if state == "edited":
+            self.refresh()
+            entry = self.get(name)
+        elif state == "touched":
+            write_index(self.data, self.index_path)
+        path = self.root / entry["path"]
+        start, length = entry["body_offset"], entry["body_bytes"]
+        if section:
+            wanted = heading_key(section)
+            match = (next((s for s in entry["sections"] if heading_key(s[0]) == wanted), None)
+                     or next((s for s in entry["sections"] if wanted in heading_key(s[0])), None))
+            if match is None:
+                raise KeyError(f"No section '{section}' in {name} "
+                               f"(have: {', '.join(s[0] for s in entry['sections'])})")
+            _, start, length = match
+        with open(path, 'rb') as f:
+            f.seek(start)
+            return f.read(length).decode("utf-8")
+
+    def verify(self):
+        """(errors, warnings) comparing the index with VARIABLES.yaml agents:."""
+        errors, warnings = [], []
+        by_plugin = {entry["plugin"]: entry for entry in self.agents.values()}
+        for plugin, agent in self.registry.items():
+            entry = by_plugin.get(plugin)
+            if not entry:
+                errors.append(f"{agent.get('id')}: no agent definition in plugins/{plugin}/agents/")
+                continue
+            if entry["name"] != agent.get("id"):
+                errors.append(f"{entry['path']}: name '{entry['name']}' != VARIABLES id '{agent.get('id')}'")
+            default_model = str(agent.get("default_model") or "").lower()
+            if entry.get("model") and entry["model"].lower() not in default_model:
+                errors.append(f"{entry['path']}: model '{entry['model']}' != VARIABLES default_model "
+                              f"'{agent.get('default_model')}'")
+            if not entry.get("category"):
+                warnings.append(f"{entry['path']}: no category in frontmatter (VARIABLES: {agent.get('category')})")
+            elif entry["category"] != agent.get("category"):
+                errors.append(f"{entry['path']}: category '{entry['category']}' != VARIABLES "
+                              f"'{agent.get('category')}'")
+            if not entry.get("version"):
+                warnings.append(f"{entry['path']}: no version in frontmatter")
+        for plugin, entry in by_plugin.items():
+            if plugin not in self.registry:
+                warnings.append(f"{entry['path']}: not listed in VARIABLES.yaml agents:")
+        return errors, warnings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agent definition index (.ai/index/agents.json)")
+    sub = parser.add_subparsers(dest="command")
+    build = sub.add_parser("build", help="Compile agent frontmatter into the index")
+    build.add_argument("--check", action="store_true", help="Exit 1 if the index is stale, never write")
+    listing = sub.add_parser("list", help="List agents from the index")
+    listing.add_argument("--category")
+    listing.add_argument("--model")
+    listing.add_argument("--json", action="store_true")
+    show = sub.add_parser("show", help="Print an agent's body (read by offset)")
+    show.add_argument("name")
+    show.add_argument("--section", help="Only this `## ` section")
+    sub.add_parser("verify", help="Cross-check the index against VARIABLES.yaml agents:")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        status, index = build_index(check=args.check)
+        if status == "stale":
+            print(f"❌ {INDEX_PATH.relative_to(BASE_DIR)} is stale (run: agent_index.py build)")
+            return 1
+        icon = "✅" if status == "written" else "ℹ️ "
+        print(f"{icon} {len(index['agents'])} agents, index {status}")
+        return 0
+
+    try:
+        index = AgentIndex()
+        if args.command in ("list", "verify"):
+            index.refresh()
+        if args.command == "list":
+            entries = index.list(args.category, args.model)
+            if args.json:
+                print(json.dumps([{k: e[k] for k in (*CORE_FIELDS, "plugin", "path")} for e in entries], indent=2))
+            else:
+                for e in entries:
+                    print(f"{e['name']:<15} {e.get('model') or '-':<8} {index.category(e) or '-':<13} "
+                          f"{e.get('version') or '-':<7} {e['body_bytes']:>7} B  {', '.join(e['tools'])}")
+            return 0
+        if args.command == "show":
+            print(index.body(args.name, args.section), end="")
+            return 0
+        if args.command == "verify":
+            errors, warnings = index.verify()
+            for warning in warnings:
+                print(f"⚠️  {warning}")
+            for error in errors:
+                print(f"❌ {error}")
+            print(f"\n{len(index.agents)} agents: {len(errors)} errors, {len(warnings)} warnings")
+            return 1 if errors else 0
+    except KeyError as e:
+        print(f"❌ {e.args[0]}", file=sys.stderr)
+        return 2
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
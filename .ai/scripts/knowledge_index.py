@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Knowledge Index
+BM25 search over the sections of skills and pattern docs.
+
+skills/*/SKILL.md and the extracted pattern docs (patterns/, .ai/patterns/)
+are thousands of lines, and the pattern library only grows. Loading whole
+documents to find the two sections that matter wastes context. This splits
+every document into `##` / `###` sections, indexes them with BM25
+(headings count double) and returns the top-k sections for a query. Each
+hit is stored as a byte range into its source, so only the matching
+sections are read.
+
+The index lives in .ai/.cache/knowledge.marshal and is updated
+incrementally: a file whose (mtime, size) is unchanged is skipped, a
+touched file is re-hashed, and only files whose content hash changed are
+re-tokenized. Search refreshes the index first, so it is never stale.
+Extra directories given with --path are remembered in the index, so a
+later run without the flag keeps their sections (--forget drops one).
+
+Usage:
+    python3 .ai/scripts/knowledge_index.py search "retry with backoff" [-k 5] [--refs]
+    python3 .ai/scripts/knowledge_index.py search "sprint velocity" --max-tokens 800
+    python3 .ai/scripts/knowledge_index.py build [--path ~/.claude-framework/patterns]
+    python3 .ai/scripts/knowledge_index.py build --forget ~/.claude-framework/patterns
+    python3 .ai/scripts/knowledge_index.py stats
+
+Library:
+    from knowledge_index import KnowledgeIndex
+    for hit in KnowledgeIndex().search("graceful shutdown", k=3):
+        print(hit.title, hit.text())
+"""
+
+import argparse
+import hashlib
+import heapq
+import marshal
+import math
+import os
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+INDEX_PATH = BASE_DIR / ".ai" / ".cache" / "knowledge.marshal"
+SOURCE_GLOBS = ("skills/*/SKILL.md", "patterns/**/*.md", ".ai/patterns/**/*.md")
+INDEX_VERSION = 2
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+CHARS_PER_TOKEN = 4
+DEFAULT_K = 5
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9_]+")
+STOPWORDS = frozenset(
+    "the and for with from this that are was were will not you your into when then than use "
+    "using can has have but all any how what why who which its our out one each also more "
+    "should must may just only they them their there here been being does done".split())
+SUFFIXES = ("ing", "ed", "es", "s")
+
+
+def stem(word):
+    """Cheap suffix stripping so 'tests'/'testing'/'tested' meet."""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    return [stem(word) for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+
+
+def split_sections(raw):
+    """[(title, offset, length)] for `##`/`###` sections outside code fences, in bytes.
+    Text before the first heading is a section titled by the `#` heading (or 'Overview')."""
+    sections, fenced, offset = [], False, 0
+    title, start, parent = "Overview", 0, ""
+    for line in raw.splitlines(keepends=True):
+        if line.startswith(b"```"):
+            fenced = not fenced
+        elif not fenced and line.startswith(b"#"):
+            level = len(line) - len(line.lstrip(b"#"))
+            heading = line[level:].decode("utf-8", "replace").strip()
+            if level == 1 and offset == start:
+                title = heading or title
+            elif level in (2, 3):
+                if offset > start:
+                    sections.append((title, start, offset - start))
+                if level == 2:
+                    parent = heading
+                    title = heading
+                else:
+                    title = f"{parent} › {heading}" if parent else heading
+                start = offset
+        offset += len(line)
+    if offset > start:
+        sections.append((title, start, offset - start))
+    return sections
+
+
+class Hit:
+    __slots__ = ("path", "title", "offset", "length", "score")
+
+    def __init__(self, path, title, offset, length, score):
+        self.path = path
+        self.title = title
+        self.offset = offset
+        self.length = length
+        self.score = score
+
+    @property
+    def tokens(self):
+        return max(1, self.length // CHARS_PER_TOKEN)
+
+    def text(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            return f.read(self.length).decode("utf-8", "replace")
+
+
+class KnowledgeIndex:
+    """Per-file section term counts plus the merged BM25 postings, persisted together."""
+
+    def __init__(self, root=BASE_DIR, index_path=INDEX_PATH, extra_paths=()):
+        self.root = Path(root)
+        self.index_path = Path(index_path)
+        self.extra_paths = []   # Remembered --path directories (absolute, as strings)
+        self.files = {}     # path -> {"sha", "stat", "sections": [(title, offset, length, {term: tf})]}
+        self.docs = []      # doc id -> (path, title, offset, length, doc length)
+        self.postings = {}  # term -> [(doc id, tf)]
+        self.avgdl = 0.0
+        self._paths_changed = False
+        self._load()
+        for directory in extra_paths:
+            self.add_path(directory)
+
+    # ── storage ──────────────────────────────────────────────
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                version, *state = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if version == INDEX_VERSION:
+            self.extra_paths, self.files, self.docs, self.postings, self.avgdl = state
+
+    def _save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(marshal.dumps((INDEX_VERSION, self.extra_paths, self.files, self.docs,
+                                       self.postings, self.avgdl)))
+        os.replace(tmp, self.index_path)
+
+    def add_path(self, directory):
+        """Index an extra directory of .md docs from now on."""
+        directory = str(Path(directory).expanduser().resolve())
+        if directory not in self.extra_paths:
+            self.extra_paths.append(directory)
+            self._paths_changed = True
+
+    def forget_path(self, directory):
+        """Stop indexing an extra directory. Returns False if it was not indexed."""
+        directory = str(Path(directory).expanduser().resolve())
+        if directory not in self.extra_paths:
+            return False
+        self.extra_paths.remove(directory)
+        self._paths_changed = True
+        return True
+
+    # ── building ─────────────────────────────────────────────
+
+    def sources(self):
+        paths = set()
+        for pattern in SOURCE_GLOBS:
+            paths.update(self.root.glob(pattern))
+        for directory in self.extra_paths:
+            paths.update(Path(directory).rglob("*.md"))
+        return sorted(str(path) for path in paths if path.is_file())
+
+    @staticmethod
+    def index_file(raw):
+        sections = []
+        for title, offset, length in split_sections(raw):
+            text = raw[offset:offset + length].decode("utf-8", "replace")
+            counts = Counter(tokenize(text))
+            for term in tokenize(title):
+                counts[term] += TITLE_WEIGHT - 1
+            sections.append((title, offset, length, dict(counts)))
+        return sections
+
+    def refresh(self):
+        """Bring the index up to date. Returns (re-tokenized, removed) file counts."""
+        changed, touched, current = 0, False, set()
+        for path in self.sources():
+            current.add(path)
+            st = os.stat(path)
+            stat_key = (st.st_mtime_ns, st.st_size)
+            entry = self.files.get(path)
+            if entry and entry["stat"] == stat_key:
+                continue
+            raw = Path(path).read_bytes()
+            sha = hashlib.sha256(raw).hexdigest()
+            touched = True
+            if entry and entry["sha"] == sha:
+                entry["stat"] = stat_key  # Touched, same content: nothing to re-tokenize
+                continue
+            self.files[path] = {"sha": sha, "stat": stat_key, "sections": self.index_file(raw)}
+            changed += 1
+        removed = [path for path in self.files if path not in current]
+        for path in removed:
+            del self.files[path]
+        if changed or removed:
+            self._merge()
+        if touched or removed or self._paths_changed:
+            self._save()
+            self._paths_changed = False
+        return changed, len(removed)
+
+    def _merge(self):
+        """Rebuild doc table and postings from the per-file term counts (no re-tokenizing)."""
+        self.docs, self.postings = [], {}
+        for path in sorted(self.files):
+            for title, offset, length, counts in self.files[path]["sections"]:
+                doc_id = len(self.docs)
+                self.docs.append((path, title, offset, length, sum(counts.values())))
+                for term, tf in counts.items():
+                    self.postings.setdefault(term, []).append((doc_id, tf))
+        self.avgdl = sum(doc[4] for doc in self.docs) / len(self.docs) if self.docs else 0.0
+
+    # ── search ───────────────────────────────────────────────
+
+    def search(self, query, k=DEFAULT_K, refresh=True):
+        """Top-k sections for a query, best first."""
+        if refresh:
+            self.refresh()
+        n = len(self.docs)
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                dl = self.docs[doc_id][4]
+                norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / self.avgdl))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [Hit(*self.docs[doc_id][:4], score) for doc_id, score in best]
+
+
+def display_path(path, root=BASE_DIR):
+    try:
+        return str(Path(path).relative_to(root))
+    except ValueError:
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BM25 search over skill and pattern sections")
+    paths = argparse.ArgumentParser(add_help=False)
+    paths.add_argument("--path", action="append", default=[], dest="sub_paths",
+                       help="Extra directory of .md docs to index (remembered)")
+    parser.add_argument("--path", action="append", default=[], help="Extra directory of .md docs to index (remembered)")
+    sub = parser.add_subparsers(dest="command")
+    search = sub.add_parser("search", parents=[paths], help="Top-k sections for a query")
+    search.add_argument("query", nargs="+")
+    search.add_argument("-k", type=int, default=DEFAULT_K, help=f"Sections to return (default {DEFAULT_K})")
+    search.add_argument("--refs", action="store_true", help="Only list sections, don't print them")
+    search.add_argument("--max-tokens", type=int, help="Stop before the printed sections exceed this")
+    build = sub.add_parser("build", parents=[paths], help="Update the index (search does this too)")
+    build.add_argument("--forget", action="append", default=[], help="Stop indexing a remembered --path directory")
+    sub.add_parser("stats", parents=[paths], help="Index size")
+    args = parser.parse_args(argv)
+
+    index = KnowledgeIndex(extra_paths=args.path + getattr(args, "sub_paths", []))
+
+    if args.command == "build":
+        for directory in args.forget:
+            if not index.forget_path(directory):
+                print(f"⚠️  Not an indexed --path: {directory}", file=sys.stderr)
+        changed, removed = index.refresh()
+        print(f"✅ {len(index.files)} files, {len(index.docs)} sections "
+              f"({changed} re-indexed, {removed} removed)")
+        return 0
+    if args.command == "stats":
+        index.refresh()
+        tokens = sum(doc[3] for doc in index.docs) // CHARS_PER_TOKEN
+        print(f"Index: {display_path(index.index_path)}")
+        for directory in index.extra_paths:
+            print(f"  + {directory}")
+        print(f"  {len(index.files)} files, {len(index.docs)} sections, {len(index.postings)} terms, "
+              f"~{tokens} tokens of source")
+        return 0
+    if args.command == "search":
+        hits = index.search(" ".join(args.query), args.k)
+        if not hits:
+            print("ℹ️  No matching sections")
+            return 1
+        used = 0
+        for hit in hits:
+            if args.max_tokens and used + hit.tokens > args.max_tokens and used:
+                print(f"\n… {len(hits) - hits.index(hit)} more over the token budget (use --refs)")
+                break
+            used += hit.tokens
+            ref = f"{display_path(hit.path)} › {hit.title}"
+            if args.refs:
+                print(f"{hit.score:6.2f}  ~{hit.tokens:<5} {ref}")
+            else:
+                print(f"<!-- {ref} (score {hit.score:.2f}, ~{hit.tokens} tokens) -->")
+                print(hit.text().rstrip("\n") + "\n")
+        return 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
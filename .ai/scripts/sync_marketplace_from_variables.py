@@ -3,37 +3,87 @@
 Sync marketplace.json from VARIABLES.yaml
 Single source of truth: VARIABLES.yaml
 Generated output: marketplace.json
+
+Generation is content-addressed: the two inputs marketplace.json is built
+from - marketplaces.framework and owner in VARIABLES.yaml - are hashed into
+metadata.source_hash. When the hash matches, nothing is regenerated or
+written; when it changes, unchanged plugin entries are kept as-is so the
+diff only touches what moved.
+
+Needs a VARIABLES.yaml with a marketplaces.framework section (plugins with
+name/type/category/description) and owner.name / owner.github, as in
+.ai/QUICK_REFERENCE_plugin_naming_convention.md. The framework's own
+VARIABLES.yaml uses a different schema and is not an input.
+
+Usage:
+    python3 .ai/scripts/sync_marketplace_from_variables.py           # Sync if inputs changed
+    python3 .ai/scripts/sync_marketplace_from_variables.py --check   # Exit 1 on drift, never writes
+    python3 .ai/scripts/sync_marketplace_from_variables.py --force   # Regenerate regardless of hash
 """
 
+import argparse
+import hashlib
 import json
+import os
 import yaml
 import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "config"))
+
 def load_variables(variables_path):
     """Load VARIABLES.yaml from either project or framework directory"""
-    with open(variables_path, 'r') as f:
-        return yaml.safe_load(f)
+    try:
+        # Shared loader: libyaml + parsed snapshot cache (config/variables.py)
+        from variables import load_variables as load_cached
+    except ImportError:
+        with open(variables_path, 'r') as f:
+            return yaml.safe_load(f)
+    return load_cached(variables_path)
 
-def sync_marketplace(variables_path, marketplace_path, framework_path):
-    """Generate marketplace.json from VARIABLES.yaml"""
+def check_schema(variables, variables_path):
+    """Raise ValueError naming what is missing if VARIABLES.yaml can't drive the generator"""
+    variables = variables if isinstance(variables, dict) else {}
+    framework = (variables.get('marketplaces') or {}).get('framework')
+    owner = variables.get('owner') or {}
+    missing = []
+    if not isinstance(framework, dict):
+        missing.append("marketplaces.framework")
+    else:
+        missing += [f"marketplaces.framework.{key}" for key in
+                    ('name', 'version', 'description', 'github_repo', 'plugins') if key not in framework]
+    missing += [f"owner.{key}" for key in ('name', 'github') if key not in owner]
+    if missing:
+        raise ValueError(f"{variables_path} has no {', '.join(missing)}")
 
-    print("=" * 60)
-    print("Marketplace Sync from VARIABLES.yaml")
-    print("=" * 60)
-    print(f"Reading: {variables_path}")
-    print(f"Output:  {marketplace_path}")
-    print()
+def compute_source_hash(variables):
+    """Hash exactly the inputs build_marketplace() reads"""
+    relevant = {
+        "marketplace": variables['marketplaces']['framework'],
+        "owner": variables['owner'],
+    }
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
-    # Load variables
-    variables = load_variables(variables_path)
+def read_existing_marketplace(marketplace_path):
+    """Return the current marketplace.json, or None if missing/unreadable"""
+    try:
+        with open(marketplace_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def build_marketplace(variables, source_hash, existing=None):
+    """Build the marketplace.json structure, reusing unchanged entries from existing"""
 
     # Extract marketplace config
     marketplace_config = variables['marketplaces']['framework']
     plugins_config = marketplace_config['plugins']
     owner_config = variables['owner']
 
+    existing = existing or {}
+    existing_plugins = {p.get('name'): p for p in existing.get('plugins', [])}
+
     # Build marketplace.json structure
     marketplace = {
         "name": marketplace_config['name'],
@@ -49,6 +99,7 @@ def sync_marketplace(variables_path, marketplace_path, framework_path):
     }
 
     # Add plugins
+    changed_plugins = []
     for plugin in plugins_config:
         plugin_entry = {
             "name": plugin['name'],
@@ -59,8 +110,23 @@ def sync_marketplace(variables_path, marketplace_path, framework_path):
             "keywords": [plugin['type'], plugin['category']],
             "strict": False
         }
+        if existing_plugins.get(plugin['name']) == plugin_entry:
+            plugin_entry = existing_plugins[plugin['name']]
+        else:
+            changed_plugins.append(plugin['name'])
         marketplace['plugins'].append(plugin_entry)
 
+    removed_plugins = sorted(set(existing_plugins) - {p['name'] for p in plugins_config})
+
+    # Only restamp the generation time when the content actually changed
+    content_changed = (
+        changed_plugins or removed_plugins
+        or {k: v for k, v in marketplace.items() if k != 'plugins'}
+        != {k: existing.get(k) for k in marketplace if k != 'plugins'}
+    )
+    previous_stamp = existing.get('metadata', {}).get('reorganized')
+    reorganized = datetime.now().isoformat() if content_changed or not previous_stamp else previous_stamp
+
     # Add metadata
     marketplace['metadata'] = {
         "homepage": f"https://github.com/{owner_config['github']}/claude-dev-framework",
@@ -74,27 +140,95 @@ def sync_marketplace(variables_path, marketplace_path, framework_path):
             "git-worktrees",
             "specialized-agents"
         ],
-        "reorganized": datetime.now().isoformat(),
+        "reorganized": reorganized,
         "structure": "individual-plugins",
         "note": "Each agent plugin is independently loadable with its own configuration",
-        "generated_from": "VARIABLES.yaml - DO NOT EDIT marketplace.json DIRECTLY"
+        "generated_from": "VARIABLES.yaml - DO NOT EDIT marketplace.json DIRECTLY",
+        "source_hash": source_hash
     }
 
-    # Write marketplace.json
-    with open(marketplace_path, 'w') as f:
+    return marketplace, changed_plugins, removed_plugins
+
+def write_marketplace(marketplace, marketplace_path):
+    """Write marketplace.json atomically"""
+    tmp_path = Path(f"{marketplace_path}.tmp")
+    with open(tmp_path, 'w') as f:
         json.dump(marketplace, f, indent=2)
+    os.replace(tmp_path, marketplace_path)
+
+def sync_marketplace(variables_path, marketplace_path, framework_path, check=False, force=False):
+    """Generate marketplace.json from VARIABLES.yaml
+
+    Returns True if marketplace.json is (or, with check=True, would be) changed.
+    """
+
+    print("=" * 60)
+    print("Marketplace Sync from VARIABLES.yaml")
+    print("=" * 60)
+    print(f"Reading: {variables_path}")
+    print(f"Output:  {marketplace_path}")
+    print()
+
+    # Load variables
+    variables = load_variables(variables_path)
+    check_schema(variables, variables_path)
+    source_hash = compute_source_hash(variables)
+    existing = read_existing_marketplace(marketplace_path)
+
+    # Fast path: inputs unchanged since the last generation
+    if not check and not force and existing and existing.get('metadata', {}).get('source_hash') == source_hash:
+        print(f"✅ marketplace.json is up to date (source hash {source_hash[:12]})")
+        print()
+        return False
+
+    marketplace, changed_plugins, removed_plugins = build_marketplace(variables, source_hash, existing)
+    drift = marketplace != existing
+
+    if check:
+        if drift:
+            print("❌ marketplace.json is out of sync with VARIABLES.yaml")
+            for name in changed_plugins:
+                print(f"  ~ {name}")
+            for name in removed_plugins:
+                print(f"  - {name}")
+            if not changed_plugins and not removed_plugins:
+                print("  ~ marketplace header/metadata")
+            print()
+            print("    Run this script without --check to regenerate")
+        else:
+            print("✅ marketplace.json is in sync")
+        print()
+        return drift
+
+    if not drift:
+        print("✅ marketplace.json already matches VARIABLES.yaml - nothing written")
+        print()
+        return False
+
+    # Write marketplace.json
+    write_marketplace(marketplace, marketplace_path)
 
     print(f"✅ Generated marketplace.json with {len(marketplace['plugins'])} plugins")
     print()
     print("Plugins synced:")
     for plugin in marketplace['plugins']:
-        print(f"  • {plugin['name']} ({plugin['category']})")
+        marker = "  (changed)" if plugin['name'] in changed_plugins else ""
+        print(f"  • {plugin['name']} ({plugin['category']}){marker}")
+    for name in removed_plugins:
+        print(f"  • {name} (removed)")
     print()
     print("⚠️  Changes were made based on VARIABLES.yaml")
     print("    To make changes, edit VARIABLES.yaml and re-run this script")
     print()
+    return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync marketplace.json from VARIABLES.yaml")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if marketplace.json is out of date; never write")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the source hash is unchanged")
+    parser.add_argument("--variables", type=Path, help="Path to VARIABLES.yaml")
+    args = parser.parse_args()
+
     # Determine paths
     script_dir = Path(__file__).parent
     framework_dir = script_dir.parent.parent
@@ -103,7 +237,9 @@ if __name__ == "__main__":
     project_variables = framework_dir.parent / "book-cataloger" / ".ai" / "VARIABLES.yaml"
     framework_variables = framework_dir / ".ai" / "VARIABLES.yaml"
 
-    if project_variables.exists():
+    if args.variables:
+        variables_path = args.variables
+    elif project_variables.exists():
         variables_path = project_variables
     elif framework_variables.exists():
         variables_path = framework_variables
@@ -112,8 +248,17 @@ if __name__ == "__main__":
         print(f"   Looked in:")
         print(f"   - {project_variables}")
         print(f"   - {framework_variables}")
+        print("   Pass one with --variables PATH")
         sys.exit(1)
 
     marketplace_path = framework_dir / ".claude-plugin" / "marketplace.json"
 
-    sync_marketplace(variables_path, marketplace_path, framework_dir)
+    try:
+        changed = sync_marketplace(variables_path, marketplace_path, framework_dir, check=args.check, force=args.force)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        print("   This generator needs the marketplaces.framework / owner schema shown in")
+        print("   .ai/QUICK_REFERENCE_plugin_naming_convention.md")
+        sys.exit(2)
+    if args.check and changed:
+        sys.exit(1)
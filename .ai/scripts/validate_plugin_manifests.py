@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Plugin Manifest Validator
+Validates plugin.json files (and marketplace.json) against the Claude Code schema.
+
+Each manifest is parsed once and every check runs against the parsed dict;
+manifests are validated concurrently on a thread pool. Field lists are the
+ones validate_plugin_manifests.sh and scripts/validate-marketplace.sh used.
+
+Usage:
+    python3 .ai/scripts/validate_plugin_manifests.py [marketplace_path ...]
+    python3 .ai/scripts/validate_plugin_manifests.py --json         # Machine-readable results
+    python3 .ai/scripts/validate_plugin_manifests.py --jobs 16      # Thread pool size
+    python3 .ai/scripts/validate_plugin_manifests.py --marketplace .claude-plugin/marketplace.json
+
+Library:
+    from validate_plugin_manifests import validate_manifest, validate_tree
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Required fields
+REQUIRED_FIELDS = ("name", "version")
+
+# Valid optional fields
+VALID_FIELDS = ("name", "version", "description", "author", "homepage", "repository", "license",
+                "keywords", "commands", "agents", "hooks", "mcpServers")
+
+# Invalid fields that should be removed
+INVALID_FIELDS = ("dependencies", "optionalDependencies", "configuration", "scripts", "files",
+                  "installHook", "healthCheck", "integrations", "requires", "_note")
+
+# Component path fields (must be relative, starting with ./)
+PATH_FIELDS = ("commands", "agents", "hooks", "mcpServers")
+
+# marketplace.json
+MARKETPLACE_REQUIRED_FIELDS = ("name", "version", "owner", "plugins")
+MARKETPLACE_MARKDOWN_PATH_FIELDS = ("commands", "agents")
+
+DEFAULT_MARKETPLACE_PATH = Path.home() / ".claude" / "plugins" / "marketplaces" / "Claude-Dev-Framework"
+
+
+def new_result(name, path):
+    return {"plugin": name, "path": str(path), "errors": [], "warnings": []}
+
+
+def _check_paths(result, field, value, base_dir):
+    """Component paths must be relative (./...); missing targets are warnings."""
+    paths = value if isinstance(value, list) else [value]
+    for entry in paths:
+        if not isinstance(entry, str):
+            continue  # Shape errors are reported separately
+        if not entry.startswith("./"):
+            result["errors"].append(f"{field} path must be relative and start with './': {entry}")
+        elif base_dir and not (base_dir / entry).exists():
+            result["warnings"].append(f"{field} path does not exist: {entry}")
+
+
+def validate_manifest(manifest_path):
+    """Validate one plugin.json. Returns a result dict with errors/warnings."""
+    manifest_path = Path(manifest_path)
+    plugin_dir = manifest_path.parent.parent
+    result = new_result(plugin_dir.name, manifest_path)
+
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        result["errors"].append("plugin.json not found")
+        return result
+    except ValueError:
+        result["errors"].append("Invalid JSON syntax")
+        return result
+    if not isinstance(manifest, dict):
+        result["errors"].append("Manifest must be a JSON object")
+        return result
+
+    # Check required fields
+    for field in REQUIRED_FIELDS:
+        if manifest.get(field) is None:
+            result["errors"].append(f"Missing required field: {field}")
+
+    # Check author format (must be object, not string)
+    if "author" in manifest and not isinstance(manifest["author"], dict):
+        result["errors"].append(f'author must be object {{name: "..."}}, got {_json_type(manifest["author"])}')
+
+    # Check repository format (must be string, not object)
+    if "repository" in manifest and not isinstance(manifest["repository"], str):
+        result["errors"].append(f"repository must be string URL, got {_json_type(manifest['repository'])}")
+
+    # Check agents format (must be string path or array of paths, not array of objects)
+    agents = manifest.get("agents")
+    if isinstance(agents, list) and agents and isinstance(agents[0], dict):
+        result["errors"].append('agents must be path string, not array of config objects (use "agents": "./agents/")')
+
+    # Check component paths
+    for field in PATH_FIELDS:
+        value = manifest.get(field)
+        if isinstance(value, (str, list)):
+            _check_paths(result, field, value, plugin_dir)
+
+    # Check for invalid and unexpected fields
+    for field in manifest:
+        if field in INVALID_FIELDS:
+            result["warnings"].append(f"Invalid field '{field}' should be removed")
+        elif field not in VALID_FIELDS:
+            result["warnings"].append(f"Unexpected field '{field}'")
+
+    return result
+
+
+def validate_marketplace(marketplace_path):
+    """Validate marketplace.json (the checks scripts/validate-marketplace.sh ran with jq)."""
+    marketplace_path = Path(marketplace_path)
+    result = new_result(marketplace_path.name, marketplace_path)
+
+    try:
+        with open(marketplace_path, 'r') as f:
+            marketplace = json.load(f)
+    except FileNotFoundError:
+        result["errors"].append(f"{marketplace_path} not found")
+        return result
+    except ValueError:
+        result["errors"].append(f"Invalid JSON syntax in {marketplace_path}")
+        return result
+
+    if not isinstance(marketplace, dict):
+        result["errors"].append("Marketplace must be a JSON object")
+        return result
+
+    for field in MARKETPLACE_REQUIRED_FIELDS:
+        if marketplace.get(field) is None:
+            result["errors"].append(f"Missing required field: {field}")
+
+    plugins = marketplace.get("plugins")
+    if plugins is not None and not isinstance(plugins, list):
+        result["errors"].append(f"plugins must be an array, got {_json_type(plugins)}")
+        return result
+
+    for index, plugin in enumerate(plugins or []):
+        if not isinstance(plugin, dict):
+            result["errors"].append(f"plugins[{index}] must be an object, got {_json_type(plugin)}")
+            continue
+        name = plugin.get("name", "?")
+        if plugin.get("requires") is not None:
+            result["errors"].append(f"Plugin '{name}' has a 'requires' field (not supported by Claude Code schema)")
+        for field in MARKETPLACE_MARKDOWN_PATH_FIELDS:
+            value = plugin.get(field)
+            paths = value if isinstance(value, list) else []
+            for entry in paths:
+                if not isinstance(entry, str) or not entry.startswith("./") or not entry.endswith(".md"):
+                    result["errors"].append(
+                        f"Plugin '{name}': invalid {field[:-1]} path (must start with './' and end with '.md'): {entry}")
+
+    return result
+
+
+def _json_type(value):
+    return {dict: "object", list: "array", str: "string", bool: "boolean"}.get(
+        type(value), "null" if value is None else "number")
+
+
+def find_manifests(marketplace_path):
+    """All plugins/**/.claude-plugin/plugin.json under a marketplace checkout."""
+    plugins_dir = Path(marketplace_path) / "plugins"
+    found = []
+    for dirpath, dirnames, filenames in os.walk(plugins_dir):
+        dirnames[:] = [d for d in dirnames if d not in (".git", "node_modules")]
+        if "plugin.json" in filenames and os.path.basename(dirpath) == ".claude-plugin":
+            found.append(Path(dirpath) / "plugin.json")
+    return sorted(found)
+
+
+def validate_tree(marketplace_paths, jobs=None, marketplace_files=()):
+    """Validate every manifest under the given marketplaces concurrently. Returns result dicts."""
+    manifests = [m for path in marketplace_paths for m in find_manifests(path)]
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        results = list(pool.map(validate_manifest, manifests))
+        results.extend(pool.map(validate_marketplace, marketplace_files))
+    return results
+
+
+def print_results(results):
+    print("==========================================")
+    print("Plugin Manifest Validator")
+    print("==========================================")
+    print()
+    for result in results:
+        print(f"Checking: {result['plugin']}")
+        for error in result["errors"]:
+            print(f"  ❌ ERROR: {error}")
+        for warning in result["warnings"]:
+            print(f"  ⚠️  WARNING: {warning}")
+        if not result["errors"] and not result["warnings"]:
+            print("  ✅ Valid")
+        print()
+
+    errors = sum(len(r["errors"]) for r in results)
+    warnings = sum(len(r["warnings"]) for r in results)
+    print("==========================================")
+    print("Summary")
+    print("==========================================")
+    print(f"Manifests: {len(results)}")
+    print(f"Errors: {errors}")
+    print(f"Warnings: {warnings}")
+    print()
+    if errors:
+        print(f"❌ Validation failed with {errors} error(s)")
+        print("See: .ai/QUICK_REFERENCE_fixing_plugin_manifests.md for fix instructions")
+    else:
+        print("✅ All plugin manifests are valid!")
+        if warnings:
+            print(f"⚠️  {warnings} warning(s) found - consider cleaning up invalid fields")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate plugin.json manifests against the Claude Code schema")
+    parser.add_argument("marketplace_paths", nargs="*", type=Path, help="Marketplace checkout(s) containing plugins/")
+    parser.add_argument("--marketplace", action="append", type=Path, default=[],
+                        help="Also validate this marketplace.json (repeatable)")
+    parser.add_argument("--no-manifests", action="store_true", help="Only validate --marketplace files")
+    parser.add_argument("--jobs", type=int, help="Worker threads")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args(argv)
+
+    paths = [] if args.no_manifests else (args.marketplace_paths or [DEFAULT_MARKETPLACE_PATH])
+    results = validate_tree(paths, jobs=args.jobs, marketplace_files=args.marketplace)
+    errors = sum(len(r["errors"]) for r in results)
+
+    if args.json:
+        print(json.dumps({
+            "results": results,
+            "errors": errors,
+            "warnings": sum(len(r["warnings"]) for r in results),
+        }, indent=2))
+    else:
+        print_results(results)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Variable Link Index & Validator
+Builds the knowledge graph described in .ai/KNOWLEDGE_GRAPH_DESIGN.md.
+
+Forward index:  variable → usage sites, from the `_used_in` [[file:line]]
+                lists in VARIABLES.yaml (globs like plugins/*/... expanded)
+Reverse index:  file → variables, from those sites plus any
+                [[VARIABLES.yaml#<variable>]] back-references in the file
+
+The first run walks the repo once. The index is persisted to
+.ai/.cache/variable-links.json with per-file stat/hash facts, so later runs
+only re-read files whose mtime/size changed (and only re-scan those whose
+SHA-256 changed).
+
+Usage:
+    python3 .ai/scripts/variable_links.py validate [--json] [--strict]
+    python3 .ai/scripts/variable_links.py uses owner.name      # var → sites
+    python3 .ai/scripts/variable_links.py vars README.md       # file → vars
+    python3 .ai/scripts/variable_links.py build [--root PATH]  # Refresh index only
+
+Validation errors: missing file, glob with no matches, line past end of file,
+missing markdown heading, back-reference to an unknown variable.
+Warnings (errors with --strict): the variable's value is not on the linked line.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "config"))
+
+from variables import load_variables, lookup
+
+INDEX_VERSION = 1
+TEXT_SUFFIXES = {".md", ".json", ".yaml", ".yml", ".sh", ".py", ".txt"}
+SKIP_DIRS = {".git", ".cache", "node_modules", "__pycache__", ".venv", "venv", ".tox"}
+
+KEY_LINE = re.compile(r'^(\s*)([A-Za-z0-9_\-]+):')
+LINK_ITEM = re.compile(r'^\s*-\s*"?\[\[([^\]]+)\]\]')
+BACKREF = re.compile(r'\[\[VARIABLES\.yaml#([A-Za-z0-9_.\-]+)\]\]')
+HEADING = re.compile(r'^#{1,6}\s+(.*)$')
+
+_MISSING = object()
+
+
+def slugify(heading):
+    """GitHub-style heading anchor, with leading/trailing dashes trimmed."""
+    slug = re.sub(r'[^\w\- ]', '', heading.strip().lower()).replace(' ', '-')
+    return slug.strip('-')
+
+
+def parse_target(raw):
+    """Split '[[path:12]]' / '[[path:##-anchor]]' / '[[path]]' contents into (path, line, anchor)."""
+    path, line, anchor = raw.strip(), None, None
+    if ':' in path:
+        head, tail = path.rsplit(':', 1)
+        if tail.isdigit():
+            path, line = head, int(tail)
+        elif tail.startswith('#'):
+            path, anchor = head, tail.lstrip('#').strip('-')
+    return path, line, anchor
+
+
+def parse_used_in(text):
+    """Return [(variable, raw_target, variables_line)] for every `_used_in` entry.
+
+    Parsed textually: VARIABLES.yaml repeats `_used_in` keys within a mapping,
+    each following the variable it documents, which a YAML loader collapses.
+    """
+    links = []
+    stack = []          # [(indent, key)]
+    collecting = None   # Variable the current _used_in list belongs to
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+
+        key_match = KEY_LINE.match(line)
+        if key_match:
+            indent, key = len(key_match.group(1)), key_match.group(2)
+            while stack and stack[-1][0] > indent:
+                stack.pop()
+            if key == '_used_in':
+                collecting = '.'.join(k for _, k in stack) if stack else None
+                continue
+            if stack and stack[-1][0] == indent:
+                stack.pop()
+            stack.append((indent, key))
+            collecting = None
+            continue
+
+        link_match = LINK_ITEM.match(line)
+        if link_match and collecting:
+            links.append((collecting, link_match.group(1), lineno))
+        elif not line.lstrip().startswith('-'):
+            collecting = None
+
+    return links
+
+
+class LinkIndex:
+    """Persisted forward/reverse index with per-file incremental facts."""
+
+    def __init__(self, root, index_path=None):
+        self.root = Path(root).resolve()
+        self.index_path = Path(index_path) if index_path else self.root / ".ai" / ".cache" / "variable-links.json"
+        self.variables_path = self.root / "VARIABLES.yaml"
+        self.data = self._load()
+        self.stats = {"files": 0, "stat_hits": 0, "rehashed": 0, "rescanned": 0}
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("root") == str(self.root):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"version": INDEX_VERSION, "root": str(self.root), "files": {}, "checks": {}}
+
+    def save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self.data, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    # ── file facts ───────────────────────────────────────────
+
+    def _walk(self):
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                if os.path.splitext(name)[1] in TEXT_SUFFIXES:
+                    path = os.path.join(dirpath, name)
+                    yield os.path.relpath(path, self.root), path
+
+    @staticmethod
+    def _scan(raw, rel):
+        text = raw.decode("utf-8", errors="replace")
+        facts = {
+            "lines": text.count("\n") + (0 if text.endswith("\n") or not text else 1),
+            "backrefs": sorted(set(BACKREF.findall(text))),
+        }
+        if rel.endswith(".md"):
+            facts["anchors"] = sorted({slugify(m.group(1)) for m in map(HEADING.match, text.splitlines()) if m})
+        return facts
+
+    def refresh(self):
+        """Bring per-file facts up to date, touching only changed files."""
+        old_files = self.data["files"]
+        files = {}
+        for rel, path in self._walk():
+            self.stats["files"] += 1
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entry = old_files.get(rel)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                files[rel] = entry
+                self.stats["stat_hits"] += 1
+                continue
+
+            raw = Path(path).read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry and entry["sha256"] == digest:
+                self.stats["rehashed"] += 1
+                facts = {k: v for k, v in entry.items() if k not in ("mtime_ns", "size")}
+            else:
+                self.stats["rescanned"] += 1
+                facts = {"sha256": digest, **self._scan(raw, rel)}
+            files[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, **facts}
+
+        self.data["files"] = files
+        self._build_graph()
+
+    # ── graph ────────────────────────────────────────────────
+
+    def _build_graph(self):
+        files = self.data["files"]
+        variables_entry = files.get("VARIABLES.yaml")
+        if not variables_entry:
+            self.data["forward"], self.data["reverse"] = {}, {}
+            return
+
+        if self.data.get("variables_sha256") != variables_entry["sha256"] or "links" not in self.data:
+            self.data["links"] = parse_used_in(self.variables_path.read_text())
+            self.data["variables_sha256"] = variables_entry["sha256"]
+
+        forward, reverse = {}, {}
+        for variable, raw, source_line in self.data["links"]:
+            path, line, anchor = parse_target(raw)
+            matches = sorted(fnmatch.filter(files, path)) if any(c in path for c in "*?[") else [path]
+            forward.setdefault(variable, []).append({
+                "target": raw, "path": path, "line": line, "anchor": anchor,
+                "files": matches, "source_line": source_line,
+            })
+            for rel in matches:
+                reverse.setdefault(rel, set()).add(variable)
+
+        for rel, entry in files.items():
+            for variable in entry.get("backrefs", ()):
+                reverse.setdefault(rel, set()).add(variable)
+
+        self.data["forward"] = forward
+        self.data["reverse"] = {rel: sorted(v) for rel, v in sorted(reverse.items())}
+
+    # ── validation ───────────────────────────────────────────
+
+    def _value_on_line(self, rel, line, value):
+        """Cached check that str(value) appears on rel:line."""
+        sha = self.data["files"][rel]["sha256"]
+        key = f"{rel}:{line}"
+        cached = self.data["checks"].get(key)
+        if cached and cached[0] == sha and cached[1] == value:
+            return cached[2]
+        try:
+            with open(self.root / rel, 'r', errors='replace') as f:
+                text = next((t for i, t in enumerate(f, 1) if i == line), "")
+        except OSError:
+            text = ""
+        found = value in text
+        self.data["checks"][key] = [sha, value, found]
+        return found
+
+    def validate(self, strict=False):
+        """Return (errors, warnings) as lists of dicts."""
+        errors, warnings = [], []
+        files = self.data["files"]
+        try:
+            variables = load_variables(self.variables_path)
+        except Exception:
+            variables = {}
+
+        for variable, sites in self.data["forward"].items():
+            value = lookup(variables, variable, _MISSING)
+            scalar = None if value is _MISSING or isinstance(value, (dict, list)) else str(value)
+
+            for site in sites:
+                problem = dict(variable=variable, target=site["target"], source_line=site["source_line"])
+                if not site["files"]:
+                    errors.append({**problem, "message": "glob matches no files"})
+                    continue
+                for rel in site["files"]:
+                    entry = files.get(rel)
+                    if entry is None:
+                        errors.append({**problem, "file": rel, "message": "file not found"})
+                    elif site["line"] is not None and site["line"] > entry["lines"]:
+                        errors.append({**problem, "file": rel,
+                                       "message": f"line {site['line']} past end of file ({entry['lines']} lines)"})
+                    elif site["anchor"] and site["anchor"] not in entry.get("anchors", ()):
+                        errors.append({**problem, "file": rel, "message": f"heading '{site['anchor']}' not found"})
+                    elif site["line"] is not None and scalar and not self._value_on_line(rel, site["line"], scalar):
+                        (errors if strict else warnings).append(
+                            {**problem, "file": rel, "message": f"value {scalar!r} not on line {site['line']}"})
+
+        for rel, entry in files.items():
+            for variable in entry.get("backrefs", ()):
+                if lookup(variables, variable, _MISSING) is _MISSING:
+                    errors.append({"variable": variable, "file": rel, "target": f"VARIABLES.yaml#{variable}",
+                                   "message": "back-reference to unknown variable"})
+
+        return errors, warnings
+
+
+def print_problems(title, icon, problems):
+    if not problems:
+        return
+    print(f"{icon} {title} ({len(problems)}):")
+    for p in problems:
+        where = f" → {p['file']}" if p.get("file") and p["file"] not in p["target"] else ""
+        origin = f" (VARIABLES.yaml:{p['source_line']})" if p.get("source_line") else ""
+        print(f"  • {p['variable']}: [[{p['target']}]]{where} - {p['message']}{origin}")
+    print()
+
+
+def main(argv=None):
+    default_root = Path(__file__).resolve().parent.parent.parent
+    parser = argparse.ArgumentParser(description="VARIABLES.yaml link index and validator")
+    parser.add_argument("command", nargs="?", default="validate", choices=["build", "validate", "uses", "vars"])
+    parser.add_argument("name", nargs="?", help="Variable (uses) or file (vars)")
+    parser.add_argument("--root", type=Path, default=default_root, help="Repository root")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    parser.add_argument("--strict", action="store_true", help="Treat value mismatches as errors")
+    args = parser.parse_args(argv)
+
+    index = LinkIndex(args.root)
+    index.refresh()
+
+    if args.command == "build":
+        index.save()
+        s = index.stats
+        print(f"✅ Indexed {s['files']} files ({s['stat_hits']} unchanged, {s['rehashed']} touched, "
+              f"{s['rescanned']} rescanned); {len(index.data['forward'])} variables linked")
+        return 0
+
+    if args.command in ("uses", "vars"):
+        index.save()
+        if not args.name:
+            parser.error(f"{args.command} needs a {'variable' if args.command == 'uses' else 'file'}")
+        if args.command == "uses":
+            result = index.data["forward"].get(args.name, [])
+            if args.json:
+                print(json.dumps(result, indent=2))
+            for site in [] if args.json else result:
+                print(f"[[{site['target']}]]" + (f"  ({len(site['files'])} files)" if len(site['files']) > 1 else ""))
+        else:
+            result = index.data["reverse"].get(args.name, [])
+            print(json.dumps(result, indent=2) if args.json else "\n".join(result))
+        return 0 if result else 1
+
+    errors, warnings = index.validate(strict=args.strict)
+    index.save()
+    if args.json:
+        print(json.dumps({"errors": errors, "warnings": warnings, "stats": index.stats}, indent=2))
+    else:
+        print_problems("Broken links", "❌", errors)
+        print_problems("Warnings", "⚠️ ", warnings)
+        linked = sum(len(sites) for sites in index.data["forward"].values())
+        print(f"{'✅' if not errors else '❌'} {len(index.data['forward'])} variables, {linked} links, "
+              f"{len(errors)} errors, {len(warnings)} warnings")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
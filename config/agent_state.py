@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Current Agent State
+Shared reader/writer for the ~/.claude/.current_agent marker.
+
+The marker is replaced atomically (write temp file + rename) by
+hooks/track-agent.sh and write_agent(), so every change gets a new inode
+and mtime. Readers key their cache on (inode, mtime, size): one stat() per
+lookup, and the file is only re-read when that key changes.
+
+Usage:
+    python3 agent_state.py            # Print current agent
+    python3 agent_state.py Backend    # Set current agent
+"""
+
+import os
+import sys
+from pathlib import Path
+
+AGENT_FILE = Path.home() / ".claude" / ".current_agent"
+DEFAULT_AGENT = "General"
+
+
+class AgentState:
+    """mtime/inode-keyed cache of the current agent marker."""
+
+    def __init__(self, agent_file=AGENT_FILE):
+        self.agent_file = Path(agent_file)
+        self._key = None
+        self._agent = None
+
+    def _fallback(self):
+        return os.getenv("CLAUDE_CURRENT_AGENT", DEFAULT_AGENT)
+
+    def current(self):
+        """Return the current agent; re-reads the marker only when it changed."""
+        try:
+            st = os.stat(self.agent_file)
+        except OSError:
+            self._key = None
+            return self._fallback()
+
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key != self._key:
+            try:
+                with open(self.agent_file, 'r') as f:
+                    self._agent = f.read().strip()
+            except OSError:
+                return self._fallback()
+            self._key = key
+        return self._agent or self._fallback()
+
+    def set(self, agent):
+        """Atomically replace the marker."""
+        write_agent(agent, self.agent_file)
+
+    def clear(self):
+        try:
+            self.agent_file.unlink()
+        except FileNotFoundError:
+            pass
+        self._key = None
+
+
+def write_agent(agent, agent_file=AGENT_FILE):
+    """Write the marker via temp file + rename so readers never see a partial write."""
+    agent_file = Path(agent_file)
+    agent_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = agent_file.with_name(f"{agent_file.name}.{os.getpid()}")
+    tmp.write_text(f"{agent}\n")
+    os.replace(tmp, agent_file)
+
+
+_state = None
+
+
+def get_agent_state():
+    """Process-wide AgentState (kept hot by statusline_server.py)."""
+    global _state
+    if _state is None:
+        _state = AgentState()
+    return _state
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        write_agent(sys.argv[1])
+    else:
+        print(get_agent_state().current())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Context Usage Tracker
+Incremental token accounting for the status line's 📊 context display.
+
+Tails each session transcript from a remembered byte offset, so a redraw
+costs O(new bytes) instead of O(transcript size). Per-session state
+(offset, running token estimate, context window) is kept in memory and
+persisted to ~/.claude/.cache/context/<session_id>.json between runs.
+One tracker serves every thread of statusline_server.py, so updates are
+serialized with a lock.
+
+Token counting:
+- Transcript entries carrying API `usage` give the exact context size
+  (input + cache read + cache creation + output tokens)
+- Entries after the last `usage` are estimated at ~4 characters per token
+
+Context windows come from `models:` in VARIABLES.yaml via variables.py
+(matched on model id, then on model family), defaulting to 200k.
+
+Usage:
+    python3 context_tracker.py < statusline-input.json   # Print usage %
+"""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+STATE_DIR = Path.home() / ".claude" / ".cache" / "context"
+DEFAULT_CONTEXT_WINDOW = 200000
+CHARS_PER_TOKEN = 4
+READ_BLOCK_BYTES = 1024 * 1024
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+    "output_tokens",
+)
+
+
+def load_context_windows(variables_path=None):
+    """Return {model_id: context_window} and {family: context_window} from VARIABLES.yaml."""
+    try:
+        from variables import get
+    except ImportError:
+        return {}, {}
+    models = get("models", {}, variables_path) or {}
+
+    by_id, by_family = {}, {}
+    for model in models.values():
+        window = model.get("context_window")
+        if not window:
+            continue
+        by_id[model.get("id", "")] = window
+        family = model.get("name", "").split()[0].lower() if model.get("name") else ""
+        if family:
+            by_family[family] = window
+    return by_id, by_family
+
+
+def new_session_state():
+    return {
+        "transcript": None,
+        "inode": None,
+        "offset": 0,
+        "base_tokens": 0,       # Last exact context size reported by the API
+        "pending_tokens": 0,    # Estimate for entries after that report
+        "model": None,
+        "context_window": None,
+    }
+
+
+class ContextTracker:
+    """Incremental per-session context accounting."""
+
+    def __init__(self, state_dir=STATE_DIR, variables_path=None):
+        self.state_dir = Path(state_dir)
+        self.variables_path = variables_path
+        self.sessions = {}
+        self._windows = None
+        self._lock = threading.Lock()  # Offsets and pending counts are read-modify-write
+
+    # ── state ────────────────────────────────────────────────
+
+    def _state_path(self, session_id):
+        safe_id = "".join(c for c in session_id if c.isalnum() or c in "-_")
+        return self.state_dir / f"{safe_id}.json"
+
+    def _load(self, session_id):
+        state = self.sessions.get(session_id)
+        if state is None:
+            state = new_session_state()
+            try:
+                state.update(json.loads(self._state_path(session_id).read_text()))
+            except (OSError, ValueError):
+                pass
+            self.sessions[session_id] = state
+        return state
+
+    def _save(self, session_id, state):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        path = self._state_path(session_id)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+
+    # ── context window ───────────────────────────────────────
+
+    def context_window(self, model):
+        """Context window for a statusline `model` object ({id, display_name})."""
+        if self._windows is None:
+            self._windows = load_context_windows(self.variables_path)
+        by_id, by_family = self._windows
+
+        model_id = model.get("id", "")
+        if model_id in by_id:
+            return by_id[model_id]
+
+        name = f"{model_id} {model.get('display_name', '')}".lower()
+        for family, window in by_family.items():
+            if family in name:
+                return window
+        return DEFAULT_CONTEXT_WINDOW
+
+    # ── transcript tailing ───────────────────────────────────
+
+    def _count_entry(self, state, line):
+        """Update the running token count from one transcript line."""
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            state["pending_tokens"] += len(line) // CHARS_PER_TOKEN
+            return
+
+        message = entry.get("message") if isinstance(entry, dict) else None
+        usage = message.get("usage") if isinstance(message, dict) else None
+        if isinstance(usage, dict):
+            state["base_tokens"] = sum(int(usage.get(field) or 0) for field in USAGE_FIELDS)
+            state["pending_tokens"] = 0
+        else:
+            state["pending_tokens"] += len(line) // CHARS_PER_TOKEN
+
+    def _advance(self, state, transcript):
+        """Consume complete lines appended since the last call. Returns True if state changed."""
+        try:
+            st = os.stat(transcript)
+        except OSError:
+            return False
+
+        # New, replaced or truncated transcript: start over
+        if state["transcript"] != transcript or state["inode"] != st.st_ino or st.st_size < state["offset"]:
+            state.update(new_session_state(), transcript=transcript, inode=st.st_ino,
+                         model=state["model"], context_window=state["context_window"])
+
+        if st.st_size == state["offset"]:
+            return False
+
+        changed = False
+        with open(transcript, 'rb') as f:
+            f.seek(state["offset"])
+            remainder = b""
+            while True:
+                block = f.read(READ_BLOCK_BYTES)
+                if not block:
+                    break
+                block = remainder + block
+                end = block.rfind(b"\n")
+                if end < 0:
+                    remainder = block
+                    continue
+                for line in block[:end].split(b"\n"):
+                    if line.strip():
+                        self._count_entry(state, line)
+                # Only advance past complete lines; a partial tail is re-read next time
+                state["offset"] += end + 1
+                remainder = block[end + 1:]
+                changed = True
+        return changed
+
+    # ── public API ───────────────────────────────────────────
+
+    def tokens(self, session_id):
+        with self._lock:
+            state = self.sessions.get(session_id)
+            return state["base_tokens"] + state["pending_tokens"] if state else 0
+
+    def usage(self, data):
+        """Percent of the context window used by this session, or None if unknown."""
+        session_id = data.get("session_id")
+        transcript = data.get("transcript_path")
+        if not session_id or not transcript:
+            return None
+        with self._lock:
+            return self._usage(data, session_id, transcript)
+
+    def _usage(self, data, session_id, transcript):
+        state = self._load(session_id)
+        changed = self._advance(state, transcript)
+
+        model = data.get("model", {})
+        model_key = model.get("id") or model.get("display_name")
+        if state["model"] != model_key or not state["context_window"]:
+            state["model"] = model_key
+            state["context_window"] = self.context_window(model)
+            changed = True
+
+        if changed:
+            try:
+                self._save(session_id, state)
+            except OSError:
+                pass
+
+        tokens = state["base_tokens"] + state["pending_tokens"]
+        if not tokens:
+            return None
+        return min(100, round(100 * tokens / state["context_window"]))
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_tracker():
+    """Process-wide tracker (kept hot by statusline_server.py)."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = ContextTracker()
+    return _tracker
+
+
+if __name__ == "__main__":
+    percent = get_tracker().usage(json.load(sys.stdin))
+    print(f"{percent}%" if percent is not None else "unknown")
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Cost Ledger
+Append-only binary cost records with running daily/monthly aggregates.
+
+Replaces the per-day text files of the old cost-alert.sh. Each Stop event
+appends one fixed-size record and bumps the daily/monthly totals kept in a
+small summary file, so threshold checks are O(1) instead of re-summing the
+whole month.
+
+Files (in ~/.claude/logs/costs/):
+    ledger.bin     Records: timestamp (f64), agent (u16), model (u16), cost (f64)
+    summary.json   Name table, daily/monthly totals, last cost per open session
+    ledger.lock    flock() guard for concurrent sessions
+
+Thresholds come from `costs.alert_thresholds_usd` in VARIABLES.yaml (via variables.py).
+
+Usage:
+    python3 cost_ledger.py record < stop-event.json   # Stop hook (cost-alert.sh)
+    python3 cost_ledger.py report                     # Today / month / breakdown
+    python3 cost_ledger.py compact [--days N]         # Roll old records into summaries
+    python3 cost_ledger.py import-legacy              # Fold old YYYY-MM-DD.txt files in
+"""
+
+import fcntl
+import json
+import os
+import struct
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Shared variables.py lives one level up (config/ in the repo, ~/.claude/ when installed)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+COSTS_DIR = Path.home() / ".claude" / "logs" / "costs"
+AGENT_FILE = Path.home() / ".claude" / ".current_agent"
+
+RECORD = struct.Struct("<dHHd")  # timestamp, agent index, model index, cost
+
+DEFAULT_THRESHOLDS = {"session": 1.0, "daily": 10.0, "monthly": 200.0}
+DEFAULT_RETENTION_DAYS = 31
+
+
+def load_cost_settings(variables_path=None):
+    """Return (thresholds, retention_days) from VARIABLES.yaml `costs:`, with defaults."""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    retention_days = DEFAULT_RETENTION_DAYS
+
+    try:
+        from variables import get
+    except ImportError:
+        return thresholds, retention_days
+    costs = get("costs", {}, variables_path) or {}
+
+    for key, value in (costs.get("alert_thresholds_usd") or {}).items():
+        thresholds[key] = float(value)
+    retention_days = int(costs.get("ledger_retention_days", retention_days))
+    return thresholds, retention_days
+
+
+def day_key(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+
+
+def empty_summary():
+    return {
+        "names": [],       # String table for agent/model indexes in ledger.bin
+        "days": {},        # YYYY-MM-DD -> total
+        "months": {},      # YYYY-MM -> total
+        "sessions": {},    # session_id -> [last cumulative cost, last timestamp]
+        "compacted_before": None,
+    }
+
+
+class CostLedger:
+    """Append-only cost records plus O(1) running aggregates."""
+
+    def __init__(self, costs_dir=COSTS_DIR):
+        self.costs_dir = Path(costs_dir)
+        self.ledger_path = self.costs_dir / "ledger.bin"
+        self.summary_path = self.costs_dir / "summary.json"
+        self.lock_path = self.costs_dir / "ledger.lock"
+
+    # ── storage ──────────────────────────────────────────────
+
+    @contextmanager
+    def locked(self):
+        """Exclusive lock across concurrent sessions; yields the summary and saves it on exit."""
+        self.costs_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            summary = self.load_summary()
+            yield summary
+            self._save_summary(summary)
+
+    def load_summary(self):
+        try:
+            with open(self.summary_path, 'r') as f:
+                return {**empty_summary(), **json.load(f)}
+        except (OSError, ValueError):
+            return empty_summary()
+
+    def _save_summary(self, summary):
+        tmp = self.summary_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(summary, f, separators=(",", ":"))
+        os.replace(tmp, self.summary_path)
+
+    @staticmethod
+    def _name_index(summary, name):
+        names = summary["names"]
+        try:
+            return names.index(name)
+        except ValueError:
+            names.append(name)
+            return len(names) - 1
+
+    def records(self):
+        """Yield (timestamp, agent, model, cost) for all retained records."""
+        names = self.load_summary()["names"]
+        try:
+            data = self.ledger_path.read_bytes()
+        except FileNotFoundError:
+            return
+        usable = len(data) - len(data) % RECORD.size  # Ignore a torn trailing write
+        for timestamp, agent, model, cost in RECORD.iter_unpack(data[:usable]):
+            yield timestamp, names[agent], names[model], cost
+
+    # ── operations ───────────────────────────────────────────
+
+    def record(self, cost, agent="General", model="Unknown", session_id=None, timestamp=None):
+        """Append a cost record. Returns (added, daily_total, monthly_total).
+
+        When session_id is given, cost is the session's cumulative total and only
+        the increase since the last Stop event is recorded.
+        """
+        timestamp = timestamp or time.time()
+        day = day_key(timestamp)
+        month = day[:7]
+
+        with self.locked() as summary:
+            added = float(cost)
+            if session_id:
+                previous = summary["sessions"].get(session_id, [0.0, 0])[0]
+                added = max(0.0, added - previous)
+                summary["sessions"][session_id] = [float(cost), timestamp]
+
+            if added > 0:
+                agent_idx = self._name_index(summary, agent)
+                model_idx = self._name_index(summary, model)
+                with open(self.ledger_path, 'ab') as f:
+                    f.write(RECORD.pack(timestamp, agent_idx, model_idx, added))
+
+                summary["days"][day] = summary["days"].get(day, 0.0) + added
+                summary["months"][month] = summary["months"].get(month, 0.0) + added
+
+            return added, summary["days"].get(day, 0.0), summary["months"].get(month, 0.0)
+
+    def totals(self, timestamp=None):
+        """Return (daily_total, monthly_total) from the summary - no record scan."""
+        day = day_key(timestamp or time.time())
+        summary = self.load_summary()
+        return summary["days"].get(day, 0.0), summary["months"].get(day[:7], 0.0)
+
+    def compact(self, retention_days=DEFAULT_RETENTION_DAYS, now=None):
+        """Drop raw records and daily totals older than retention_days; monthly totals stay."""
+        cutoff = (now or time.time()) - retention_days * 86400
+        with self.locked() as summary:
+            try:
+                data = self.ledger_path.read_bytes()
+            except FileNotFoundError:
+                data = b""
+            usable = len(data) - len(data) % RECORD.size
+            kept = [r for r in RECORD.iter_unpack(data[:usable]) if r[0] >= cutoff]
+
+            tmp = self.ledger_path.with_suffix(".tmp")
+            with open(tmp, 'wb') as f:
+                f.write(b"".join(RECORD.pack(*r) for r in kept))
+            os.replace(tmp, self.ledger_path)
+
+            # Forget sessions that ended long ago, and daily totals past the window
+            # (only today's is ever read; months keep the history)
+            summary["sessions"] = {
+                sid: entry for sid, entry in summary["sessions"].items() if entry[1] >= cutoff
+            }
+            cutoff_day = day_key(cutoff)
+            summary["days"] = {day: total for day, total in summary["days"].items() if day >= cutoff_day}
+            summary["compacted_before"] = cutoff_day
+
+            removed = usable // RECORD.size - len(kept)
+        return removed
+
+    def import_legacy(self):
+        """Fold old cost-alert.sh YYYY-MM-DD.txt files into the summary totals."""
+        imported = []
+        with self.locked() as summary:
+            for path in sorted(self.costs_dir.glob("????-??-??.txt")):
+                day = path.stem
+                total = 0.0
+                for line in path.read_text().split():
+                    try:
+                        total += float(line)
+                    except ValueError:
+                        continue
+                summary["days"][day] = summary["days"].get(day, 0.0) + total
+                summary["months"][day[:7]] = summary["months"].get(day[:7], 0.0) + total
+                path.rename(path.with_suffix(".txt.imported"))
+                imported.append(day)
+        return imported
+
+
+def record_stop_event(data, ledger=None, thresholds=None, stream=None):
+    """Stop hook entry point: record the session cost and print threshold alerts to stderr (or stream)."""
+    stream = stream or sys.stderr
+    ledger = ledger or CostLedger()
+    if thresholds is None:
+        thresholds, _ = load_cost_settings()
+
+    cost = float(data.get("cost", {}).get("total") or 0)
+    model = data.get("model", {}).get("display_name") or data.get("model", {}).get("id") or "Unknown"
+    try:
+        agent = AGENT_FILE.read_text().strip() or "General"
+    except OSError:
+        agent = "General"
+
+    # Alert if session cost > session threshold
+    if cost > thresholds["session"]:
+        print(f"💰 High session cost: ${cost}", file=stream)
+
+    _, daily_total, monthly_total = ledger.record(cost, agent, model, data.get("session_id"))
+
+    if daily_total > thresholds["daily"]:
+        print(f"⚠️  Daily cost alert: ${daily_total:.2f} (exceeded ${thresholds['daily']:g} limit)", file=stream)
+
+    if monthly_total > thresholds["monthly"]:
+        print(f"🚨 Monthly budget alert: ${monthly_total:.2f} (exceeded ${thresholds['monthly']:g} budget)", file=stream)
+
+
+def print_report(ledger):
+    daily_total, monthly_total = ledger.totals()
+    print(f"Today:      ${daily_total:.2f}")
+    print(f"This month: ${monthly_total:.2f}")
+
+    by_agent = defaultdict(float)
+    by_model = defaultdict(float)
+    for _, agent, model, cost in ledger.records():
+        by_agent[agent] += cost
+        by_model[model] += cost
+
+    for title, totals in (("By agent", by_agent), ("By model", by_model)):
+        if totals:
+            print(f"\n{title} (retained records):")
+            for name, total in sorted(totals.items(), key=lambda item: -item[1]):
+                print(f"  {name:<20} ${total:.2f}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "report"
+    ledger = CostLedger()
+
+    if command == "record":
+        try:
+            record_stop_event(json.load(sys.stdin), ledger)
+        except Exception as e:
+            print(f"⚠️  cost ledger: {e}", file=sys.stderr)
+        return 0  # Never block the session
+    if command == "report":
+        print_report(ledger)
+        return 0
+    if command == "compact":
+        _, retention_days = load_cost_settings()
+        if "--days" in argv:
+            retention_days = int(argv[argv.index("--days") + 1])
+        removed = ledger.compact(retention_days)
+        print(f"✅ Compacted {removed} records older than {retention_days} days")
+        return 0
+    if command == "import-legacy":
+        imported = ledger.import_legacy()
+        print(f"✅ Imported {len(imported)} legacy day files")
+        return 0
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
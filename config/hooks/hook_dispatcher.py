@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Hook Dispatcher
+One Python entry point per hook event, replacing the per-event shell pipelines.
+
+Each shell hook spawns bash plus jq, basename, mkdir and python3 helpers
+(log_writer.py, cost_ledger.py) on every event. The dispatcher parses the
+payload once and runs an in-process handler that reproduces the matching
+script:
+    SessionStart      session-start.sh   dirs, marker reset, session_start record, env tips
+    UserPromptSubmit  track-agent.sh     /role-* → ~/.claude/.current_agent, agent-usage record
+    PreToolUse        safety-check.sh    safety_engine.py decision (exit 2 blocks)
+    Stop              cost-alert.sh      cost_ledger.py record + threshold alerts
+    SessionEnd        session-end.sh     session_end record, token tracker, rotate, compact
+
+Handler modules are imported lazily, so a one-shot call only loads what its
+event needs. Run it as a persistent worker and each call becomes a socket
+round-trip to a process with rules, settings and modules already loaded;
+when the worker is not running the call is handled in-process. If a handler
+fails before it has changed anything (a missing module, an unreadable rules
+file), the event is replayed through its shell script, which stays the
+fallback. Once a handler has acted, a failure is only reported: replaying
+the script would log, enqueue or record the event a second time.
+
+PreToolUse has no side effects and decides whether a tool runs, so it gets
+a short worker timeout and is checked in-process whenever the worker fails
+to answer; the other events are never run twice.
+
+The worker listens on ~/.claude/.hooks.sock ($CLAUDE_HOOKS_SOCKET). It uses
+its own environment ($HOME, $CLAUDE_FRAMEWORK_ROOT); the caller's working
+directory is sent with each request.
+
+Usage:
+    python3 hook_dispatcher.py SessionStart < payload.json   # settings.json hook command
+    python3 hook_dispatcher.py serve                         # Persistent worker
+    python3 hook_dispatcher.py events                        # Event → handler → fallback script
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent
+CLAUDE_DIR = Path.home() / ".claude"
+SOCKET_PATH = Path(os.getenv("CLAUDE_HOOKS_SOCKET", CLAUDE_DIR / ".hooks.sock"))
+AGENT_FILE = CLAUDE_DIR / ".current_agent"
+
+MAX_PAYLOAD_BYTES = 4 * 1024 * 1024
+WORKER_TIMEOUT = 10.0  # SessionEnd compacts the ledger and rotates logs
+SAFETY_TIMEOUT = 1.0   # A safety decision takes microseconds; after this the worker is stuck
+SEPARATOR = "\x1f"     # Between stderr and stdout in worker replies
+MONITORING_HEALTH_URL = "http://localhost:9090/-/healthy"
+
+sys.path.insert(0, str(HOOKS_DIR))
+
+
+class HookCall:
+    """One hook event: parsed payload in, exit code and stdout/stderr text out."""
+    __slots__ = ("event", "raw", "data", "parsed", "cwd", "out", "err", "code", "acted")
+
+    def __init__(self, event, raw, cwd):
+        self.event = event
+        self.raw = raw
+        self.cwd = Path(cwd)
+        try:
+            data = json.loads(raw) if raw.strip() else {}
+        except ValueError:
+            data = None
+        self.parsed = data is not None and bool(raw.strip())
+        self.data = data if isinstance(data, dict) else {}
+        self.out = []
+        self.err = []
+        self.code = 0
+        self.acted = False  # Set by handlers before their first side effect
+
+    @property
+    def project(self):
+        return self.cwd.name
+
+    def print(self, text):
+        self.out.append(f"{text}\n")
+
+    def warn(self, text):
+        self.err.append(f"{text}\n")
+
+
+class ErrorLines:
+    """File-like sink for helpers that print alerts to a stream."""
+    __slots__ = ("call",)
+
+    def __init__(self, call):
+        self.call = call
+
+    def write(self, text):
+        self.call.err.append(text)
+
+    def flush(self):
+        pass
+
+
+def current_agent():
+    try:
+        return AGENT_FILE.read_text().strip() or "General"
+    except OSError:
+        return "General"
+
+
+def append_log(name, record):
+    from log_writer import LogWriter
+    LogWriter(name).append(record)
+
+
+# ── handlers ─────────────────────────────────────────────
+
+
+def session_start(call):
+    """session-start.sh"""
+    import log_writer  # noqa: F401
+    call.acted = True
+    (CLAUDE_DIR / "logs").mkdir(parents=True, exist_ok=True)
+    (CLAUDE_DIR / ".cache").mkdir(parents=True, exist_ok=True)
+    AGENT_FILE.unlink(missing_ok=True)
+    append_log("sessions.jsonl", {"ts": time.time(), "event": "session_start", "project": call.project})
+
+    if not shutil.which("jq"):
+        call.warn("⚠️  Warning: jq not installed. Install with: brew install jq")
+
+    if (call.cwd / "monitoring" / "setup" / "docker-compose.yml").exists():
+        from urllib.request import urlopen
+        try:
+            urlopen(MONITORING_HEALTH_URL, timeout=1).close()
+        except OSError:
+            call.warn("ℹ️  Tip: Start monitoring with: docker-compose -f monitoring/setup/docker-compose.yml up -d")
+
+
+def track_agent(call):
+    """track-agent.sh"""
+    message = call.data.get("message") or ""
+    import log_writer  # noqa: F401
+    call.acted = True
+    (CLAUDE_DIR / "logs").mkdir(parents=True, exist_ok=True)
+
+    if message.startswith("/role-"):
+        # /role-backend → Backend
+        name = message[len("/role-"):].splitlines()[0] if len(message) > len("/role-") else ""
+        agent = name[:1].upper() + name[1:]
+
+        # Atomic replace: readers key their cache on inode/mtime
+        tmp = AGENT_FILE.with_name(f".current_agent.{os.getpid()}")
+        tmp.write_text(f"{agent}\n")
+        os.replace(tmp, AGENT_FILE)
+
+        append_log("agent-usage.jsonl", {"ts": time.time(), "event": "agent", "agent": agent,
+                                         "project": call.project})
+
+    # Don't modify the message
+    if call.parsed:
+        call.print(json.dumps(call.data, indent=2, ensure_ascii=False))
+
+
+_safety_engine = None
+
+
+def safety_check(call):
+    """safety-check.sh"""
+    global _safety_engine
+    from safety_engine import CONTINUE, SafetyEngine
+    if _safety_engine is None:
+        _safety_engine = SafetyEngine()
+    response, call.code = _safety_engine.decide(call.data) if call.data else (CONTINUE, 0)
+    call.print(json.dumps(response, indent=2, ensure_ascii=False))
+
+
+def cost_alert(call):
+    """cost-alert.sh"""
+    from cost_ledger import load_cost_settings, record_stop_event
+    thresholds, _ = load_cost_settings()
+    call.acted = True
+    record_stop_event(call.data, thresholds=thresholds, stream=ErrorLines(call))
+
+
+_tracker_module = None
+
+
+def token_tracker():
+    """monitoring/token_tracker.py from the framework checkout, or None."""
+    global _tracker_module
+    root = Path(os.getenv("CLAUDE_FRAMEWORK_ROOT", Path.home() / "dev" / "claude-dev-framework"))
+    path = root / "monitoring" / "token_tracker.py"
+    if _tracker_module is None or _tracker_module.__file__ != str(path):
+        if not path.is_file():
+            return None
+        spec = importlib.util.spec_from_file_location("token_tracker", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _tracker_module = module
+    return _tracker_module
+
+
+def session_end(call):
+    """session-end.sh"""
+    from cost_ledger import CostLedger, load_cost_settings
+    from log_writer import LogWriter
+    tracker = token_tracker()
+    retention_days = load_cost_settings()[1]
+    agent = current_agent()
+    call.acted = True
+
+    def log_session():
+        append_log("sessions.jsonl", {
+            "ts": time.time(), "event": "session_end", "agent": agent, "project": call.project,
+            "session_id": call.data.get("session_id"), "duration": call.data.get("duration") or 0,
+            "cost": (call.data.get("cost") or {}).get("total") or 0,
+        })
+
+    def track_tokens():
+        # Token/cost collector (spools the payload and flushes in the background)
+        if tracker:
+            tracker.TokenTracker().enqueue(call.data, agent)
+            tracker.start_background_flush()
+
+    def clear_markers():
+        AGENT_FILE.unlink(missing_ok=True)
+        (CLAUDE_DIR / ".context_warning").unlink(missing_ok=True)
+
+    def rotate_logs():
+        # Rotate logs past their size/age limits
+        LogWriter("tool-usage.jsonl").rotate()
+
+    def compact_costs():
+        # Roll old cost records into daily totals
+        CostLedger().compact(retention_days)
+
+    # Like the script, a failing step doesn't stop the ones after it
+    for step in (log_session, track_tokens, clear_markers, rotate_logs, compact_costs):
+        try:
+            step()
+        except Exception as e:
+            call.warn(f"⚠️  hook dispatcher (SessionEnd): {step.__name__}: {e}")
+
+
+# event → (handler, shell fallback)
+EVENTS = {
+    "SessionStart": (session_start, "session-start.sh"),
+    "UserPromptSubmit": (track_agent, "track-agent.sh"),
+    "PreToolUse": (safety_check, "safety-check.sh"),
+    "Stop": (cost_alert, "cost-alert.sh"),
+    "SessionEnd": (session_end, "session-end.sh"),
+}
+
+
+def run_fallback(event, raw, cwd):
+    """Replay the event through its shell script."""
+    script = HOOKS_DIR / EVENTS[event][1]
+    result = subprocess.run([str(script)], input=raw.encode("utf-8"), capture_output=True, cwd=cwd)
+    return result.returncode, result.stdout.decode("utf-8", "replace"), result.stderr.decode("utf-8", "replace")
+
+
+def handle(event, raw, cwd):
+    """Run an event's handler. Returns (exit code, stdout, stderr).
+
+    A handler that fails before acting is replayed through its shell script;
+    one that fails after acting is reported, not replayed."""
+    call = HookCall(event, raw, cwd)
+    try:
+        EVENTS[event][0](call)
+    except Exception as e:
+        if not call.acted:
+            code, out, err = run_fallback(event, raw, cwd)
+            return code, out, f"⚠️  hook dispatcher ({event}): {e}; used {EVENTS[event][1]}\n{err}"
+        call.warn(f"⚠️  hook dispatcher ({event}): {e}")
+    return call.code, "".join(call.out), "".join(call.err)
+
+
+# ── persistent worker ────────────────────────────────────
+
+
+class HookHandler(socketserver.StreamRequestHandler):
+    """Request: event line, cwd line, payload until EOF. Reply: exit code line, stderr, SEPARATOR, stdout."""
+
+    def handle(self):
+        self.request.settimeout(WORKER_TIMEOUT)
+        try:
+            event = self.rfile.readline().decode("utf-8").strip()
+            if not event:
+                return  # Liveness probe (is_running)
+            cwd = self.rfile.readline().decode("utf-8").rstrip("\n")
+            raw = self.rfile.read(MAX_PAYLOAD_BYTES).decode("utf-8", "replace")
+            if event not in EVENTS:
+                code, out, err = 0, "", f"⚠️  hook dispatcher: unknown event {event}\n"
+            else:
+                code, out, err = handle(event, raw, cwd)
+        except Exception as e:
+            code, out, err = 0, "", f"⚠️  hook dispatcher: {e}\n"
+        try:
+            self.wfile.write(f"{code}\n{err}{SEPARATOR}{out}".encode("utf-8"))
+        except OSError:
+            pass  # Client gave up
+
+
+class HookServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        super().__init__(str(socket_path), HookHandler)
+
+
+def is_running(socket_path=SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        try:
+            sock.connect(str(socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def serve(socket_path=SOCKET_PATH):
+    """Run the worker in the foreground until SIGTERM/SIGINT. SIGHUP reloads the safety rules."""
+    global _safety_engine
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        if is_running(socket_path):
+            print(f"⚠️  Hook dispatcher already running on {socket_path}", file=sys.stderr)
+            return 1
+        socket_path.unlink()
+
+    # Warm up what every event would otherwise load on first use
+    import cost_ledger
+    import log_writer  # noqa: F401
+    import safety_engine
+    _safety_engine = safety_engine.SafetyEngine()
+    cost_ledger.load_cost_settings()
+
+    old_umask = os.umask(0o177)
+    try:
+        server = HookServer(socket_path)
+    finally:
+        os.umask(old_umask)
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    def reload(signum, frame):
+        global _safety_engine
+        _safety_engine = safety_engine.SafetyEngine()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGHUP, reload)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def query_worker(event, raw, cwd, socket_path=SOCKET_PATH, timeout=WORKER_TIMEOUT):
+    """Send one event to the worker; returns (exit code, stdout, stderr). Raises OSError if unreachable."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(f"{event}\n{cwd}\n{raw}".encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        reply = b""
+        while chunk := sock.recv(65536):
+            reply += chunk
+    code, rest = reply.decode("utf-8").split("\n", 1)
+    err, _, out = rest.partition(SEPARATOR)
+    return int(code), out, err
+
+
+def run_event(event):
+    """Hook entry point: worker when it is up, otherwise in-process."""
+    raw = sys.stdin.buffer.read().decode("utf-8", "replace")
+    cwd = os.getcwd()
+    code, note = None, ""
+    if SOCKET_PATH.exists():
+        safety = event == "PreToolUse"
+        try:
+            code, out, err = query_worker(event, raw, cwd, timeout=SAFETY_TIMEOUT if safety else WORKER_TIMEOUT)
+        except (ConnectionError, FileNotFoundError):
+            pass  # Stale or vanished socket: handle it here
+        except (OSError, ValueError) as e:
+            if safety:
+                # No side effects, and a timeout must not let the tool through: decide here
+                note = f"⚠️  hook dispatcher worker: {e}; checked in-process\n"
+            else:
+                # The worker may have acted already; don't run the event twice
+                code, out, err = 0, "", f"⚠️  hook dispatcher worker: {e}\n"
+    if code is None:
+        code, out, err = handle(event, raw, cwd)
+        err = note + err
+    sys.stderr.write(err)
+    sys.stdout.write(out)
+    return code
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else ""
+
+    if command in EVENTS:
+        return run_event(command)
+    if command == "serve":
+        return serve()
+    if command == "events":
+        for event, (handler, script) in EVENTS.items():
+            print(f"{event:<18} {handler.__name__:<15} {script}")
+        if is_running():
+            print(f"\n✅ Worker running on {SOCKET_PATH}")
+        return 0
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Log Writer
+Append-safe, rotating logs for hooks (~/.claude/logs/).
+
+Every append takes an flock() on the log's lock file, so concurrent sessions
+never interleave partial lines or lose lines to a rotation. When the active
+file passes the size limit (or gets too old) it is renamed to a closed
+segment under the lock; the segment is then gzip-compressed in a streaming
+pass outside the lock and recorded in a segment index with its time range.
+Readers use the index to open only the segments that overlap a time range.
+
+Files for a log named tool-usage.jsonl:
+    tool-usage.jsonl                            Active segment (plain text)
+    tool-usage-YYYYmmdd-HHMMSS.jsonl.gz         Closed segments
+    .tool-usage.jsonl.index.json                Segment index (start, end, lines, bytes)
+    .tool-usage.jsonl.lock                      flock() guard
+
+Rotation limits come from `logs:` in VARIABLES.yaml (via variables.py).
+
+Usage:
+    echo "line" | python3 log_writer.py append sessions.log
+    echo '{"tool": "Bash"}' | python3 log_writer.py append tool-usage.jsonl
+    python3 log_writer.py rotate tool-usage.jsonl [--force]
+    python3 log_writer.py read tool-usage.jsonl [--since 2026-10-01] [--until 2026-10-02T12:00]
+    python3 log_writer.py segments tool-usage.jsonl
+"""
+
+import fcntl
+import gzip
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Shared variables.py lives one level up (config/ in the repo, ~/.claude/ when installed)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+LOGS_DIR = Path.home() / ".claude" / "logs"
+
+DEFAULT_ROTATE_BYTES = 1000000
+DEFAULT_ROTATE_AGE_HOURS = 24
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def load_log_settings(variables_path=None):
+    """Return (rotate_bytes, rotate_age_seconds) from VARIABLES.yaml `logs:`, with defaults."""
+    try:
+        from variables import get
+    except ImportError:
+        return DEFAULT_ROTATE_BYTES, DEFAULT_ROTATE_AGE_HOURS * 3600
+    logs = get("logs", {}, variables_path) or {}
+    rotate_bytes = int(logs.get("rotate_bytes", DEFAULT_ROTATE_BYTES))
+    rotate_age_hours = float(logs.get("rotate_age_hours", DEFAULT_ROTATE_AGE_HOURS))
+    return rotate_bytes, rotate_age_hours * 3600
+
+
+def empty_index():
+    return {
+        "active_start": None,  # Time of the first append to the active segment
+        "segments": [],        # Closed segments, oldest first
+    }
+
+
+class LogWriter:
+    """One rotating log file plus its closed segments."""
+
+    def __init__(self, name, logs_dir=LOGS_DIR, rotate_bytes=None, rotate_age_seconds=None):
+        self.logs_dir = Path(logs_dir)
+        self.name = name
+        self.path = self.logs_dir / name
+        self.index_path = self.logs_dir / f".{name}.index.json"
+        self.lock_path = self.logs_dir / f".{name}.lock"
+
+        if rotate_bytes is None or rotate_age_seconds is None:
+            default_bytes, default_age = load_log_settings()
+            rotate_bytes = default_bytes if rotate_bytes is None else rotate_bytes
+            rotate_age_seconds = default_age if rotate_age_seconds is None else rotate_age_seconds
+        self.rotate_bytes = rotate_bytes
+        self.rotate_age_seconds = rotate_age_seconds
+
+    # ── storage ──────────────────────────────────────────────
+
+    @contextmanager
+    def locked(self):
+        """Exclusive lock across concurrent sessions; yields the index and saves it on exit."""
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            index = self.load_index()
+            before = json.dumps(index, sort_keys=True)
+            yield index
+            if json.dumps(index, sort_keys=True) != before:
+                self._save_index(index)
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                return {**empty_index(), **json.load(f)}
+        except (OSError, ValueError):
+            return empty_index()
+
+    def _save_index(self, index):
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    def _segment_path(self, start):
+        stem, dot, suffix = self.name.partition(".")
+        stamp = datetime.fromtimestamp(start).strftime("%Y%m%d-%H%M%S")
+        base = f"{stem}-{stamp}"
+        candidate, n = self.logs_dir / f"{base}{dot}{suffix}", 1
+        while candidate.exists() or Path(f"{candidate}.gz").exists():
+            candidate, n = self.logs_dir / f"{base}-{n}{dot}{suffix}", n + 1
+        return candidate
+
+    # ── writing ──────────────────────────────────────────────
+
+    def append(self, lines, now=None):
+        """Append one line (str or JSON-serializable record) or a list of them."""
+        if isinstance(lines, (str, dict)):
+            lines = [lines]
+        payload = "".join(
+            (line if isinstance(line, str) else json.dumps(line, separators=(",", ":"))).rstrip("\n") + "\n"
+            for line in lines
+        ).encode("utf-8")
+        if not payload:
+            return
+
+        now = now or time.time()
+        closed = None
+        with self.locked() as index:
+            closed = self._rotate_if_due(index, now)
+            if index["active_start"] is None:
+                index["active_start"] = now
+            with open(self.path, 'ab') as f:
+                f.write(payload)
+        if closed:
+            self.compress(closed)
+
+    def _rotate_if_due(self, index, now, force=False):
+        """Close the active segment if it is over a limit. Caller holds the lock."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return None
+        if not size:
+            return None
+
+        start = index["active_start"] or self.path.stat().st_mtime
+        too_big = self.rotate_bytes and size >= self.rotate_bytes
+        too_old = self.rotate_age_seconds and now - start >= self.rotate_age_seconds
+        if not (force or too_big or too_old):
+            return None
+
+        segment = self._segment_path(start)
+        os.replace(self.path, segment)  # New appends start a fresh active file
+        index["segments"].append({
+            "file": segment.name,
+            "start": start,
+            "end": now,
+            "bytes": size,
+            "lines": None,
+            "compressed": False,
+        })
+        index["active_start"] = None
+        return segment
+
+    def rotate(self, force=False, now=None):
+        """Rotate now if a limit is reached (or unconditionally with force). Returns the segment."""
+        with self.locked() as index:
+            closed = self._rotate_if_due(index, now or time.time(), force)
+        if closed:
+            self.compress(closed)
+        # Finish segments a crashed writer left uncompressed
+        for entry in self.load_index()["segments"]:
+            plain = self.logs_dir / entry["file"]
+            if not entry["compressed"] and plain != closed and plain.exists():
+                self.compress(plain)
+        return closed
+
+    def compress(self, segment):
+        """Stream a closed segment into .gz (no lock held), then mark it compressed in the index."""
+        gz_path = Path(f"{segment}.gz")
+        tmp = Path(f"{gz_path}.{os.getpid()}.tmp")
+        lines = 0
+        try:
+            src = open(segment, 'rb')
+        except FileNotFoundError:
+            return gz_path  # Another session already compressed it
+        with src, gzip.open(tmp, 'wb') as dst:
+            while True:
+                chunk = src.read(COPY_CHUNK_BYTES)
+                if not chunk:
+                    break
+                lines += chunk.count(b"\n")
+                dst.write(chunk)
+        os.replace(tmp, gz_path)
+
+        with self.locked() as index:
+            for entry in index["segments"]:
+                if entry["file"] == segment.name:
+                    entry.update(file=gz_path.name, lines=lines, compressed=True)
+        segment.unlink(missing_ok=True)
+        return gz_path
+
+    def prune(self, older_than_seconds, now=None):
+        """Delete closed segments that ended before the cutoff. Returns the number removed."""
+        cutoff = (now or time.time()) - older_than_seconds
+        with self.locked() as index:
+            keep, drop = [], []
+            for entry in index["segments"]:
+                (drop if entry["end"] < cutoff else keep).append(entry)
+            for entry in drop:
+                try:
+                    (self.logs_dir / entry["file"]).unlink()
+                except FileNotFoundError:
+                    pass
+            index["segments"] = keep
+        return len(drop)
+
+    # ── reading ──────────────────────────────────────────────
+
+    def segments(self, since=None, until=None):
+        """Index entries (closed segments, then the active file) overlapping [since, until].
+
+        Each segment keeps its "start" from first append to compression, so
+        it doubles as a stable identity for incremental readers.
+        """
+        index = self.load_index()
+        entries = [dict(entry, active=False) for entry in index["segments"]]
+        if self.path.exists():
+            start = index["active_start"]
+            if start is None:
+                # File predates the writer: pin its start so readers see a stable identity
+                with self.locked() as locked_index:
+                    if locked_index["active_start"] is None:
+                        locked_index["active_start"] = self.path.stat().st_mtime
+                    start = locked_index["active_start"]
+            entries.append({
+                "file": self.name,
+                "start": start,
+                "end": time.time(),
+                "bytes": self.path.stat().st_size,
+                "lines": None,
+                "compressed": False,
+                "active": True,
+            })
+        return [
+            entry for entry in entries
+            if (since is None or entry["end"] >= since) and (until is None or entry["start"] <= until)
+        ]
+
+    def read(self, since=None, until=None):
+        """Stream lines from the segments overlapping [since, until], oldest first.
+
+        Filtering is per segment: lines are not parsed, so a segment that
+        overlaps the range is returned whole.
+        """
+        for entry in self.segments(since, until):
+            path = self.logs_dir / entry["file"]
+            if not entry["compressed"] and not path.exists() and Path(f"{path}.gz").exists():
+                path = Path(f"{path}.gz")  # Compressed since the index was read
+            opener = gzip.open if path.suffix == ".gz" else open
+            try:
+                with opener(path, 'rt', encoding="utf-8", errors="replace") as f:
+                    yield from f
+            except FileNotFoundError:
+                continue  # Pruned while reading
+
+
+def parse_time(value):
+    """Epoch seconds from an ISO date/datetime or a number."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _option(argv, flag):
+    return argv[argv.index(flag) + 1] if flag in argv and argv.index(flag) + 1 < len(argv) else None
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    command, name = argv[0], argv[1]
+    writer = LogWriter(name)
+
+    if command == "append":
+        try:
+            writer.append(sys.stdin.read().splitlines())
+        except Exception as e:
+            print(f"⚠️  log writer: {e}", file=sys.stderr)
+        return 0  # Never block the session
+    if command == "rotate":
+        segment = writer.rotate(force="--force" in argv)
+        if segment:
+            print(f"✅ Rotated {name} → {segment.name}.gz")
+        else:
+            print(f"ℹ️  {name} is below its rotation limits")
+        return 0
+    if command == "read":
+        since, until = _option(argv, "--since"), _option(argv, "--until")
+        try:
+            for line in writer.read(since and parse_time(since), until and parse_time(until)):
+                sys.stdout.write(line)
+        except BrokenPipeError:
+            pass
+        return 0
+    if command == "segments":
+        for entry in writer.segments():
+            start = datetime.fromtimestamp(entry["start"]).strftime("%Y-%m-%d %H:%M:%S")
+            end = datetime.fromtimestamp(entry["end"]).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{entry['file']:<45} {start} → {end}  {entry['bytes']:>10} bytes")
+        return 0
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
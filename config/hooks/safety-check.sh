@@ -2,8 +2,21 @@
 # Safety Check Hook
 # Type: PreToolUse
 # Purpose: Block dangerous operations before execution
+# Python equivalent: hook_dispatcher.py PreToolUse (keep both in sync)
 
 input=$(cat)
+
+# Fast path: persistent safety engine worker (safety_engine.py serve)
+# Reply is the exit code on the first line, then the JSON decision
+SAFETY_SOCKET="${CLAUDE_SAFETY_SOCKET:-$HOME/.claude/.safety.sock}"
+if [ -S "$SAFETY_SOCKET" ] && command -v socat &> /dev/null; then
+    if reply=$(printf '%s' "$input" | socat -t 2 - "UNIX-CONNECT:$SAFETY_SOCKET" 2>/dev/null) && [ -n "$reply" ]; then
+        echo "${reply#*$'\n'}"
+        exit "${reply%%$'\n'*}"
+    fi
+fi
+
+# Fallback: shell rules (keep in sync with safety-rules.json)
 tool=$(echo "$input" | jq -r '.tool')
 args=$(echo "$input" | jq -r '.arguments // {} | tostring')
 
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Safety Engine
+Pre-compiled rule matcher behind the PreToolUse safety hook.
+
+Loads block/confirm/sensitive-path rules once from safety-rules.json,
+compiles each rule group's patterns into a single alternation regex, and
+decides from one JSON parse of the hook payload. Output and exit codes
+match safety-check.sh: {"decision": "block", ...} + exit 2, or
+{"decision": "continue"} + exit 0.
+
+Modes:
+    python3 safety_engine.py check < payload.json   # One-shot decision
+    python3 safety_engine.py serve                  # Persistent worker on a Unix socket
+    python3 safety_engine.py bench [-n N]           # Latency vs. safety-check.sh
+
+The worker listens on ~/.claude/.safety.sock ($CLAUDE_SAFETY_SOCKET);
+safety-check.sh forwards to it when it is running and socat is installed.
+"""
+
+import json
+import os
+import re
+import signal
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent
+RULES_PATH = Path(os.getenv("CLAUDE_SAFETY_RULES", HOOKS_DIR / "safety-rules.json"))
+SOCKET_PATH = Path(os.getenv("CLAUDE_SAFETY_SOCKET", Path.home() / ".claude" / ".safety.sock"))
+
+CONTINUE = {"decision": "continue"}
+MAX_PAYLOAD_BYTES = 4 * 1024 * 1024
+
+
+class CompiledRule:
+    __slots__ = ("id", "field", "decision", "explanation", "regex")
+
+    def __init__(self, rule):
+        self.id = rule["id"]
+        self.field = rule.get("field", "arguments")
+        self.decision = rule.get("decision", "block")
+        self.explanation = rule.get("explanation", "")
+        self.regex = re.compile("|".join(f"(?:{p})" for p in rule["patterns"]))
+
+
+class SafetyEngine:
+    """Rules compiled once, indexed by tool name."""
+
+    def __init__(self, rules_path=RULES_PATH):
+        with open(rules_path, 'r') as f:
+            config = json.load(f)
+
+        self.rules_by_tool = {}
+        for rule in config.get("rules", []):
+            compiled = CompiledRule(rule)
+            for tool in rule.get("tools", ["*"]):
+                self.rules_by_tool.setdefault(tool, []).append(compiled)
+        self._wildcard = self.rules_by_tool.pop("*", [])
+
+    @staticmethod
+    def _field_text(field, arguments, cache):
+        if field not in cache:
+            if field == "arguments":
+                # Same text the shell hook greps: jq '.arguments // {} | tostring'
+                cache[field] = json.dumps(arguments, separators=(",", ":"), ensure_ascii=False)
+            else:
+                value = arguments.get(field, "") if isinstance(arguments, dict) else ""
+                cache[field] = value if isinstance(value, str) else json.dumps(value)
+        return cache[field]
+
+    def decide(self, data):
+        """Return (response dict, exit code) for a PreToolUse payload."""
+        tool = data.get("tool") or data.get("tool_name") or ""
+        arguments = data.get("arguments") or data.get("tool_input") or {}
+
+        rules = self.rules_by_tool.get(tool, ())
+        if self._wildcard:
+            rules = list(rules) + self._wildcard
+
+        texts = {}
+        for rule in rules:
+            if rule.regex.search(self._field_text(rule.field, arguments, texts)):
+                if rule.decision == "continue":
+                    break
+                return {"decision": rule.decision, "explanation": rule.explanation}, 2
+        return CONTINUE, 0
+
+    def decide_raw(self, payload):
+        """Decide from raw bytes/str; malformed payloads are allowed through like the shell hook."""
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return CONTINUE, 0
+        if not isinstance(data, dict):
+            return CONTINUE, 0
+        return self.decide(data)
+
+
+# ── persistent worker ────────────────────────────────────────
+
+
+class SafetyHandler(socketserver.StreamRequestHandler):
+    """Payload in until EOF; reply is the exit code line followed by the JSON response."""
+
+    def handle(self):
+        self.request.settimeout(2.0)
+        try:
+            payload = self.rfile.read(MAX_PAYLOAD_BYTES)
+            if not payload:
+                return  # Liveness probe (is_running)
+            response, code = self.server.engine.decide_raw(payload)
+        except Exception:
+            response, code = CONTINUE, 0
+        try:
+            self.wfile.write(f"{code}\n{json.dumps(response, ensure_ascii=False)}\n".encode("utf-8"))
+        except OSError:
+            pass  # Client gave up
+
+
+class SafetyServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, engine):
+        self.engine = engine
+        super().__init__(str(socket_path), SafetyHandler)
+
+
+def is_running(socket_path=SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        try:
+            sock.connect(str(socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def serve(socket_path=SOCKET_PATH, rules_path=RULES_PATH):
+    """Run the worker in the foreground until SIGTERM/SIGINT. SIGHUP reloads the rules."""
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        if is_running(socket_path):
+            print(f"⚠️  Safety worker already running on {socket_path}", file=sys.stderr)
+            return 1
+        socket_path.unlink()
+
+    old_umask = os.umask(0o177)
+    try:
+        server = SafetyServer(socket_path, SafetyEngine(rules_path))
+    finally:
+        os.umask(old_umask)
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    def reload(signum, frame):
+        server.engine = SafetyEngine(rules_path)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGHUP, reload)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def query_worker(payload, socket_path=SOCKET_PATH):
+    """Send one payload to the worker; returns (response dict, exit code)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(2.0)
+        sock.connect(str(socket_path))
+        sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        reply = b""
+        while chunk := sock.recv(65536):
+            reply += chunk
+    code, response = reply.decode("utf-8").split("\n", 1)
+    return json.loads(response), int(code)
+
+
+# ── benchmark ────────────────────────────────────────────────
+
+BENCH_PAYLOADS = [
+    {"tool": "Bash", "arguments": {"command": "ls -la src/"}},
+    {"tool": "Bash", "arguments": {"command": "rm -rf /tmp/test"}},
+    {"tool": "Bash", "arguments": {"command": "sudo rm -rf /"}},
+    {"tool": "Write", "arguments": {"file_path": "src/app.py", "content": "print('hi')"}},
+    {"tool": "Edit", "arguments": {"file_path": "config/.env", "old_string": "a", "new_string": "b"}},
+    {"tool": "Read", "arguments": {"file_path": "README.md"}},
+]
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return statistics.median(samples) * 1000, p99 * 1000
+
+
+def _time_subprocess(cmd, payloads, iterations, env=None):
+    samples = []
+    for i in range(iterations):
+        payload = payloads[i % len(payloads)]
+        start = time.perf_counter()
+        subprocess.run(cmd, input=payload, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench(iterations=50):
+    """Compare decision latency: shell hook, one-shot Python, in-process and worker."""
+    payloads = [json.dumps(p).encode("utf-8") for p in BENCH_PAYLOADS]
+    engine = SafetyEngine()
+
+    # Decisions must agree with the shell hook before timing means anything
+    shell = str(HOOKS_DIR / "safety-check.sh")
+    shell_env = {**os.environ, "CLAUDE_SAFETY_SOCKET": "/nonexistent"}  # Force the shell fallback
+    for payload in payloads:
+        result = subprocess.run([shell], input=payload, capture_output=True, env=shell_env)
+        _, code = engine.decide_raw(payload)
+        if result.returncode != code:
+            print(f"⚠️  Decision mismatch (shell={result.returncode}, engine={code}): {payload.decode()}")
+
+    results = {}
+    results["safety-check.sh"] = _time_subprocess([shell], payloads, iterations, shell_env)
+    results["safety_engine.py check"] = _time_subprocess(
+        [sys.executable, str(Path(__file__).resolve()), "check"], payloads, iterations)
+
+    samples = []
+    for i in range(iterations * 100):
+        start = time.perf_counter()
+        engine.decide_raw(payloads[i % len(payloads)])
+        samples.append(time.perf_counter() - start)
+    results["in-process decide"] = samples
+
+    if is_running():
+        samples = []
+        for i in range(iterations * 10):
+            start = time.perf_counter()
+            query_worker(payloads[i % len(payloads)])
+            samples.append(time.perf_counter() - start)
+        results["worker round-trip"] = samples
+
+    print(f"{'Path':<26} {'p50 (ms)':>10} {'p99 (ms)':>10} {'runs':>7}")
+    for name, samples in results.items():
+        p50, p99 = _percentiles(samples)
+        print(f"{name:<26} {p50:>10.3f} {p99:>10.3f} {len(samples):>7}")
+    if not is_running():
+        print("\nℹ️  Start the worker (safety_engine.py serve) to include socket round-trips")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "check"
+
+    if command == "check":
+        try:
+            response, code = SafetyEngine().decide_raw(sys.stdin.buffer.read())
+        except (OSError, ValueError, re.error) as e:
+            print(f"⚠️  safety engine: {e}", file=sys.stderr)
+            response, code = CONTINUE, 0
+        print(json.dumps(response, indent=2, ensure_ascii=False))
+        return code
+    if command == "serve":
+        return serve()
+    if command == "bench":
+        iterations = int(argv[argv.index("-n") + 1]) if "-n" in argv else 50
+        return bench(iterations)
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,29 +2,32 @@
 # Session End Hook
 # Type: SessionEnd
 # Purpose: Save state and clean up
+# Python equivalent: hook_dispatcher.py SessionEnd (keep both in sync)
 
 input=$(cat)
-duration=$(echo "$input" | jq -r '.duration // 0')
-cost=$(echo "$input" | jq -r '.cost.total // 0')
 
-# Log session end
-timestamp=$(date '+%Y-%m-%d %H:%M:%S')
+# Log session end (structured; see usage_analytics.py)
 agent=$(cat ~/.claude/.current_agent 2>/dev/null || echo "General")
 project=$(basename $(pwd))
-echo "$timestamp - Session ended. Agent: $agent, Duration: ${duration}s, Cost: \$$cost, Project: $project" >> ~/.claude/logs/sessions.log
+echo "$input" | jq -c --arg agent "$agent" --arg project "$project" \
+    '{ts: now, event: "session_end", agent: $agent, project: $project, session_id: .session_id,
+      duration: (.duration // 0), cost: (.cost.total // 0)}' \
+    | python3 "$(dirname "${BASH_SOURCE[0]}")/log_writer.py" append sessions.jsonl
+
+# Token/cost collector (spools the payload and flushes in the background)
+tracker="${CLAUDE_FRAMEWORK_ROOT:-$HOME/dev/claude-dev-framework}/monitoring/token_tracker.py"
+if [ -f "$tracker" ]; then
+    echo "$input" | python3 "$tracker" track --agent "$agent"
+fi
 
 # Clear agent marker
 rm -f ~/.claude/.current_agent
 rm -f ~/.claude/.context_warning
 
-# Archive large log files
-if [ -f ~/.claude/logs/tool-usage.jsonl ]; then
-    log_size=$(wc -c < ~/.claude/logs/tool-usage.jsonl)
-    if [ "$log_size" -gt 1000000 ]; then  # > 1MB
-        date_suffix=$(date +%Y%m%d-%H%M%S)
-        gzip -c ~/.claude/logs/tool-usage.jsonl > ~/.claude/logs/tool-usage-$date_suffix.jsonl.gz
-        > ~/.claude/logs/tool-usage.jsonl  # Truncate
-    fi
-fi
+# Rotate logs past their size/age limits (appends rotate too; this catches idle logs)
+python3 "$(dirname "${BASH_SOURCE[0]}")/log_writer.py" rotate tool-usage.jsonl > /dev/null
+
+# Roll old cost records into daily totals
+python3 "$(dirname "${BASH_SOURCE[0]}")/cost_ledger.py" compact > /dev/null
 
 exit 0
@@ -2,6 +2,7 @@
 # Session Start Hook
 # Type: SessionStart
 # Purpose: Initialize framework context and check environment
+# Python equivalent: hook_dispatcher.py SessionStart (keep both in sync)
 
 # Create necessary directories
 mkdir -p ~/.claude/logs
@@ -10,16 +11,24 @@ mkdir -p ~/.claude/.cache
 # Clear old agent marker
 rm -f ~/.claude/.current_agent
 
-# Log session start
-timestamp=$(date '+%Y-%m-%d %H:%M:%S')
-project=$(basename $(pwd))
-echo "$timestamp - Session started in: $project" >> ~/.claude/logs/sessions.log
-
 # Check if jq is installed (needed for hooks)
 if ! command -v jq &> /dev/null; then
     echo "⚠️  Warning: jq not installed. Install with: brew install jq" >&2
 fi
 
+# Log session start (structured; see usage_analytics.py). Without jq the record is built here.
+project=$(basename $(pwd))
+if command -v jq &> /dev/null; then
+    record=$(jq -nc --arg project "$project" '{ts: now, event: "session_start", project: $project}')
+else
+    escaped=${project//\\/\\\\}
+    escaped=${escaped//\"/\\\"}
+    record="{\"ts\": $(date +%s), \"event\": \"session_start\", \"project\": \"$escaped\"}"
+fi
+if command -v python3 &> /dev/null; then
+    echo "$record" | python3 "$(dirname "${BASH_SOURCE[0]}")/log_writer.py" append sessions.jsonl
+fi
+
 # Check if monitoring stack is running (optional)
 if [ -f "monitoring/setup/docker-compose.yml" ]; then
     if ! curl -s http://localhost:9090/-/healthy >/dev/null 2>&1; then
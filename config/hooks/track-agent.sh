@@ -2,6 +2,7 @@
 # Agent Tracking Hook
 # Type: UserPromptSubmit
 # Purpose: Track which agent is being used and update statusline
+# Python equivalent: hook_dispatcher.py UserPromptSubmit (keep both in sync)
 
 input=$(cat)
 message=$(echo "$input" | jq -r '.message // ""')
@@ -14,12 +15,14 @@ if echo "$message" | grep -q "^/role-"; then
     # Extract agent name (e.g., /role-backend → Backend)
     agent=$(echo "$message" | sed 's/^\/role-//' | sed 's/.*/\u&/')  # Capitalize first letter
 
-    # Save current agent for statusline
-    echo "$agent" > ~/.claude/.current_agent
+    # Save current agent for statusline (atomic replace: readers key their cache on inode/mtime)
+    tmp_marker=~/.claude/.current_agent.$$
+    echo "$agent" > "$tmp_marker" && mv -f "$tmp_marker" ~/.claude/.current_agent
 
-    # Log usage
-    timestamp=$(date '+%Y-%m-%d %H:%M:%S')
-    echo "$timestamp - Agent: $agent - Project: $(basename $(pwd))" >> ~/.claude/logs/agent-usage.log
+    # Log usage (structured; see usage_analytics.py)
+    jq -nc --arg agent "$agent" --arg project "$(basename $(pwd))" \
+        '{ts: now, event: "agent", agent: $agent, project: $project}' \
+        | python3 "$(dirname "${BASH_SOURCE[0]}")/log_writer.py" append agent-usage.jsonl
 fi
 
 # Don't modify the message
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Usage Analytics
+SQLite rollups over the session and agent usage logs.
+
+session-start.sh, session-end.sh and track-agent.sh append JSON records to
+sessions.jsonl and agent-usage.jsonl (through log_writer.py). This module
+ingests them into ~/.claude/logs/usage.db, indexed on time, agent and
+project, and answers the daily/weekly/monthly rollups described in
+monitoring/MONITORING_SYSTEM.md.
+
+Ingestion is incremental: each log segment is tracked by its start time and
+a byte offset, so a report only reads what was appended since the last one
+(rotated and gzip-compressed segments included). The free-text
+sessions.log / agent-usage.log written by older hooks are ingested the same
+way.
+
+Usage:
+    python3 usage_analytics.py ingest
+    python3 usage_analytics.py report [--period day|week|month] [--by agent|project|agent,project] [--since 2026-10-01]
+    python3 usage_analytics.py report --period week --by agent,project   # Cost per agent per project this week
+    python3 usage_analytics.py agents [--since 2026-10-01]                # Prompts routed to each agent
+"""
+
+import gzip
+import json
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from log_writer import LOGS_DIR, LogWriter
+
+DB_NAME = "usage.db"
+
+# Log name -> record parser. JSON logs are written by the current hooks,
+# text logs by older versions (still ingested for history).
+SOURCES = ("sessions.jsonl", "agent-usage.jsonl", "sessions.log", "agent-usage.log")
+
+PERIODS = {
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+    "month": "%Y-%m",
+}
+GROUP_COLUMNS = ("agent", "project")
+
+TEXT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+SESSION_END_RE = re.compile(
+    r"^(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - Session ended\. Agent: (?P<agent>.*?), "
+    r"Duration: (?P<duration>[\d.]+)s, Cost: \$(?P<cost>[\d.]+), Project: (?P<project>.*)$")
+SESSION_START_RE = re.compile(
+    r"^(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - Session started in: (?P<project>.*)$")
+AGENT_RE = re.compile(
+    r"^(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - Agent: (?P<agent>.*?) - Project: (?P<project>.*)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,
+    event TEXT NOT NULL,       -- session_start | session_end | agent
+    agent TEXT,
+    project TEXT,
+    session_id TEXT,
+    duration REAL,
+    cost REAL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_agent_ts ON events (agent, ts);
+CREATE INDEX IF NOT EXISTS events_project_ts ON events (project, ts);
+
+CREATE TABLE IF NOT EXISTS ingest_state (
+    segment TEXT PRIMARY KEY,  -- <log name>@<segment start>
+    offset INTEGER NOT NULL,   -- Uncompressed bytes consumed
+    done INTEGER NOT NULL      -- Segment closed and fully consumed
+);
+"""
+
+
+def parse_json_record(line):
+    """One JSON line from sessions.jsonl / agent-usage.jsonl -> event row, or None."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or "ts" not in record or "event" not in record:
+        return None
+    return (
+        float(record["ts"]),
+        record["event"],
+        record.get("agent"),
+        record.get("project"),
+        record.get("session_id"),
+        float(record["duration"]) if record.get("duration") is not None else None,
+        float(record["cost"]) if record.get("cost") is not None else None,
+    )
+
+
+def parse_text_record(line):
+    """One line of the legacy sessions.log / agent-usage.log -> event row, or None."""
+    line = line.rstrip("\n")
+    for pattern, event in ((SESSION_END_RE, "session_end"), (SESSION_START_RE, "session_start"),
+                           (AGENT_RE, "agent")):
+        match = pattern.match(line)
+        if match:
+            fields = match.groupdict()
+            ts = datetime.strptime(fields["ts"], TEXT_TIME_FORMAT).timestamp()
+            duration = float(fields["duration"]) if "duration" in fields else None
+            cost = float(fields["cost"]) if "cost" in fields else None
+            return (ts, event, fields.get("agent"), fields.get("project"), None, duration, cost)
+    return None
+
+
+class UsageAnalytics:
+    """Incremental SQLite store over the usage logs."""
+
+    def __init__(self, logs_dir=LOGS_DIR, db_path=None):
+        self.logs_dir = Path(logs_dir)
+        self.db_path = Path(db_path) if db_path else self.logs_dir / DB_NAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.executescript(SCHEMA)
+
+    # ── ingestion ────────────────────────────────────────────
+
+    def ingest(self):
+        """Read everything appended since the last ingest. Returns the number of new events."""
+        added = 0
+        for name in SOURCES:
+            writer = LogWriter(name, logs_dir=self.logs_dir)
+            if not writer.path.exists() and not writer.index_path.exists():
+                continue
+            parse = parse_json_record if name.endswith(".jsonl") else parse_text_record
+            for entry in writer.segments():
+                added += self._ingest_segment(name, entry, parse)
+        return added
+
+    def _ingest_segment(self, name, entry, parse):
+        key = f"{name}@{entry['start']}"
+        row = self.db.execute("SELECT offset, done FROM ingest_state WHERE segment = ?", (key,)).fetchone()
+        offset, done = row if row else (0, 0)
+        if done:
+            return 0
+
+        path = self.logs_dir / entry["file"]
+        if not entry["compressed"] and not path.exists() and Path(f"{path}.gz").exists():
+            path = Path(f"{path}.gz")  # Compressed since the index was read
+        try:
+            if path.suffix == ".gz":
+                f = gzip.open(path, 'rb')
+                f.read(offset)  # Only happens once per segment, after it closes
+            else:
+                f = open(path, 'rb')
+                f.seek(offset)
+        except FileNotFoundError:
+            return 0
+
+        with f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # Only consume complete lines
+        rows = [
+            event for event in
+            (parse(line.decode("utf-8", errors="replace")) for line in data[:end].splitlines())
+            if event
+        ]
+
+        with self.db:
+            self.db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.execute(
+                "INSERT OR REPLACE INTO ingest_state VALUES (?, ?, ?)",
+                (key, offset + end, int(not entry["active"] and end == len(data))),
+            )
+        return len(rows)
+
+    # ── queries ──────────────────────────────────────────────
+
+    def rollup(self, period="week", by=("agent",), since=None):
+        """Session count, hours and cost of ended sessions per period and grouping."""
+        columns = [column for column in by if column in GROUP_COLUMNS]
+        group = ", ".join(["period"] + columns)
+        select = ", ".join(columns + [""]) if columns else ""
+        query = f"""
+            SELECT strftime(?, ts, 'unixepoch', 'localtime') AS period, {select}
+                   COUNT(*), COALESCE(SUM(duration), 0) / 3600.0, COALESCE(SUM(cost), 0)
+            FROM events
+            WHERE event = 'session_end' AND ts >= ?
+            GROUP BY {group}
+            ORDER BY period DESC, {len(columns) + 4} DESC
+        """
+        return self.db.execute(query, (PERIODS[period], since or 0)).fetchall()
+
+    def agent_usage(self, since=None):
+        """How often each agent was switched to, per project."""
+        return self.db.execute("""
+            SELECT agent, project, COUNT(*) FROM events
+            WHERE event = 'agent' AND ts >= ?
+            GROUP BY agent, project
+            ORDER BY 3 DESC
+        """, (since or 0,)).fetchall()
+
+
+def default_since(period):
+    """Start of the current day/week/month."""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "week":
+        today -= timedelta(days=today.weekday())
+    elif period == "month":
+        today = today.replace(day=1)
+    return today.timestamp()
+
+
+def print_rollup(rows, period, by):
+    columns = [column for column in by if column in GROUP_COLUMNS]
+    header = ["Period"] + [column.title() for column in columns] + ["Sessions", "Hours", "Cost"]
+    print("  ".join(f"{h:<16}" if i <= len(columns) else f"{h:>10}" for i, h in enumerate(header)))
+    for row in rows:
+        labels = [str(value or "-") for value in row[:1 + len(columns)]]
+        sessions, hours, cost = row[1 + len(columns):]
+        print("  ".join(f"{label:<16}" for label in labels)
+              + f"  {sessions:>10}  {hours:>10.1f}  {f'${cost:.2f}':>10}")
+    if not rows:
+        print(f"ℹ️  No sessions this {period}")
+
+
+def _option(argv, flag, default=None):
+    return argv[argv.index(flag) + 1] if flag in argv and argv.index(flag) + 1 < len(argv) else default
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "report"
+    analytics = UsageAnalytics()
+
+    started = time.time()
+    added = analytics.ingest()
+
+    if command == "ingest":
+        print(f"✅ Ingested {added} events in {time.time() - started:.2f}s")
+        return 0
+
+    since = _option(argv, "--since")
+    since = datetime.fromisoformat(since).timestamp() if since else None
+
+    if command == "report":
+        period = _option(argv, "--period", "week")
+        if period not in PERIODS:
+            print(f"❌ Unknown period: {period} (day, week, month)", file=sys.stderr)
+            return 2
+        by = _option(argv, "--by", "agent").split(",")
+        rows = analytics.rollup(period, by, since if since is not None else default_since(period))
+        print_rollup(rows, period, by)
+        return 0
+    if command == "agents":
+        for agent, project, count in analytics.agent_usage(since):
+            print(f"  {agent or '-':<20} {project or '-':<24} {count:>6}")
+        return 0
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Model Router
+Picks the cheapest model that can handle a task, within weekly quotas.
+
+Candidates come from `models:` in VARIABLES.yaml, ordered by
+cost_multiplier. A model qualifies for a task when:
+- its max_complexity covers the task's complexity (1-10)
+- the task's estimated context fits in routing.context_headroom of its
+  context_window (the 80% "red zone" in docs/CONTEXT_OPTIMIZATION.md)
+- its usage_limit_hours_per_week (lower bound) minus hours used this week
+  still covers the task's estimated hours
+
+The cheapest qualifying model wins. When none qualifies because quotas are
+spent, the router falls back to the most capable model with hours left (the
+MODEL_ALLOCATION_STRATEGY.md rule: Opus exhausted -> Sonnet) and says so.
+
+Hours used per model are kept per ISO week in ~/.claude/.cache/model_quota.json
+(updated under flock); the counters reset when the week changes. Routes made
+by one process reserve their hours in memory, so a sprint routing many tasks
+at once does not overcommit a tier.
+
+Usage:
+    python3 model_router.py route --complexity 6 --context 90000 --hours 2
+    python3 model_router.py route --title "Framework architecture review" --hours 1 --json
+    python3 model_router.py status                # Weekly quota per model
+    python3 model_router.py record MODEL_001_OPUS 1.5
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+QUOTA_FILE = Path.home() / ".claude" / ".cache" / "model_quota.json"
+DEFAULT_CONTEXT_HEADROOM = 0.8
+DEFAULT_TASK_CONTEXT = 60000
+DEFAULT_COMPLEXITY = 5
+
+# Title keywords that mark a task as top complexity (MODEL_ALLOCATION_STRATEGY.md "Superstar Founder")
+CRITICAL_RE = re.compile(r"\b(architecture|framework design|emergency|unblock|strategic|pivot)\b", re.IGNORECASE)
+# Estimate (hours) -> complexity when a task gives none
+COMPLEXITY_BY_HOURS = ((1, 3), (3, 5), (6, 7), (float("inf"), 8))
+
+QUOTA_LEVELS = ((0.5, "🟢"), (0.25, "🟡"), (0.1, "🟠"), (0.0, "🔴"))
+
+
+def week_key(today=None):
+    iso = (today or date.today()).isocalendar()
+    return f"{iso[0]}-W{iso[1]:02d}"
+
+
+def weekly_limit(model):
+    """Lower bound of usage_limit_hours_per_week, or None for unlimited."""
+    limit = model.get("usage_limit_hours_per_week")
+    if isinstance(limit, (list, tuple)):
+        return float(min(limit))
+    if isinstance(limit, (int, float)):
+        return float(limit)
+    return None
+
+
+def estimate_complexity(title="", hours=None):
+    """Complexity 1-10 from a task title and estimate, for plans that don't state one."""
+    if title and CRITICAL_RE.search(title):
+        return 10
+    if hours is None:
+        return DEFAULT_COMPLEXITY
+    return next(level for limit, level in COMPLEXITY_BY_HOURS if hours <= limit)
+
+
+def parse_complexity(text):
+    """'7', '7/10', 'high' -> 1-10, or None."""
+    text = (text or "").strip().lower()
+    match = re.match(r"(\d+)", text)
+    if match:
+        return max(1, min(10, int(match.group(1))))
+    return {"low": 3, "simple": 3, "medium": 5, "high": 8, "complex": 8, "critical": 10}.get(text)
+
+
+def parse_tokens(text):
+    """'120k tokens', '1.5M', '90000' -> int, or None."""
+    match = re.search(r"(\d+(?:\.\d+)?)\s*([km])?", (text or "").lower())
+    if not match:
+        return None
+    scale = {"k": 1000, "m": 1000000}.get(match.group(2), 1)
+    return int(float(match.group(1)) * scale)
+
+
+class Route:
+    """A routing decision."""
+    __slots__ = ("key", "model", "reason", "fallback")
+
+    def __init__(self, key, model, reason, fallback=False):
+        self.key = key
+        self.model = model
+        self.reason = reason
+        self.fallback = fallback
+
+    @property
+    def model_id(self):
+        return self.model.get("id", self.key)
+
+    def as_dict(self):
+        return {"model": self.key, "id": self.model_id, "name": self.model.get("name"),
+                "reason": self.reason, "fallback": self.fallback}
+
+
+class ModelRouter:
+    """Cheapest-qualifying-model router with weekly quota tracking."""
+
+    def __init__(self, models=None, quota_file=QUOTA_FILE, context_headroom=None):
+        settings = {}
+        if models is None:
+            from variables import get
+            models = get("models", None)
+            settings = get("routing", {}) or {}
+            if not models:
+                raise ValueError("No models: in VARIABLES.yaml (file not found or unreadable; "
+                                 "set CLAUDE_FRAMEWORK_ROOT to the framework checkout)")
+        self.models = models
+        self.quota_file = Path(quota_file)
+        self.context_headroom = float(context_headroom or settings.get("context_headroom", DEFAULT_CONTEXT_HEADROOM))
+        self.default_context = int(settings.get("default_task_context_tokens", DEFAULT_TASK_CONTEXT))
+        # Cheapest first; ties broken by larger window
+        self.order = sorted(self.models, key=lambda key: (self.models[key].get("cost_multiplier", 1.0),
+                                                          -self.models[key].get("context_window", 0)))
+        self.reserved = {}  # Hours routed by this process, not yet recorded
+
+    # ── quota ────────────────────────────────────────────────
+
+    def _read_usage(self):
+        try:
+            data = json.loads(self.quota_file.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data.get("used_hours", {}) if data.get("week") == week_key() else {}
+
+    @contextmanager
+    def _locked_usage(self):
+        self.quota_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.quota_file.with_suffix(".lock"), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            used = self._read_usage()
+            yield used
+            tmp = self.quota_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"week": week_key(), "used_hours": used}))
+            os.replace(tmp, self.quota_file)
+
+    def record(self, key, hours, reserved=None):
+        """Add actual hours for a model and release `reserved` hours (default: `hours`) that
+        route(reserve=True) set aside for the task."""
+        if key not in self.models:
+            raise KeyError(key)
+        with self._locked_usage() as used:
+            used[key] = round(used.get(key, 0.0) + hours, 4)
+            if key in self.reserved:  # Under the lock too: sprint_runner records from worker threads
+                self.reserved[key] = max(0.0, self.reserved[key] - (hours if reserved is None else reserved))
+
+    def remaining(self, used=None):
+        """{model key: hours left this week, or None for unlimited}."""
+        used = self._read_usage() if used is None else used
+        left = {}
+        for key, model in self.models.items():
+            limit = weekly_limit(model)
+            left[key] = None if limit is None else max(0.0, limit - used.get(key, 0.0) - self.reserved.get(key, 0.0))
+        return left
+
+    # ── routing ──────────────────────────────────────────────
+
+    def fits_context(self, key, context_tokens):
+        return context_tokens <= self.models[key].get("context_window", 0) * self.context_headroom
+
+    def route(self, complexity=None, context_tokens=None, hours=1.0, title="", reserve=False):
+        """Pick a model for a task. With reserve=True its hours count against the quota for
+        later routes made by this router."""
+        complexity = complexity or estimate_complexity(title, hours)
+        context_tokens = context_tokens or self.default_context
+        left = self.remaining()
+
+        def has_quota(key):
+            return left[key] is None or left[key] >= hours
+
+        capable = [key for key in self.order
+                   if self.models[key].get("max_complexity", 10) >= complexity and self.fits_context(key, context_tokens)]
+        choice = next((key for key in capable if has_quota(key)), None)
+        if choice:
+            skipped = capable[:capable.index(choice)]
+            reason = f"cheapest for complexity {complexity}, ~{context_tokens // 1000}k tokens"
+            if skipped:
+                reason += f" ({', '.join(skipped)} out of quota)"
+            decision = Route(choice, self.models[choice], reason, fallback=bool(skipped))
+        else:
+            # Nothing capable has hours left: most capable model with quota that fits the context
+            fitting = [key for key in self.order if has_quota(key) and self.fits_context(key, context_tokens)] \
+                or [max(self.order, key=lambda key: self.models[key].get("context_window", 0))]
+            choice = max(fitting, key=lambda key: (self.models[key].get("max_complexity", 10),
+                                                   -self.order.index(key)))
+            if capable:
+                reason = f"fallback: {', '.join(capable)} out of quota for {hours:g}h this week"
+            else:
+                reason = f"fallback: no model fits complexity {complexity} with ~{context_tokens // 1000}k tokens"
+            decision = Route(choice, self.models[choice], reason, fallback=True)
+
+        if reserve:
+            self.reserved[decision.key] = self.reserved.get(decision.key, 0.0) + hours
+        return decision
+
+    def status(self):
+        """[(key, model, used hours, limit or None, level icon)]."""
+        used = self._read_usage()
+        rows = []
+        for key in self.order:
+            model = self.models[key]
+            limit = weekly_limit(model)
+            hours = used.get(key, 0.0)
+            fraction = 1.0 if limit is None else max(0.0, 1 - hours / limit) if limit else 0.0
+            icon = next(icon for floor, icon in QUOTA_LEVELS if fraction > floor or floor == 0.0)
+            rows.append((key, model, hours, limit, icon))
+        return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pick a model per task from the models: registry")
+    sub = parser.add_subparsers(dest="command")
+    route = sub.add_parser("route", help="Pick a model for a task")
+    route.add_argument("--complexity", type=parse_complexity, help="1-10 or low/medium/high/critical")
+    route.add_argument("--context", type=parse_tokens, help="Estimated context, e.g. 90000 or 120k")
+    route.add_argument("--hours", type=float, default=1.0, help="Estimated hours (default 1)")
+    route.add_argument("--title", default="", help="Task title (used to infer complexity)")
+    route.add_argument("--json", action="store_true")
+    sub.add_parser("status", help="Weekly quota per model")
+    record = sub.add_parser("record", help="Add hours used by a model this week")
+    record.add_argument("model")
+    record.add_argument("hours", type=float)
+    args = parser.parse_args(argv)
+    try:
+        router = ModelRouter()
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    if args.command == "route":
+        decision = router.route(args.complexity, args.context, args.hours, args.title)
+        if args.json:
+            print(json.dumps(decision.as_dict()))
+        else:
+            print(f"{'⚠️ ' if decision.fallback else '✅'} {decision.key} ({decision.model_id}): {decision.reason}")
+        return 0
+    if args.command == "status":
+        print(f"Week {week_key()}")
+        for key, model, hours, limit, icon in router.status():
+            quota = "unlimited" if limit is None else f"{hours:.1f}/{limit:g}h"
+            print(f"  {icon} {key:<18} {model.get('name', ''):<12} {quota:>14}  x{model.get('cost_multiplier', 1.0)}")
+        return 0
+    if args.command == "record":
+        try:
+            router.record(args.model, args.hours)
+        except KeyError:
+            print(f"❌ Unknown model: {args.model} ({', '.join(router.models)})", file=sys.stderr)
+            return 2
+        print(f"✅ Recorded {args.hours:g}h on {args.model}")
+        return 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
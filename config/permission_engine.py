@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Permission Engine
+Answers "may agent X use tool T on path P" from config/permissions/*-agent-permissions.json.
+
+Each agent file lists allowed / ask / deny pattern groups per tool. Path
+patterns ("/src/api/**", "/.eslintrc*", "/ADR-*.md") are rooted at the
+project and compiled per (agent, tool) into a trie of literal path
+segments: "/src/api/**" marks the src → api node as covering its whole
+subtree, "/setup.py" marks a leaf, and only wildcard tails ("/.eslintrc*",
+"/src/**/test_*.py") keep a pre-compiled regex, tried against the rest of
+the path at the node where the literal prefix ends. A lookup is one walk
+down the path's segments. Command tools (Bash, WebFetch) match the whole
+argument against one alternation regex per decision. A Bash command is
+first split on unquoted ;, &&, ||, |, & and newlines and every part is
+checked on its own: one denied part denies the command, and it is allowed
+only if every part is. Unquoted redirections are split off into parts of
+their own ("> /etc/passwd"), so they need a rule of their own; fd
+duplications such as 2>&1 are dropped. In command patterns * does not span
+`...` or $ expansions, so "pytest tests/**" cannot carry a substituted
+command or variable along.
+
+Precedence: deny > ask > allow; anything no group matches is denied as out
+of scope, as are paths that leave the project (absolute paths outside
+the project root included). MultiEdit/NotebookEdit count
+as Edit and NotebookRead as Read.
+
+Audit mode checks a whole diff at once - added or deleted files need Write,
+modified ones Edit - so a sprint's changes can be held against the agents'
+scopes before merge. With several agents a file passes if any of them may
+change it.
+
+Usage:
+    python3 permission_engine.py check backend Write src/api/routes.py
+    python3 permission_engine.py check frontend Bash "npm run build"
+    python3 permission_engine.py audit backend main...HEAD          # Exit 1 on denied files
+    git diff --name-only main | python3 permission_engine.py audit backend frontend --stdin
+    python3 permission_engine.py agents                             # Loaded agents and tools
+    python3 permission_engine.py bench [-n N]                       # Lookup latency
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CONFIG_DIR = Path(__file__).resolve().parent
+PERMISSIONS_DIRS = [
+    Path(os.environ["CLAUDE_PERMISSIONS_DIR"]) if os.getenv("CLAUDE_PERMISSIONS_DIR") else None,
+    CONFIG_DIR / "permissions",
+    Path(os.getenv("CLAUDE_FRAMEWORK_ROOT", Path.home() / "dev" / "claude-dev-framework")) / "config" / "permissions",
+]
+
+DECISIONS = ("deny", "ask", "allow")  # Precedence order
+GROUP_DECISIONS = {"allowed": "allow", "allow": "allow", "ask": "ask", "deny": "deny"}
+PATH_TOOLS = frozenset(("Read", "Write", "Edit", "Grep", "Glob"))
+TOOL_ALIASES = {"MultiEdit": "Edit", "NotebookEdit": "Edit", "NotebookRead": "Read"}
+OUT_OF_SCOPE = "No rule grants this (outside the agent's scope)"
+OUTSIDE_PROJECT = "Path is outside the project"
+COMMAND_STAR = r"[^`$]*"  # * in command patterns: anything but substitutions and expansions
+COMMAND_ONE = r"[^`$]"    # ? likewise
+# Quoted strings and escapes stay whole; group 1 is an fd duplication (2>&1), group 2 a
+# redirection operator, group 3 a separator
+COMMAND_TOKEN = re.compile(r"""'[^']*'?|"(?:\\.|[^"\\])*"?|\\.?"""
+                           r"""|(\d*[<>]&(?:\d+|-)(?=[\s;&|<>]|$))"""
+                           r"""|(\d*(?:&>>?|>>|>\||<<<|<<-?|<>|>&|[<>]))"""
+                           r"""|(&&|\|\||\|&|[;|&\n])"""
+                           r"""|(?:[^'"\\;&|\n<>\d]|\d+(?![\d<>]))+""", re.DOTALL)
+COMMAND_SPECIAL = re.compile(r"[;&|\n<>'\"\\]")  # Nothing to split without one of these
+WORD_END = re.compile(r"\s")
+
+
+def find_permissions_dir():
+    for directory in PERMISSIONS_DIRS:
+        if directory and any(directory.glob("*-agent-permissions.json")):
+            return directory
+    return None
+
+
+def glob_to_regex(pattern, command=False):
+    """Glob → regex source. Paths: ** spans directories, * and ? stay within one.
+    Commands (command=True): * spans anything but substitutions and $ expansions."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i) and not command:
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(COMMAND_STAR if command else ".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append(COMMAND_STAR if command else "[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append(COMMAND_ONE if command else "[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def split_command(command):
+    """Simple commands of a shell command line: split on ;, &&, ||, |, & and newlines outside
+    quotes. Each unquoted redirection becomes a part of its own, "<operator> <target>"."""
+    if not COMMAND_SPECIAL.search(command):
+        return [command.strip()] if command.strip() else []
+    parts, current, redirects = [], [], []
+    target = None  # Redirection being read: [operator, target pieces...]
+    for token in COMMAND_TOKEN.finditer(command):
+        duplication, redirect, separator = token.groups()
+        text = token.group()
+        if duplication:
+            continue
+        if redirect or separator:
+            target = None
+            if redirect:
+                target = [redirect.lstrip("0123456789") + " "]
+                redirects.append(target)
+            else:
+                parts += [current, *redirects]
+                current, redirects = [], []
+            continue
+        if target is not None:
+            if text[0] in "'\"\\":
+                target.append(text)
+                continue
+            if len(target) == 1:
+                text = text.lstrip()
+            end = WORD_END.search(text)
+            if end is None:
+                target.append(text)
+                continue
+            target.append(text[:end.start()])
+            target, text = None, text[end.start():]
+            if current and current[-1][-1:].isspace():
+                text = text.lstrip()
+        current.append(text)
+    parts += [current, *redirects]
+    return [part for part in ("".join(pieces).strip() for pieces in parts) if part]
+
+
+class Decision:
+    __slots__ = ("decision", "reason", "pattern")
+
+    def __init__(self, decision, reason, pattern=None):
+        self.decision = decision
+        self.reason = reason
+        self.pattern = pattern
+
+    @property
+    def allowed(self):
+        return self.decision == "allow"
+
+    def as_dict(self):
+        return {"decision": self.decision, "reason": self.reason, "pattern": self.pattern}
+
+
+class Rule:
+    """One pattern of one group: what a match means."""
+    __slots__ = ("decision", "pattern", "description")
+
+    def __init__(self, decision, pattern, description):
+        self.decision = decision
+        self.pattern = pattern
+        self.description = description
+
+
+class TrieNode:
+    __slots__ = ("children", "subtree", "exact", "tails")
+
+    def __init__(self):
+        self.children = {}
+        self.subtree = []  # Rules covering this directory and everything below it ("/dir/**")
+        self.exact = []    # Rules for this exact path ("/setup.py")
+        self.tails = []    # (compiled regex, rule) for wildcard remainders
+
+
+class PathMatcher:
+    """Segment trie for one agent's path patterns for one tool."""
+
+    def __init__(self):
+        self.root = TrieNode()
+
+    def add(self, rule):
+        segments = [s for s in rule.pattern.strip("/").split("/") if s]
+        node = self.root
+        for i, segment in enumerate(segments):
+            if any(c in segment for c in "*?"):
+                tail = "/".join(segments[i:])
+                if tail == "**":
+                    node.subtree.append(rule)
+                else:
+                    node.tails.append((re.compile(glob_to_regex(tail)), rule))
+                return
+            node = node.children.setdefault(segment, TrieNode())
+        node.exact.append(rule)
+
+    def match(self, segments):
+        """Rules matching a project-relative path given as segments ([] is the project root)."""
+        found, node = [], self.root
+        for i, segment in enumerate(segments):
+            found += node.subtree
+            if node.tails:
+                rest = "/".join(segments[i:])
+                found += [rule for regex, rule in node.tails if regex.fullmatch(rest)]
+            node = node.children.get(segment)
+            if node is None:
+                return found
+        return found + node.exact + node.subtree
+
+
+class CommandMatcher:
+    """One alternation regex per decision over whole command strings."""
+
+    def __init__(self):
+        self.rules = {}
+
+    def add(self, rule):
+        self.rules.setdefault(rule.decision, []).append(rule)
+
+    def compile(self):
+        self.regexes = {
+            decision: [(re.compile(glob_to_regex(rule.pattern, command=True), re.DOTALL), rule) for rule in rules]
+            for decision, rules in self.rules.items()
+        }
+        self.combined = {
+            decision: re.compile("|".join(f"(?:{regex.pattern})" for regex, _ in pairs), re.DOTALL)
+            for decision, pairs in self.regexes.items()
+        }
+
+    def match(self, text):
+        found = []
+        for decision, combined in self.combined.items():
+            if combined.fullmatch(text):
+                # Which rule matched (for the reason); only on a hit
+                found.append(next(rule for regex, rule in self.regexes[decision] if regex.fullmatch(text)))
+        return found
+
+
+class AgentPermissions:
+    """Compiled matchers for one agent file."""
+
+    def __init__(self, path):
+        with open(path, 'r') as f:
+            config = json.load(f)
+        self.name = config.get("agent") or path.name.replace("-agent-permissions.json", "")
+        self.path = path
+        self.matchers = {}
+        for group, entries in (config.get("permissions") or {}).items():
+            decision = GROUP_DECISIONS.get(group)
+            if not decision:
+                continue
+            for entry in entries:
+                tool = entry["tool"]
+                if tool not in self.matchers:
+                    self.matchers[tool] = PathMatcher() if tool in PATH_TOOLS else CommandMatcher()
+                for pattern in entry.get("patterns", []):
+                    self.matchers[tool].add(Rule(decision, pattern, entry.get("description", "")))
+        for matcher in self.matchers.values():
+            if isinstance(matcher, CommandMatcher):
+                matcher.compile()
+
+
+class PermissionEngine:
+    """All agents' permission files, compiled once."""
+
+    def __init__(self, directory=None, root=None):
+        self.directory = Path(directory) if directory else find_permissions_dir()
+        self.root = Path(root or os.getcwd()).resolve()
+        self.agents = {}
+        if self.directory:
+            for path in sorted(self.directory.glob("*-agent-permissions.json")):
+                agent = AgentPermissions(path)
+                self.agents[agent.name.lower()] = agent
+
+    def agent(self, name):
+        try:
+            return self.agents[name.lower()]
+        except KeyError:
+            raise KeyError(f"No permission file for agent '{name}' (have: {', '.join(self.agents) or 'none'})")
+
+    def segments(self, path):
+        """Project-relative segments, or None if the path leaves the project.
+        Absolute paths must lie under the root; relative paths are taken from it."""
+        if os.path.isabs(path):
+            try:
+                path = str(Path(os.path.normpath(path)).relative_to(self.root))
+            except ValueError:
+                return None
+        path = os.path.normpath(path or ".")
+        if path == ".":
+            return []
+        if path == ".." or path.startswith("../"):
+            return None
+        return path.split("/")
+
+    def check(self, agent, tool, target):
+        """Decision for an agent using a tool on a path (path tools) or argument string (others)."""
+        permissions = self.agent(agent)
+        tool = TOOL_ALIASES.get(tool, tool)
+        matcher = permissions.matchers.get(tool)
+        if matcher is None:
+            return Decision("deny", f"No {tool} rules for {permissions.name}")
+
+        if isinstance(matcher, PathMatcher):
+            segments = self.segments(target)
+            if segments is None:
+                return Decision("deny", OUTSIDE_PROJECT)
+            return self.decide(matcher.match(segments))
+        if tool != "Bash":
+            return self.decide(matcher.match(target.strip()))
+
+        parts = split_command(target) or [""]
+        if len(parts) == 1:
+            return self.decide(matcher.match(parts[0]))
+        # Every part must pass: the most restrictive part decides (an explicit deny over out of scope)
+        worst = None
+        for part in parts:
+            decision = self.decide(matcher.match(part))
+            rank = (DECISIONS.index(decision.decision), decision.pattern is None)
+            if worst is None or rank < worst[0]:
+                worst = (rank, part, decision)
+        _, part, decision = worst
+        if decision.allowed:
+            return decision
+        return Decision(decision.decision, f"{decision.reason} (in: {part})", decision.pattern)
+
+    @staticmethod
+    def decide(rules):
+        """Highest-precedence decision among matched rules, or out of scope."""
+        for decision in DECISIONS:
+            for rule in rules:
+                if rule.decision == decision:
+                    return Decision(decision, rule.description, rule.pattern)
+        return Decision("deny", OUT_OF_SCOPE)
+
+    def audit(self, agents, changes):
+        """[(path, tool, Decision)] for (path, tool) changes; the most permissive agent's decision wins."""
+        results = []
+        for path, tool in changes:
+            decisions = [self.check(agent, tool, path) for agent in agents]
+            best = max(decisions, key=lambda d: DECISIONS.index(d.decision))
+            results.append((path, tool, best))
+        return results
+
+
+_engine = None
+
+
+def get_permission_engine():
+    """Process-wide engine (loaded and compiled once)."""
+    global _engine
+    if _engine is None:
+        _engine = PermissionEngine()
+    return _engine
+
+
+# ── diff input ───────────────────────────────────────────
+
+def diff_changes(rev_range=None, cwd=None):
+    """[(path, tool)] from git diff --name-status: added/deleted need Write, the rest Edit."""
+    cmd = ["git", "diff", "--name-status", "--no-renames", rev_range or "HEAD"]
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "git diff failed")
+    changes = []
+    for line in result.stdout.splitlines():
+        status, _, path = line.partition("\t")
+        changes.append((path, "Write" if status[:1] in ("A", "D") else "Edit"))
+    return changes
+
+
+# ── benchmark ────────────────────────────────────────────
+
+BENCH_CASES = [
+    ("Write", "src/api/routes/books.py"),
+    ("Write", "src/ui/components/Header.tsx"),
+    ("Edit", "tests/unit/test_books.py"),
+    ("Read", "requirements.txt"),
+    ("Read", ".eslintrc.json"),
+    ("Write", "docs/ADR-001-storage.md"),
+    ("Bash", "pytest tests/unit/test_books.py"),
+    ("Bash", "git push --force"),
+]
+
+
+def bench(engine, iterations=20000):
+    cases = [(agent, tool, target) for agent in engine.agents for tool, target in BENCH_CASES]
+    start = time.perf_counter()
+    for i in range(iterations):
+        engine.check(*cases[i % len(cases)])
+    elapsed = time.perf_counter() - start
+    print(f"{iterations} checks over {len(engine.agents)} agents: {elapsed / iterations * 1e6:.2f} µs/check")
+    return 0
+
+
+ICONS = {"allow": "✅", "ask": "⚠️ ", "deny": "❌"}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else ""
+    engine = get_permission_engine()
+    if not engine.agents and command in ("check", "audit", "agents", "bench"):
+        print("❌ No *-agent-permissions.json found (set CLAUDE_PERMISSIONS_DIR)", file=sys.stderr)
+        return 2
+
+    try:
+        if command == "check" and len(argv) >= 3:
+            decision = engine.check(argv[1], argv[2], " ".join(argv[3:]))
+            if "--json" in argv:
+                print(json.dumps(decision.as_dict()))
+            else:
+                pattern = f" [{decision.pattern}]" if decision.pattern else ""
+                print(f"{ICONS[decision.decision]} {decision.decision}: {decision.reason}{pattern}")
+            return 0 if decision.allowed else 1
+        if command == "audit" and len(argv) >= 2:
+            args = [a for a in argv[1:] if not a.startswith("--")]
+            if "--stdin" in argv:
+                agents = args
+                changes = [(line.strip(), "Write") for line in sys.stdin if line.strip()]
+            else:
+                ranges = [a for a in args if a.lower() not in engine.agents]
+                agents = [a for a in args if a.lower() in engine.agents]
+                changes = diff_changes(ranges[0] if ranges else None)
+            if not agents:
+                print(f"❌ No known agent given (have: {', '.join(engine.agents)})", file=sys.stderr)
+                return 2
+            results = engine.audit(agents, changes)
+            for path, tool, decision in results:
+                print(f"{ICONS[decision.decision]} {tool:<5} {path:<50} {decision.reason}")
+            denied = sum(1 for _, _, d in results if d.decision == "deny")
+            asks = sum(1 for _, _, d in results if d.decision == "ask")
+            print(f"\n{len(results)} files: {len(results) - denied - asks} allowed, {asks} need approval, "
+                  f"{denied} denied ({', '.join(agents)})")
+            return 1 if denied else 0
+        if command == "agents":
+            print(f"Permissions: {engine.directory}")
+            for name, agent in engine.agents.items():
+                print(f"  {name:<12} {', '.join(agent.matchers)}")
+            return 0
+        if command == "bench":
+            return bench(engine, int(argv[argv.index("-n") + 1]) if "-n" in argv else 20000)
+    except (KeyError, RuntimeError) as e:
+        print(f"❌ {e.args[0] if e.args else e}", file=sys.stderr)
+        return 2
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Reward Engine
+XP, levels, attributes and salary for the reward-system plugin.
+
+Applies task/sprint events to per-agent records using the `rewards:` rules
+in VARIABLES.yaml (earning_rates, level_thresholds, attribute growth_rates,
+salary base_rates/attribute_multipliers/bonuses). Every update is O(1) per
+touched value:
+- Level and salary multiplier come from bisect over the sorted thresholds
+- Each agent keeps a running attribute sum, so the average is never rescanned
+- Leaderboards (xp, rating, earnings) are sorted indexes updated in place
+  with bisect, not recomputed from the event history
+
+State is one compact file, ~/.claude/rewards/tracker.json (rows of
+`__slots__` AgentRecords), replaced atomically under flock. Events are also
+appended to history.jsonl so the tracker can be rebuilt if rules change.
+The status line reads the tracker through a stat-keyed cache, so a redraw
+costs one stat() unless the file changed.
+
+Usage:
+    python3 reward_engine.py record backend task_complex [--attr "API Integration"] [--bonus sprint_zero_bugs]
+    python3 reward_engine.py sprint .ai/sprints/sprint-7/run-results.json
+    python3 reward_engine.py stats backend
+    python3 reward_engine.py leaderboard [--by xp|rating|earnings] [-n 10]
+    python3 reward_engine.py rebuild       # Replay history.jsonl with current rules
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import sys
+import time
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from pathlib import Path
+
+REWARDS_DIR = Path.home() / ".claude" / "rewards"
+STATE_VERSION = 1
+INITIAL_ATTRIBUTE = 10.0
+LEADERBOARDS = ("xp", "rating", "earnings")
+
+# Sprint task estimates (hours) -> XP event
+TASK_SIZES = ((2, "task_simple"), (6, "task_medium"), (float("inf"), "task_complex"))
+
+# Upper bound of the attribute band each growth rate applies to (AGENT_ECONOMY.md)
+GROWTH_BANDS = (("fast", 10), ("medium", 15), ("slow", 18), ("very_slow", float("inf")))
+
+
+def _suffix_number(key):
+    return int(key.rsplit("_", 1)[1])
+
+
+class Rules:
+    """Pre-sorted lookup tables built once from rewards: in VARIABLES.yaml."""
+
+    def __init__(self, rewards=None):
+        if rewards is None:
+            from variables import get
+            rewards = get("rewards", None)
+            if not rewards:
+                raise ValueError("No rewards: in VARIABLES.yaml (file not found or unreadable; "
+                                 "set CLAUDE_FRAMEWORK_ROOT to the framework checkout)")
+        xp = rewards.get("xp_system", {})
+        attributes = rewards.get("attributes", {})
+        salary = rewards.get("salary", {})
+
+        self.xp_enabled = xp.get("enabled_by_default", True)
+        self.attributes_enabled = attributes.get("enabled_by_default", True)
+        self.salary_enabled = salary.get("enabled_by_default", False)
+        self.earning_rates = dict(xp.get("earning_rates", {}))
+        self.salary_bonuses = dict(salary.get("bonuses", {}))
+
+        levels = sorted(xp.get("level_thresholds", {}).items(), key=lambda item: item[1])
+        self.level_numbers = [_suffix_number(key) for key, _ in levels] or [1]
+        self.level_thresholds = [value for _, value in levels] or [0]
+
+        self.scale_min, self.scale_max = attributes.get("scale", [1, 20])
+        rates = attributes.get("growth_rates", {})
+        self.growth_bounds = [bound for _, bound in GROWTH_BANDS]
+        self.growth_rates = [float(rates.get(name, 0)) for name, _ in GROWTH_BANDS]
+
+        self.base_rates = {_suffix_number(key): value for key, value in salary.get("base_rates", {}).items()}
+        bands = sorted((int(key.split("_")[1]), value)
+                       for key, value in salary.get("attribute_multipliers", {}).items())
+        self.multiplier_floors = [low for low, _ in bands]
+        self.multipliers = [value for _, value in bands]
+
+    def level(self, xp):
+        index = bisect_right(self.level_thresholds, xp) - 1
+        return self.level_numbers[max(index, 0)]
+
+    def next_threshold(self, xp):
+        """XP needed for the next level, or None at max level."""
+        index = bisect_right(self.level_thresholds, xp)
+        return self.level_thresholds[index] if index < len(self.level_thresholds) else None
+
+    def growth(self, value):
+        """Attribute growth per success for the band `value` falls in (diminishing returns)."""
+        return self.growth_rates[bisect_left(self.growth_bounds, int(value))]
+
+    def multiplier(self, average):
+        index = bisect_right(self.multiplier_floors, average) - 1
+        return self.multipliers[index] if index >= 0 else 1.0
+
+    def salary(self, level, average):
+        return self.base_rates.get(level, 0) * self.multiplier(average)
+
+
+class AgentRecord:
+    """One agent's progression. Serialized as a compact row."""
+    __slots__ = ("name", "xp", "level", "tasks", "earnings", "attributes", "attribute_sum")
+
+    def __init__(self, name, xp=0, level=1, tasks=0, earnings=0.0, attributes=None):
+        self.name = name
+        self.xp = xp
+        self.level = level
+        self.tasks = tasks
+        self.earnings = earnings
+        self.attributes = attributes or {}
+        self.attribute_sum = sum(self.attributes.values())
+
+    @property
+    def rating(self):
+        """Average attribute (0 until any attribute has been trained)."""
+        return self.attribute_sum / len(self.attributes) if self.attributes else 0.0
+
+    def metric(self, name):
+        return getattr(self, name)
+
+    def to_row(self):
+        return [self.name, self.xp, self.level, self.tasks, round(self.earnings, 2),
+                {key: round(value, 3) for key, value in self.attributes.items()}]
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+
+class RewardEngine:
+    """Incremental reward state with maintained leaderboard indexes."""
+
+    def __init__(self, rewards_dir=REWARDS_DIR, rules=None):
+        self.rewards_dir = Path(rewards_dir)
+        self.tracker_path = self.rewards_dir / "tracker.json"
+        self.history_path = self.rewards_dir / "history.jsonl"
+        self.lock_path = self.rewards_dir / ".tracker.lock"
+        self._rules = rules
+        self.agents = {}
+        self.sources = set()  # Awarded "<sprint>/<task id>" and "<sprint>/milestone" keys (idempotent `sprint`)
+        self.boards = {metric: [] for metric in LEADERBOARDS}
+        self._key = None
+
+    @property
+    def rules(self):
+        """Built on first use, so a status line redraw with no tracker never loads VARIABLES.yaml."""
+        if self._rules is None:
+            self._rules = Rules()
+        return self._rules
+
+    # ── persistence ──────────────────────────────────────────
+
+    def load(self):
+        """(Re)load the tracker if it changed since the last load; one stat() otherwise."""
+        try:
+            st = os.stat(self.tracker_path)
+        except OSError:
+            if self._key is not None:
+                self._reset()
+            return self
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._key:
+            return self
+        try:
+            data = json.loads(self.tracker_path.read_text())
+        except (OSError, ValueError):
+            return self
+        self._reset()
+        for row in data.get("agents", []):
+            record = AgentRecord.from_row(row)
+            self.agents[record.name] = record
+            for metric in LEADERBOARDS:
+                insort(self.boards[metric], (-record.metric(metric), record.name))
+        self.sources = set(data.get("sources", []))
+        self._key = key
+        return self
+
+    def _reset(self):
+        self.agents = {}
+        self.sources = set()
+        self.boards = {metric: [] for metric in LEADERBOARDS}
+        self._key = None
+
+    def save(self):
+        self.rewards_dir.mkdir(parents=True, exist_ok=True)
+        data = {"version": STATE_VERSION, "agents": [record.to_row() for record in self.agents.values()],
+                "sources": sorted(self.sources)}
+        tmp = self.tracker_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp, self.tracker_path)
+        st = os.stat(self.tracker_path)
+        self._key = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @contextmanager
+    def transaction(self):
+        """Exclusive load-modify-save across processes."""
+        self.rewards_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._key = None  # Always re-read under the lock
+            self.load()
+            yield self
+            self.save()
+
+    # ── updates ──────────────────────────────────────────────
+
+    def _reindex(self, record, before):
+        """Move `record` within each leaderboard; `before` holds its old metric values."""
+        for metric in LEADERBOARDS:
+            board = self.boards[metric]
+            if before is not None:
+                old = (-before[metric], record.name)
+                index = bisect_left(board, old)
+                if index < len(board) and board[index] == old:
+                    del board[index]
+            insort(board, (-record.metric(metric), record.name))
+
+    def apply(self, agent, event, attributes=(), bonuses=(), log=True):
+        """Apply one event. Returns the updated AgentRecord."""
+        agent = agent.strip().lower()
+        rules = self.rules
+        unknown = [name for name in (event, *bonuses)
+                   if name not in rules.earning_rates and name not in rules.salary_bonuses]
+        if unknown:
+            raise ValueError(f"Unknown reward event: {', '.join(unknown)}")
+
+        record = self.agents.get(agent)
+        before = None
+        if record is None:
+            record = self.agents[agent] = AgentRecord(agent)
+        else:
+            before = {metric: record.metric(metric) for metric in LEADERBOARDS}
+
+        if rules.xp_enabled:
+            record.xp += sum(rules.earning_rates.get(name, 0) for name in (event, *bonuses))
+            record.level = rules.level(record.xp)
+        if event.startswith("task_"):
+            record.tasks += 1
+
+        if rules.attributes_enabled:
+            for name in attributes:
+                value = record.attributes.get(name)
+                if value is None:
+                    value = INITIAL_ATTRIBUTE
+                    record.attribute_sum += value
+                grown = min(rules.scale_max, value + rules.growth(value))
+                record.attributes[name] = grown
+                record.attribute_sum += grown - value
+
+        if rules.salary_enabled:
+            record.earnings += sum(rules.salary_bonuses.get(name, 0) for name in (event, *bonuses))
+
+        self._reindex(record, before)
+        if log:
+            self.rewards_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.history_path, 'a') as f:
+                f.write(json.dumps({"ts": round(time.time(), 3), "agent": agent, "event": event,
+                                    "attributes": list(attributes), "bonuses": list(bonuses)},
+                                   separators=(",", ":")) + "\n")
+        return record
+
+    def apply_sprint(self, results):
+        """Award a sprint_runner run-results.json: one task event per finished task, plus the
+        sprint milestone for every agent when all tasks succeeded. Returns events applied.
+
+        Each task and the milestone are awarded once per sprint, so re-running a partly
+        failed sprint awards only the tasks that now succeed."""
+        sprint = results.get("sprint")
+        applied = 0
+        agents = set()
+        tasks = results.get("tasks", {})
+
+        def first_time(key):
+            if not sprint:
+                return True  # No sprint id: nothing to key on
+            key = f"{sprint}/{key}"
+            if key in self.sources:
+                return False
+            self.sources.add(key)
+            return True
+
+        for task_id, result in tasks.items():
+            agent = result.get("agent")
+            if agent:
+                agents.add(agent)
+            if result.get("status") != "ok" or not agent or not first_time(task_id):
+                continue
+            estimate = result.get("estimate_hours", 4)
+            event = next(name for limit, name in TASK_SIZES if estimate <= limit)
+            self.apply(agent, event)
+            applied += 1
+        if tasks and all(result.get("status") == "ok" for result in tasks.values()) and first_time("milestone"):
+            for agent in sorted(agents):
+                self.apply(agent, "milestone_sprint_complete")
+                applied += 1
+        return applied
+
+    def rebuild(self):
+        """Recompute every record from history.jsonl with the current rules."""
+        sources = self.sources
+        self._reset()
+        self.sources = sources
+        try:
+            with open(self.history_path, 'r') as f:
+                events = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            events = []
+        for event in events:
+            try:
+                self.apply(event["agent"], event["event"], event.get("attributes", ()),
+                           event.get("bonuses", ()), log=False)
+            except ValueError:
+                continue  # Event type removed from the rules
+        return len(events)
+
+    # ── queries ──────────────────────────────────────────────
+
+    def get(self, agent):
+        return self.agents.get(agent.strip().lower())
+
+    def salary(self, record):
+        return self.rules.salary(record.level, record.rating)
+
+    def leaderboard(self, metric="xp", limit=10):
+        return [(self.agents[name], -value) for value, name in self.boards[metric][:limit]]
+
+    def rank(self, record, metric="xp"):
+        return bisect_left(self.boards[metric], (-record.metric(metric), record.name)) + 1
+
+    def status(self, agent):
+        """Compact status line segment, e.g. '⭐ L2 385/500 XP', or None if untracked."""
+        record = self.load().get(agent)
+        if record is None or not self.rules.xp_enabled:
+            return None
+        target = self.rules.next_threshold(record.xp)
+        progress = f"{record.xp}/{target}" if target is not None else f"{record.xp}"
+        return f"⭐ L{record.level} {progress} XP"
+
+
+_engine = None
+
+
+def get_reward_engine():
+    """Process-wide engine (kept hot by statusline_server.py)."""
+    global _engine
+    if _engine is None:
+        _engine = RewardEngine()
+    return _engine
+
+
+def print_stats(engine, record):
+    target = engine.rules.next_threshold(record.xp)
+    print(f"🤖 {record.name}")
+    print(f"   Level {record.level} - {record.xp} XP"
+          + (f" ({target - record.xp} XP to level {engine.rules.level(target)})" if target is not None else ""))
+    print(f"   Tasks: {record.tasks}   Rank: #{engine.rank(record)}")
+    if record.attributes:
+        print(f"   Rating: {record.rating:.1f}/{engine.rules.scale_max}")
+        for name, value in sorted(record.attributes.items(), key=lambda item: -item[1]):
+            filled = int(round(value))
+            print(f"   {'▰' * filled}{'░' * (engine.rules.scale_max - filled)} {name:<22} {value:.1f}")
+    if engine.rules.salary_enabled:
+        print(f"   Salary: ${engine.salary(record):,.0f}/project (x{engine.rules.multiplier(record.rating)})"
+              f"   Bonuses earned: ${record.earnings:,.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reward-system XP, levels, attributes and salary")
+    sub = parser.add_subparsers(dest="command")
+    record = sub.add_parser("record", help="Apply one event to an agent")
+    record.add_argument("agent")
+    record.add_argument("event", help="An earning_rates or salary bonuses key (e.g. task_complex)")
+    record.add_argument("--attr", action="append", default=[], help="Attribute exercised (repeatable)")
+    record.add_argument("--bonus", action="append", default=[], help="Extra XP/salary bonus key (repeatable)")
+    sprint = sub.add_parser("sprint", help="Award a sprint_runner run-results.json")
+    sprint.add_argument("results")
+    stats = sub.add_parser("stats", help="Show one agent")
+    stats.add_argument("agent")
+    board = sub.add_parser("leaderboard", help="Top agents")
+    board.add_argument("--by", choices=LEADERBOARDS, default="xp")
+    board.add_argument("-n", type=int, default=10)
+    sub.add_parser("rebuild", help="Replay history.jsonl with the current rules")
+    args = parser.parse_args(argv)
+    try:
+        engine = RewardEngine(rules=Rules())
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    if args.command == "record":
+        try:
+            with engine.transaction():
+                before = engine.get(args.agent)
+                level = before.level if before else None
+                updated = engine.apply(args.agent, args.event, args.attr, args.bonus)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        print(f"✅ {updated.name}: {updated.xp} XP, level {updated.level}")
+        if level is not None and updated.level > level:
+            print(f"🎉 Level up! {updated.name} reached level {updated.level}")
+        return 0
+    if args.command == "sprint":
+        try:
+            results = json.loads(Path(args.results).read_text())
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot read {args.results}: {e}", file=sys.stderr)
+            return 1
+        with engine.transaction():
+            applied = engine.apply_sprint(results)
+        if applied:
+            print(f"✅ Applied {applied} events from sprint {results.get('sprint')}")
+        else:
+            print(f"ℹ️  Nothing new to award from sprint {results.get('sprint')}")
+        return 0
+    if args.command == "stats":
+        found = engine.load().get(args.agent)
+        if found is None:
+            print(f"❌ No rewards recorded for {args.agent}", file=sys.stderr)
+            return 1
+        print_stats(engine, found)
+        return 0
+    if args.command == "leaderboard":
+        engine.load()
+        for position, (entry, value) in enumerate(engine.leaderboard(args.by, args.n), 1):
+            shown = f"${value:,.0f}" if args.by == "earnings" else f"{value:.1f}" if args.by == "rating" else value
+            print(f"{position:>3}. {entry.name:<20} L{entry.level}  {shown}")
+        if not engine.agents:
+            print("ℹ️  No rewards recorded yet")
+        return 0
+    if args.command == "rebuild":
+        with engine.transaction():
+            count = engine.rebuild()
+        print(f"✅ Rebuilt {len(engine.agents)} agents from {count} events")
+        return 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Settings Resolver
+Effective Claude Code settings from the user, project and local layers.
+
+Merges ~/.claude/settings.json, <project>/.claude/settings.json and
+<project>/.claude/settings.local.json with the precedence in
+docs/CONFIGURATION_ARCHITECTURE.md (local > project > user):
+- Objects merge key by key (env, enabledPlugins, statusLine, ...)
+- permissions.allow / ask / deny / additionalDirectories are unioned
+  across layers, in layer order, without duplicates
+- extraKnownMarketplaces entries are replaced whole per marketplace name
+  (a "file" source must not inherit a "github" source's repo)
+- hooks lists are concatenated per event (every layer's hooks run)
+- Any other list or scalar is replaced by the higher layer
+- Template metadata ($schema, description) is dropped
+
+The merged view and its provenance (which layer set each key or list
+item) are cached as a marshal snapshot in ~/.claude/.cache/, keyed by
+the layers' (inode, mtime, size), and memoized in-process, so a lookup
+costs a few stat() calls. Command line flags and enterprise policies are
+not files in this model and are not included.
+
+Usage:
+    from settings_resolver import get, resolve
+    get("env.PROJECT_NAME")
+    get("permissions.deny", [])
+
+    python3 settings_resolver.py                        # Merged settings (JSON)
+    python3 settings_resolver.py env.PROJECT_NAME       # One key
+    python3 settings_resolver.py --explain [KEY]        # Value ← layer for each key
+    python3 settings_resolver.py --templates --explain  # Resolve config/templates/ instead
+    python3 settings_resolver.py --project ~/dev/my-app
+"""
+
+import copy
+import hashlib
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from variables import lookup  # noqa: E402
+
+CLAUDE_DIR = Path.home() / ".claude"
+CACHE_DIR = CLAUDE_DIR / ".cache"
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+SNAPSHOT_VERSION = 1
+
+UNION_KEYS = frozenset(("permissions.allow", "permissions.ask", "permissions.deny",
+                        "permissions.additionalDirectories"))
+REPLACE_ENTRY_KEYS = frozenset(("extraKnownMarketplaces",))
+CONCAT_KEYS = frozenset(("hooks",))
+METADATA_KEYS = frozenset(("$schema", "description"))
+
+_MISSING = object()
+_memo = {}  # layer paths -> (stat keys, settings, provenance)
+
+
+def find_project_dir(start=None):
+    """Nearest directory at or above start with a .claude/ (not ~/.claude), else start."""
+    start = Path(start or os.getcwd()).resolve()
+    home = Path.home().resolve()
+    for directory in (start, *start.parents):
+        if directory != home and (directory / ".claude").is_dir():
+            return directory
+    return start
+
+
+def layer_paths(project_dir=None, templates=False):
+    """[(layer, path)] lowest precedence first."""
+    if templates:
+        return [("user", TEMPLATES_DIR / "user-settings.json"),
+                ("project", TEMPLATES_DIR / "project-settings.json"),
+                ("local", TEMPLATES_DIR / "project-local-settings.json")]
+    project = find_project_dir(project_dir)
+    return [("user", CLAUDE_DIR / "settings.json"),
+            ("project", project / ".claude" / "settings.json"),
+            ("local", project / ".claude" / "settings.local.json")]
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# ── merging ──────────────────────────────────────────────
+
+def _union(base, items):
+    seen = {json.dumps(item, sort_keys=True) for item in base}
+    for item in items:
+        key = json.dumps(item, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            base.append(item)
+    return base
+
+
+def merge_layer(merged, provenance, layer, data, prefix=""):
+    """Merge one layer's dict into merged (in place), recording provenance per dotted key."""
+    for key, value in data.items():
+        if not prefix and key in METADATA_KEYS:
+            continue
+        path = f"{prefix}{key}"
+        current = merged.get(key, _MISSING)
+
+        if path in UNION_KEYS and isinstance(value, list):
+            merged[key] = _union(current if isinstance(current, list) else [], copy.deepcopy(value))
+            origins = provenance.setdefault(path, {})
+            for item in value:
+                origins.setdefault(json.dumps(item, sort_keys=True), layer)
+        elif path in CONCAT_KEYS and isinstance(value, dict):
+            merged[key] = hooks = current if isinstance(current, dict) else {}
+            for event, entries in value.items():
+                hooks[event] = _union(hooks.get(event, []), copy.deepcopy(entries))
+                provenance.setdefault(f"{path}.{event}", [])
+                if layer not in provenance[f"{path}.{event}"]:
+                    provenance[f"{path}.{event}"].append(layer)
+        elif path in REPLACE_ENTRY_KEYS and isinstance(value, dict):
+            merged[key] = entries = current if isinstance(current, dict) else {}
+            for name, entry in value.items():
+                entries[name] = copy.deepcopy(entry)
+                provenance[f"{path}.{name}"] = layer
+        elif isinstance(value, dict):
+            if not isinstance(current, dict):
+                # A replaced scalar/list drops the provenance of what it replaced
+                provenance.pop(path, None)
+                merged[key] = current = {}
+            merge_layer(current, provenance, layer, value, f"{path}.")
+        else:
+            merged[key] = copy.deepcopy(value)
+            for stale in [k for k in provenance if k.startswith(f"{path}.")]:
+                del provenance[stale]
+            provenance[path] = layer
+    return merged
+
+
+def merge_layers(layers):
+    """(settings, provenance) for [(layer, dict or None)] lowest precedence first."""
+    merged, provenance = {}, {}
+    for layer, data in layers:
+        if data:
+            merge_layer(merged, provenance, layer, data)
+    return merged, provenance
+
+
+def _read_layers(paths):
+    layers, errors = [], []
+    for layer, path in paths:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = None
+        except (OSError, ValueError) as e:
+            errors.append(f"{path}: {e}")
+            data = None
+        layers.append((layer, data if isinstance(data, dict) else None))
+    return layers, errors
+
+
+# ── cache ────────────────────────────────────────────────
+
+def _snapshot_path(paths):
+    name = hashlib.sha1("\0".join(str(path) for _, path in paths).encode("utf-8")).hexdigest()[:12]
+    return CACHE_DIR / f"settings-{name}.marshal"
+
+
+def _read_snapshot(snapshot_path):
+    try:
+        with open(snapshot_path, 'rb') as f:
+            version, stat_keys, settings, provenance = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != SNAPSHOT_VERSION:
+        return None
+    return [tuple(key) if key else None for key in stat_keys], settings, provenance
+
+
+def _write_snapshot(snapshot_path, stat_keys, settings, provenance):
+    try:
+        payload = marshal.dumps((SNAPSHOT_VERSION, stat_keys, settings, provenance))
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, snapshot_path)
+    except (OSError, ValueError):
+        pass  # Cache is an optimization only
+
+
+def resolve(project_dir=None, templates=False, use_cache=True):
+    """(settings, provenance) for a project. Provenance maps dotted keys to a layer name;
+    union lists map to {item JSON: layer}, hooks events to [layers]."""
+    paths = layer_paths(project_dir, templates)
+    memo_key = tuple(str(path) for _, path in paths)
+    stat_keys = [_stat_key(path) for _, path in paths]
+
+    memo = _memo.get(memo_key)
+    if memo and memo[0] == stat_keys:
+        return memo[1], memo[2]
+
+    snapshot_path = _snapshot_path(paths)
+    snapshot = _read_snapshot(snapshot_path) if use_cache else None
+    if snapshot and snapshot[0] == stat_keys:
+        settings, provenance = snapshot[1], snapshot[2]
+    else:
+        layers, errors = _read_layers(paths)
+        for error in errors:
+            print(f"⚠️  settings: {error}", file=sys.stderr)
+        settings, provenance = merge_layers(layers)
+        if use_cache and not errors:
+            _write_snapshot(snapshot_path, stat_keys, settings, provenance)
+
+    _memo[memo_key] = (stat_keys, settings, provenance)
+    return settings, provenance
+
+
+def get(dotted_key, default=None, project_dir=None):
+    """Look up a dotted key such as 'env.PROJECT_NAME' in the effective settings."""
+    try:
+        settings, _ = resolve(project_dir)
+    except Exception:
+        return default
+    return lookup(settings, dotted_key, default)
+
+
+# ── explain ──────────────────────────────────────────────
+
+def explain_lines(settings, provenance, paths, key=None):
+    """'key = value  ← layer' lines, one per leaf (and per list item for unions)."""
+    files = dict(paths)
+    lines = []
+
+    def origin(layer):
+        return f"← {layer} ({files[layer]})" if layer in files else ""
+
+    def walk(node, prefix):
+        for name, value in node.items():
+            path = f"{prefix}{name}"
+            if path in UNION_KEYS and isinstance(value, list):
+                for item in value:
+                    layer = provenance.get(path, {}).get(json.dumps(item, sort_keys=True))
+                    lines.append(f"{path}[] = {json.dumps(item)}  {origin(layer)}")
+            elif path in CONCAT_KEYS and isinstance(value, dict):
+                for event, entries in value.items():
+                    layers = provenance.get(f"{path}.{event}", [])
+                    lines.append(f"{path}.{event} = {len(entries)} entries  ← {', '.join(layers)}")
+            elif isinstance(value, dict) and path not in provenance:
+                walk(value, f"{path}.")
+            else:
+                lines.append(f"{path} = {json.dumps(value)}  {origin(provenance.get(path))}")
+
+    walk(settings, "")
+    if key:
+        lines = [line for line in lines if line.startswith(key)]
+    return lines
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    templates = "--templates" in argv
+    project = argv[argv.index("--project") + 1] if "--project" in argv else None
+    args = [a for i, a in enumerate(argv) if not a.startswith("--") and (i == 0 or argv[i - 1] != "--project")]
+    if "-h" in argv or "--help" in argv:
+        print(__doc__.strip())
+        return 0
+
+    paths = layer_paths(project, templates)
+    settings, provenance = resolve(project, templates)
+
+    if "--explain" in argv:
+        for layer, path in paths:
+            print(f"{'✅' if path.exists() else '  '} {layer:<8} {path}")
+        print()
+        lines = explain_lines(settings, provenance, paths, args[0] if args else None)
+        print("\n".join(lines) if lines else "(no settings)")
+        return 0
+    if args:
+        value = lookup(settings, args[0], _MISSING)
+        if value is _MISSING:
+            print(f"❌ Not set: {args[0]}", file=sys.stderr)
+            return 1
+        print(value if isinstance(value, str) else json.dumps(value, indent=2))
+        return 0
+    print(json.dumps(settings, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+#!/bin/bash
+# Claude Multi-Agent Framework Status Line (client shim)
+# Forwards the statusline JSON to the resident server (statusline_server.py)
+# Falls back to the in-process Python status line when the server isn't running
+
+SOCKET="${CLAUDE_STATUSLINE_SOCKET:-$HOME/.claude/.statusline.sock}"
+
+# Read JSON input from stdin (builtin read - no fork)
+IFS= read -r -d '' input
+
+# Try the resident server first
+if [ -S "$SOCKET" ]; then
+    if command -v socat &> /dev/null; then
+        printf '%s' "$input" | socat -t 1 - "UNIX-CONNECT:$SOCKET" 2>/dev/null && exit 0
+    elif command -v nc &> /dev/null; then
+        printf '%s' "$input" | nc -N -U "$SOCKET" 2>/dev/null && exit 0
+    fi
+fi
+
+# Fallback: in-process status line (dirname only on this path: the fast path stays fork-free)
+printf '%s' "$input" | exec python3 "$(dirname "${BASH_SOURCE[0]}")/statusline.py"
@@ -4,6 +4,9 @@ Claude Multi-Agent Framework Status Line (Python version)
 Shows: Agent | Model | Project | Cost | Stats
 
 More feature-rich than bash version with context tracking.
+
+This is also the in-process fallback for the resident statusline server
+(see statusline_server.py), which imports build_status_line() from here.
 """
 
 import json
@@ -13,10 +16,15 @@ from pathlib import Path
 
 def get_current_agent():
     """Get current agent from marker file or environment."""
-    agent_file = Path.home() / ".claude" / ".current_agent"
-    if agent_file.exists():
-        return agent_file.read_text().strip()
-    return os.getenv("CLAUDE_CURRENT_AGENT", "General")
+    try:
+        from agent_state import get_agent_state
+    except ImportError:
+        agent_file = Path.home() / ".claude" / ".current_agent"
+        try:
+            return agent_file.read_text().strip()
+        except OSError:
+            return os.getenv("CLAUDE_CURRENT_AGENT", "General")
+    return get_agent_state().current()
 
 def format_model_display(model_name):
     """Format model with appropriate icon and styling."""
@@ -52,74 +60,102 @@ def format_duration(duration):
             return f"⏱️  {minutes}m"
     return None
 
-def get_context_usage():
+def get_context_usage(data):
     """
-    Estimate context usage (if available).
-    This is a placeholder - actual implementation would need
-    to track token usage throughout the session.
+    Percent of the model's context window used by this session.
+    Tracked incrementally from the transcript by context_tracker.py.
     """
-    # TODO: Integrate with actual context tracking
-    return None
+    try:
+        from context_tracker import get_tracker
+    except ImportError:
+        return None
+    return get_tracker().usage(data)
 
-def main():
+def get_reward_status(agent):
+    """
+    Level/XP of the current agent from the reward-system tracker.
+    reward_engine.py only re-reads tracker.json when it changed.
+    """
     try:
-        # Read JSON input from stdin
-        data = json.load(sys.stdin)
+        from reward_engine import get_reward_engine
+    except ImportError:
+        return None
+    try:
+        return get_reward_engine().status(agent)
+    except ValueError:
+        return None  # No rewards: rules in VARIABLES.yaml
+
+def build_status_line(data, agent=None):
+    """Build the status line text from the statusline JSON payload."""
+    # Extract key information
+    model_name = data.get("model", {}).get("display_name", "Unknown")
+    current_dir = data.get("workspace", {}).get("current_dir", "~")
+    project = os.path.basename(current_dir)
+
+    cost_data = data.get("cost", {})
+    cost = cost_data.get("total", 0)
+    lines_added = cost_data.get("lines_added", 0)
+    lines_removed = cost_data.get("lines_removed", 0)
+    duration = cost_data.get("duration", 0)
+
+    # Get current agent
+    if agent is None:
+        agent = get_current_agent()
 
-        # Extract key information
-        model_name = data.get("model", {}).get("display_name", "Unknown")
-        current_dir = data.get("workspace", {}).get("current_dir", "~")
-        project = os.path.basename(current_dir)
+    # Build status line components
+    components = []
 
-        cost_data = data.get("cost", {})
-        cost = cost_data.get("total", 0)
-        lines_added = cost_data.get("lines_added", 0)
-        lines_removed = cost_data.get("lines_removed", 0)
-        duration = cost_data.get("duration", 0)
+    # Agent
+    components.append(f"🤖 {agent}")
 
-        # Get current agent
-        agent = get_current_agent()
+    # Rewards (if the reward system is tracking this agent)
+    reward_status = get_reward_status(agent)
+    if reward_status:
+        components.append(reward_status)
 
-        # Build status line components
-        components = []
+    # Model
+    model_display, model_type = format_model_display(model_name)
+    components.append(model_display)
 
-        # Agent
-        components.append(f"🤖 {agent}")
+    # Project
+    components.append(f"📁 {project}")
 
-        # Model
-        model_display, model_type = format_model_display(model_name)
-        components.append(model_display)
+    # Cost (if any)
+    cost_display = format_cost(cost)
+    if cost_display:
+        components.append(cost_display)
 
-        # Project
-        components.append(f"📁 {project}")
+    # Code stats (if any)
+    code_stats = format_code_stats(lines_added, lines_removed)
+    if code_stats:
+        components.append(code_stats)
 
-        # Cost (if any)
-        cost_display = format_cost(cost)
-        if cost_display:
-            components.append(cost_display)
+    # Duration (if any)
+    time_display = format_duration(duration)
+    if time_display:
+        components.append(time_display)
 
-        # Code stats (if any)
-        code_stats = format_code_stats(lines_added, lines_removed)
-        if code_stats:
-            components.append(code_stats)
+    # Context usage (if available)
+    context_usage = get_context_usage(data)
+    if context_usage:
+        components.append(f"📊 {context_usage}%")
 
-        # Duration (if any)
-        time_display = format_duration(duration)
-        if time_display:
-            components.append(time_display)
+    # Join and output
+    return " | ".join(components)
 
-        # Context usage (if available)
-        context_usage = get_context_usage()
-        if context_usage:
-            components.append(f"📊 {context_usage}%")
+def format_error(error):
+    """Fallback status line shown when rendering fails."""
+    return f"🤖 Claude | ⚠️  Status error: {str(error)}"
 
-        # Join and output
-        status_line = " | ".join(components)
-        print(status_line)
+def main():
+    try:
+        # Read JSON input from stdin
+        data = json.load(sys.stdin)
+        print(build_status_line(data))
 
     except Exception as e:
         # Fallback: show minimal info
-        print(f"🤖 Claude | ⚠️  Status error: {str(e)}")
+        print(format_error(e))
         sys.exit(0)  # Don't crash Claude
 
 if __name__ == "__main__":
@@ -2,23 +2,26 @@
 # Claude Multi-Agent Framework Status Line
 # Shows: Agent | Model | Project | Cost | Stats
 
-# Read JSON input from stdin
-input=$(cat)
+# Extract key information (single jq pass over stdin, fields joined by \x1f)
+IFS=$'\x1f' read -r MODEL CURRENT_DIR COST COST_POSITIVE LINES_ADDED LINES_REMOVED DURATION < <(
+    jq -r '[
+        .model.display_name // "Unknown",
+        .workspace.current_dir // "~",
+        .cost.total // 0,
+        ((.cost.total // 0) > 0),
+        .cost.lines_added // 0,
+        .cost.lines_removed // 0,
+        .cost.duration // 0
+    ] | map(tostring) | join("\u001f")'
+)
+PROJECT="${CURRENT_DIR##*/}"
 
-# Extract key information
-MODEL=$(echo "$input" | jq -r '.model.display_name // "Unknown"')
-CURRENT_DIR=$(echo "$input" | jq -r '.workspace.current_dir // "~"')
-PROJECT=$(basename "$CURRENT_DIR")
-COST=$(echo "$input" | jq -r '.cost.total // 0')
-LINES_ADDED=$(echo "$input" | jq -r '.cost.lines_added // 0')
-LINES_REMOVED=$(echo "$input" | jq -r '.cost.lines_removed // 0')
-DURATION=$(echo "$input" | jq -r '.cost.duration // 0')
-
-# Determine agent role from environment or transcript
-AGENT="General"
-if [ -f "$HOME/.claude/.current_agent" ]; then
-    AGENT=$(cat "$HOME/.claude/.current_agent")
+# Determine agent role from marker file (builtin read - no fork) or environment
+AGENT=""
+if [ -r "$HOME/.claude/.current_agent" ]; then
+    IFS= read -r AGENT < "$HOME/.claude/.current_agent"
 fi
+AGENT="${AGENT:-${CLAUDE_CURRENT_AGENT:-General}}"
 
 # Format model display
 case "$MODEL" in
@@ -41,8 +44,8 @@ case "$MODEL" in
 esac
 
 # Format cost
-if (( $(echo "$COST > 0" | bc -l 2>/dev/null || echo "0") )); then
-    COST_DISPLAY=$(printf "💰\$%.2f" "$COST")
+if [ "$COST_POSITIVE" = "true" ]; then
+    printf -v COST_DISPLAY "💰\$%.2f" "$COST"
 else
     COST_DISPLAY=""
 fi
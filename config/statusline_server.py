@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Resident Status Line Server
+One per user, listening on a Unix socket.
+
+Keeps agent/model/cost state hot in memory so each redraw costs a socket
+round-trip instead of a CPython cold start. statusline-client.sh forwards
+the stdin JSON here and falls back to statusline.py when the server is down.
+
+Usage:
+    python3 statusline_server.py start    # Start in the background
+    python3 statusline_server.py run      # Run in the foreground
+    python3 statusline_server.py stop     # Stop the running server
+    python3 statusline_server.py status   # Show whether it is running
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import statusline
+from agent_state import get_agent_state
+
+CLAUDE_DIR = Path.home() / ".claude"
+SOCKET_PATH = Path(os.getenv("CLAUDE_STATUSLINE_SOCKET", CLAUDE_DIR / ".statusline.sock"))
+PID_PATH = SOCKET_PATH.with_suffix(".pid")
+
+MAX_PAYLOAD_BYTES = 1024 * 1024
+REQUEST_TIMEOUT = 2.0
+MAX_SESSIONS = 64
+
+# Payload sections remembered per session and reused when a redraw omits them
+SESSION_KEYS = ("model", "workspace", "cost")
+
+
+class StatuslineState:
+    """Hot in-memory state shared by all connections."""
+
+    def __init__(self, agent_state=None, max_sessions=MAX_SESSIONS):
+        self.agent_state = agent_state or get_agent_state()
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def current_agent(self):
+        """Return the current agent (one stat per redraw, re-read only on change)."""
+        return self.agent_state.current()
+
+    def merge_session(self, data):
+        """Fill sections missing from this redraw with the session's last known values."""
+        session_id = data.get("session_id")
+        if not session_id:
+            return data
+
+        with self._lock:
+            known = self.sessions.pop(session_id, {})
+            for key in SESSION_KEYS:
+                if data.get(key):
+                    known[key] = data[key]
+            self.sessions[session_id] = known
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+
+        return {**known, **data}
+
+    def render(self, data):
+        with self._lock:
+            agent = self.current_agent()
+        return statusline.build_status_line(self.merge_session(data), agent=agent)
+
+
+class StatuslineHandler(socketserver.StreamRequestHandler):
+    """One request per connection: JSON in until EOF, one status line out."""
+
+    def handle(self):
+        self.request.settimeout(REQUEST_TIMEOUT)
+        try:
+            payload = self.rfile.read(MAX_PAYLOAD_BYTES)
+            if not payload:
+                return  # Liveness probe (is_running)
+            line = self.server.state.render(json.loads(payload))
+        except Exception as e:
+            line = statusline.format_error(e)
+        try:
+            self.wfile.write((line + "\n").encode("utf-8"))
+        except OSError:
+            pass  # Client gave up
+
+
+class StatuslineServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, state=None):
+        self.state = state or StatuslineState()
+        super().__init__(str(socket_path), StatuslineHandler)
+
+
+def is_running(socket_path=SOCKET_PATH):
+    """True if a server is accepting connections on socket_path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        try:
+            sock.connect(str(socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def serve(socket_path=SOCKET_PATH, pid_path=PID_PATH):
+    """Run the server in the foreground until SIGTERM/SIGINT."""
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if socket_path.exists():
+        if is_running(socket_path):
+            print(f"⚠️  Statusline server already running on {socket_path}", file=sys.stderr)
+            return 1
+        socket_path.unlink()  # Stale socket from a crashed server
+
+    old_umask = os.umask(0o177)  # Socket readable by this user only
+    try:
+        server = StatuslineServer(socket_path)
+    finally:
+        os.umask(old_umask)
+
+    Path(pid_path).write_text(str(os.getpid()))
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        for path in (socket_path, Path(pid_path)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    return 0
+
+
+def start(socket_path=SOCKET_PATH, wait=2.0):
+    """Start the server as a detached background process."""
+    if is_running(socket_path):
+        print(f"✅ Statusline server already running on {socket_path}")
+        return 0
+
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "run"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_running(socket_path):
+            print(f"✅ Statusline server started on {socket_path}")
+            return 0
+        time.sleep(0.05)
+
+    print("❌ Statusline server did not start", file=sys.stderr)
+    return 1
+
+
+def stop(pid_path=PID_PATH):
+    """Stop the background server using its pid file."""
+    try:
+        pid = int(Path(pid_path).read_text().strip())
+        os.kill(pid, signal.SIGTERM)
+    except (OSError, ValueError):
+        print("ℹ️  Statusline server is not running")
+        return 0
+    print(f"✅ Stopped statusline server (pid {pid})")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "status"
+
+    if command == "run":
+        return serve()
+    if command == "start":
+        return start()
+    if command == "stop":
+        return stop()
+    if command == "status":
+        running = is_running()
+        print(f"{'✅ running' if running else '⏹️  stopped'}: {SOCKET_PATH}")
+        return 0 if running else 1
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
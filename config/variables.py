@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+VARIABLES.yaml Access
+Shared, cached loader for the framework's single source of truth.
+
+Parsing the heavily commented VARIABLES.yaml with the pure-Python YAML
+loader costs tens of milliseconds, and hooks, the status line and the sync
+scripts all need it. This module:
+- Prefers the libyaml C loader (yaml.CSafeLoader) when available
+- Persists the parsed result as a marshal snapshot in ~/.claude/.cache/,
+  keyed by the file's SHA-256 (a stat() match skips even the hash)
+- Memoizes in-process for long-lived consumers (statusline server, workers)
+
+Consumers pay one small cache read instead of a YAML parse.
+
+Usage:
+    from variables import get, load_variables
+    get("owner.name")
+    get("models.MODEL_002_SONNET.context_window", 200000)
+
+    python3 variables.py models.MODEL_002_SONNET.context_window
+    python3 variables.py --path     # Which VARIABLES.yaml is in use
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+
+CACHE_DIR = Path.home() / ".claude" / ".cache"
+SNAPSHOT_VERSION = 1
+
+_MISSING = object()
+_memo = {}  # resolved path -> (stat key, data)
+
+
+def find_variables_file():
+    """Locate VARIABLES.yaml: $CLAUDE_FRAMEWORK_ROOT, this checkout, then the default framework path."""
+    candidates = []
+    if os.getenv("CLAUDE_FRAMEWORK_ROOT"):
+        candidates.append(Path(os.environ["CLAUDE_FRAMEWORK_ROOT"]).expanduser())
+    candidates.append(Path(__file__).resolve().parent.parent)
+    candidates.append(Path.home() / "dev" / "claude-dev-framework")
+
+    for root in candidates:
+        path = root / "VARIABLES.yaml"
+        if path.exists():
+            return path
+    return None
+
+
+def parse_yaml(text):
+    """Parse YAML with the libyaml C loader when available."""
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(text, Loader=loader) or {}
+
+
+def _snapshot_path(variables_path):
+    name = hashlib.sha1(str(variables_path).encode("utf-8")).hexdigest()[:12]
+    return CACHE_DIR / f"variables-{name}.marshal"
+
+
+def _stat_key(st):
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _read_snapshot(snapshot_path):
+    try:
+        with open(snapshot_path, 'rb') as f:
+            version, stat_key, digest, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != SNAPSHOT_VERSION:
+        return None
+    return tuple(stat_key), digest, data
+
+
+def _write_snapshot(snapshot_path, stat_key, digest, data):
+    try:
+        payload = marshal.dumps((SNAPSHOT_VERSION, stat_key, digest, data))
+    except ValueError:
+        # Non-marshalable scalars (e.g. YAML dates): store their JSON-safe form
+        data = json.loads(json.dumps(data, default=str))
+        payload = marshal.dumps((SNAPSHOT_VERSION, stat_key, digest, data))
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, snapshot_path)
+    except OSError:
+        pass  # Cache is an optimization only
+
+
+def load_variables(variables_path=None, use_cache=True):
+    """Return the parsed VARIABLES.yaml as a dict ({} if it cannot be found)."""
+    variables_path = Path(variables_path) if variables_path else find_variables_file()
+    if not variables_path:
+        return {}
+    variables_path = variables_path.resolve()
+
+    st = os.stat(variables_path)
+    stat_key = _stat_key(st)
+
+    memo = _memo.get(variables_path)
+    if memo and memo[0] == stat_key:
+        return memo[1]
+
+    snapshot_path = _snapshot_path(variables_path)
+    snapshot = _read_snapshot(snapshot_path) if use_cache else None
+    if snapshot and snapshot[0] == stat_key:
+        data = snapshot[2]
+    else:
+        raw = variables_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if snapshot and snapshot[1] == digest:
+            data = snapshot[2]  # Touched but unchanged: just refresh the stat key
+        else:
+            data = parse_yaml(raw)
+        if use_cache:
+            _write_snapshot(snapshot_path, stat_key, digest, data)
+
+    _memo[variables_path] = (stat_key, data)
+    return data
+
+
+def lookup(data, dotted_key, default=None):
+    """Resolve 'a.b.0.c' against nested dicts/lists."""
+    node = data
+    for part in dotted_key.split("."):
+        if isinstance(node, dict):
+            node = node.get(part, _MISSING)
+        elif isinstance(node, list) and part.lstrip("-").isdigit():
+            index = int(part)
+            node = node[index] if -len(node) <= index < len(node) else _MISSING
+        else:
+            node = _MISSING
+        if node is _MISSING:
+            return default
+    return node
+
+
+def get(dotted_key, default=None, variables_path=None):
+    """Look up a dotted key such as 'owner.name' in VARIABLES.yaml."""
+    try:
+        data = load_variables(variables_path)
+    except Exception:  # Missing PyYAML, unreadable or invalid file
+        return default
+    return lookup(data, dotted_key, default)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(2)
+    if args[0] == "--path":
+        print(find_variables_file() or "")
+        sys.exit(0)
+
+    value = get(args[0], _MISSING)
+    if value is _MISSING:
+        print(f"❌ Not found: {args[0]}", file=sys.stderr)
+        sys.exit(1)
+    print(value if isinstance(value, str) else json.dumps(value))
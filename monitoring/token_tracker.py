@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Token Tracker
+Per-session token/cost records with incrementally maintained aggregates.
+
+Implements the collector sketched in monitoring/MONITORING_SYSTEM.md:
+- track_session() buffers a session record; flush() writes the batch to
+  sessions/<date>-<agent>-<nnn>.json and folds it into aggregated/
+  daily.json, weekly.json and monthly.json (no re-scan of old sessions)
+- Cost is priced per API message: costs.base_price_per_million in
+  VARIABLES.yaml scaled by the message model's cost_multiplier
+
+Hooks must not wait for transcript parsing, so `track` only appends the
+hook payload to a spool file and starts a detached `flush`, which drains
+the spool in one batch. Concurrent flushes are serialized with flock().
+
+Storage (default ~/.claude/monitoring, override with $CLAUDE_MONITORING_DIR):
+    spool.jsonl                 Pending hook payloads
+    sessions/*.json             One record per session
+    aggregated/{daily,weekly,monthly}.json
+
+Usage:
+    python3 token_tracker.py track --agent Backend < session-end.json   # SessionEnd hook
+    python3 token_tracker.py flush                                       # Drain the spool
+    python3 token_tracker.py report                                      # Today / week / month
+"""
+
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Shared modules live in config/ (variables.py, context_tracker.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "config"))
+
+MONITORING_DIR = Path(os.getenv("CLAUDE_MONITORING_DIR", Path.home() / ".claude" / "monitoring"))
+
+DEFAULT_BASE_PRICE = {"input": 3.0, "output": 15.0, "cache_write": 3.75, "cache_read": 0.3}
+DEFAULT_CONTEXT_WINDOW = 200000
+
+PERIOD_FORMATS = {
+    "daily": "%Y-%m-%d",
+    "weekly": "%Y-W%W",
+    "monthly": "%Y-%m",
+}
+SUMMED_FIELDS = ("tokens_input", "tokens_output", "tokens_total", "cost_usd", "duration_seconds",
+                 "files_read", "files_modified", "lines_added", "lines_removed")
+
+READ_TOOLS = ("Read", "NotebookRead")
+WRITE_TOOLS = ("Edit", "MultiEdit", "Write", "NotebookEdit")
+
+
+def load_pricing(variables_path=None):
+    """Return (base_price, {model_id: multiplier}, {family: multiplier}) from VARIABLES.yaml."""
+    try:
+        from variables import get
+    except ImportError:
+        return dict(DEFAULT_BASE_PRICE), {}, {}
+    base = {**DEFAULT_BASE_PRICE, **(get("costs.base_price_per_million", {}, variables_path) or {})}
+
+    by_id, by_family = {}, {}
+    for model in (get("models", {}, variables_path) or {}).values():
+        multiplier = model.get("cost_multiplier")
+        if multiplier is None:
+            continue
+        by_id[model.get("id", "")] = float(multiplier)
+        if model.get("name"):
+            by_family[model["name"].split()[0].lower()] = float(multiplier)
+    return base, by_id, by_family
+
+
+def empty_usage():
+    return {"input": 0, "output": 0, "cache_write": 0, "cache_read": 0}
+
+
+def summarize_transcript(transcript_path):
+    """Token usage per model, files touched and line counts from a session transcript."""
+    usage_by_model = defaultdict(empty_usage)
+    files_read, files_modified = set(), set()
+    lines_added = lines_removed = 0
+    peak_context = 0
+    model = None
+    first_ts = last_ts = None
+
+    with open(transcript_path, 'r', encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+
+            timestamp = entry.get("timestamp")
+            if timestamp:
+                first_ts = first_ts or timestamp
+                last_ts = timestamp
+
+            message = entry.get("message")
+            if not isinstance(message, dict):
+                continue
+            usage = message.get("usage")
+            if isinstance(usage, dict):
+                model = message.get("model") or model
+                counts = usage_by_model[model or "unknown"]
+                counts["input"] += int(usage.get("input_tokens") or 0)
+                counts["output"] += int(usage.get("output_tokens") or 0)
+                counts["cache_write"] += int(usage.get("cache_creation_input_tokens") or 0)
+                counts["cache_read"] += int(usage.get("cache_read_input_tokens") or 0)
+                context = sum(int(usage.get(k) or 0) for k in (
+                    "input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens"))
+                peak_context = max(peak_context, context)
+
+            content = message.get("content")
+            for block in content if isinstance(content, list) else []:
+                if not isinstance(block, dict) or block.get("type") != "tool_use":
+                    continue
+                tool_input = block.get("input") or {}
+                path = tool_input.get("file_path") or tool_input.get("notebook_path")
+                if block.get("name") in READ_TOOLS and path:
+                    files_read.add(path)
+                elif block.get("name") in WRITE_TOOLS and path:
+                    files_modified.add(path)
+                    edits = tool_input.get("edits") or [tool_input]
+                    for edit in edits:
+                        new = edit.get("new_string", edit.get("content", edit.get("new_source", ""))) or ""
+                        old = edit.get("old_string", "") or ""
+                        lines_added += new.count("\n") + (1 if new else 0)
+                        lines_removed += old.count("\n") + (1 if old else 0)
+
+    duration = 0
+    if first_ts and last_ts:
+        try:
+            duration = (datetime.fromisoformat(last_ts.replace("Z", "+00:00"))
+                        - datetime.fromisoformat(first_ts.replace("Z", "+00:00"))).total_seconds()
+        except ValueError:
+            pass
+
+    return {
+        "model": model,
+        "usage": {m: dict(u) for m, u in usage_by_model.items()},
+        "peak_context": peak_context,
+        "duration": duration,
+        "files_read": sorted(files_read),
+        "files_modified": sorted(files_modified),
+        "lines_added": lines_added,
+        "lines_removed": lines_removed,
+    }
+
+
+class TokenTracker:
+    """Batches session records and keeps daily/weekly/monthly aggregates current."""
+
+    def __init__(self, root=MONITORING_DIR, variables_path=None):
+        self.root = Path(root)
+        self.sessions_dir = self.root / "sessions"
+        self.aggregated_dir = self.root / "aggregated"
+        self.spool_path = self.root / "spool.jsonl"
+        self.lock_path = self.root / ".lock"
+        self.variables_path = variables_path
+        self.pending = []
+        self._pricing = None
+        self._windows = None
+
+    # ── pricing ──────────────────────────────────────────────
+
+    def multiplier(self, model):
+        if self._pricing is None:
+            self._pricing = load_pricing(self.variables_path)
+        _, by_id, by_family = self._pricing
+        if model in by_id:
+            return by_id[model]
+        for family, multiplier in by_family.items():
+            if family in (model or "").lower():
+                return multiplier
+        return 1.0
+
+    def calculate_cost(self, usage_by_model):
+        """USD for {model: {input, output, cache_write, cache_read}} token counts."""
+        if self._pricing is None:
+            self._pricing = load_pricing(self.variables_path)
+        base = self._pricing[0]
+        return sum(
+            self.multiplier(model) * sum(counts.get(kind, 0) * base[kind] for kind in base) / 1_000_000
+            for model, counts in usage_by_model.items()
+        )
+
+    def context_window(self, model):
+        if self._windows is None:
+            try:
+                from context_tracker import load_context_windows
+                self._windows = load_context_windows(self.variables_path)
+            except ImportError:
+                self._windows = ({}, {})
+        by_id, by_family = self._windows
+        if model in by_id:
+            return by_id[model]
+        for family, window in by_family.items():
+            if family in (model or "").lower():
+                return window
+        return DEFAULT_CONTEXT_WINDOW
+
+    # ── collection ───────────────────────────────────────────
+
+    def track_session(self, agent_id, session_data):
+        """Track token usage for a session (buffered until flush())."""
+        usage = session_data.get("usage")
+        if usage:
+            tokens_in = sum(c["input"] + c["cache_write"] + c["cache_read"] for c in usage.values())
+            tokens_out = sum(c["output"] for c in usage.values())
+            cost = self.calculate_cost(usage)
+        else:
+            tokens_in = session_data.get("tokens_in", 0)
+            tokens_out = session_data.get("tokens_out", 0)
+            cost = self.calculate_cost({session_data.get("model"): {"input": tokens_in, "output": tokens_out}})
+
+        model = session_data.get("model")
+        tokens_total = session_data.get("tokens_total") or tokens_in + tokens_out
+        peak_context = session_data.get("peak_context") or tokens_total
+        lines_added = session_data.get("lines_added", session_data.get("lines_changed", 0))
+
+        data = {
+            "timestamp": session_data.get("timestamp") or time.time(),
+            "session_id": session_data.get("session_id"),
+            "agent_id": agent_id,
+            "model": model,
+            "tokens_input": tokens_in,
+            "tokens_output": tokens_out,
+            "tokens_total": tokens_total,
+            "context_used": round(peak_context / self.context_window(model), 4),
+            "cost_usd": round(cost, 6),
+            "duration_seconds": session_data.get("duration", 0),
+            "files_read": len(session_data.get("files_read", [])),
+            "files_modified": len(session_data.get("files_modified", [])),
+            "lines_changed": lines_added + session_data.get("lines_removed", 0),
+            "lines_added": lines_added,
+            "lines_removed": session_data.get("lines_removed", 0),
+        }
+        self.pending.append(data)
+        return data
+
+    def save_session(self, data):
+        """Alias kept from the design sketch: buffer an already computed record."""
+        self.pending.append(data)
+
+    # ── storage ──────────────────────────────────────────────
+
+    @contextmanager
+    def locked(self, blocking=True):
+        """Exclusive lock over spool, session files and aggregates. Yields False if busy."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            yield True
+
+    @staticmethod
+    def _write_json(path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+
+    def _load_aggregate(self, period):
+        try:
+            with open(self.aggregated_dir / f"{period}.json", 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _add(bucket, record):
+        bucket["sessions"] = bucket.get("sessions", 0) + 1
+        for field in SUMMED_FIELDS:
+            bucket[field] = round(bucket.get(field, 0) + (record.get(field) or 0), 6)
+
+    def flush(self):
+        """Write buffered sessions and fold them into the aggregates. Returns the count."""
+        if not self.pending:
+            return 0
+        with self.locked():
+            return self._write_pending()
+
+    def _write_pending(self):
+        """flush() body; the caller holds the lock (flock is per open file, so it can't be re-taken)."""
+        batch, self.pending = self.pending, []
+        aggregates = {period: self._load_aggregate(period) for period in PERIOD_FORMATS}
+        sequence = {}
+        for record in batch:
+            moment = datetime.fromtimestamp(record["timestamp"])
+            agent = "".join(c for c in (record["agent_id"] or "general").lower() if c.isalnum() or c in "-_")
+            prefix = f"{moment:%Y-%m-%d}-{agent}"
+            if prefix not in sequence:
+                sequence[prefix] = len(list(self.sessions_dir.glob(f"{prefix}-*.json")))
+            sequence[prefix] += 1
+            self._write_json(self.sessions_dir / f"{prefix}-{sequence[prefix]:03d}.json", record)
+
+            for period, fmt in PERIOD_FORMATS.items():
+                bucket = aggregates[period].setdefault(moment.strftime(fmt), {})
+                self._add(bucket, record)
+                self._add(bucket.setdefault("by_agent", {}).setdefault(record["agent_id"] or "General", {}), record)
+                self._add(bucket.setdefault("by_model", {}).setdefault(record["model"] or "unknown", {}), record)
+
+        for period, data in aggregates.items():
+            self._write_json(self.aggregated_dir / f"{period}.json", data)
+        return len(batch)
+
+    # ── hook spool ───────────────────────────────────────────
+
+    def enqueue(self, payload, agent_id):
+        """Append a hook payload to the spool (one short O_APPEND write, no parsing)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"agent_id": agent_id, "queued_at": time.time(), "payload": payload},
+                          separators=(",", ":")) + "\n"
+        with open(self.spool_path, 'a') as f:
+            f.write(line)
+
+    def drain(self):
+        """Turn every spooled payload into a session record and flush them as one batch.
+
+        The lock is held from taking the spool until its processing file is
+        gone, so no other drain can read the same payloads."""
+        with self.locked(blocking=False) as acquired:
+            if not acquired:
+                return 0  # Another flush is running; it will pick these up
+            processing = self.spool_path.with_suffix(".processing")
+            if not processing.exists():  # Else left by a drain that died: finish it first
+                try:
+                    os.replace(self.spool_path, processing)
+                except FileNotFoundError:
+                    return 0
+            with open(processing, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    payload = entry.get("payload") or {}
+                    session_data = {"session_id": payload.get("session_id"), "timestamp": entry.get("queued_at")}
+                    transcript = payload.get("transcript_path")
+                    if transcript and os.path.exists(transcript):
+                        session_data.update(summarize_transcript(transcript))
+                    if payload.get("duration"):
+                        session_data["duration"] = payload["duration"]
+                    self.track_session(entry.get("agent_id"), session_data)
+            count = self._write_pending()
+            processing.unlink()
+        if self.spool_path.exists():
+            return count + self.drain()  # Payloads queued while we worked
+        return count
+
+    def report(self, now=None):
+        """Aggregate buckets for the current day, week and month."""
+        moment = datetime.fromtimestamp(now or time.time())
+        return {
+            period: self._load_aggregate(period).get(moment.strftime(fmt), {})
+            for period, fmt in PERIOD_FORMATS.items()
+        }
+
+
+def start_background_flush():
+    """Detached flush so the calling hook returns immediately."""
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "flush"],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _option(argv, flag, default=None):
+    return argv[argv.index(flag) + 1] if flag in argv and argv.index(flag) + 1 < len(argv) else default
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "report"
+    tracker = TokenTracker()
+
+    if command == "track":
+        try:
+            tracker.enqueue(json.load(sys.stdin), _option(argv, "--agent", "General"))
+            start_background_flush()
+        except Exception as e:
+            print(f"⚠️  token tracker: {e}", file=sys.stderr)
+        return 0  # Never block the session
+    if command == "flush":
+        count = tracker.drain()
+        print(f"✅ Flushed {count} sessions")
+        return 0
+    if command == "report":
+        for period, bucket in tracker.report().items():
+            label = {"daily": "Today", "weekly": "This week", "monthly": "This month"}[period]
+            print(f"{label + ':':<12} ${bucket.get('cost_usd', 0):.2f}  "
+                  f"{bucket.get('sessions', 0)} sessions  {bucket.get('tokens_total', 0):,} tokens")
+        return 0
+
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Context Packer - Budgeted resume context
+Packs the most useful slice of the last session into a token budget.
+
+resume_context.sh used to print the whole snapshot, resume boilerplate
+included. This scores candidate items - snapshot sections (TODOs, framework
+log, extraction candidates), recent commits, modified files and the `##`
+sections of pattern docs - by recency and by relevance to the current work
+(terms from the branch, TODOs, commit subjects and changed paths, plus
+--query), then greedily packs the best value-per-token subset into a budget
+derived from the model's context window in VARIABLES.yaml
+(context.resume_budget_ratio of models.<model>.context_window).
+
+Pattern sections that score well but do not fit are listed by reference
+(file and heading) instead of being loaded.
+
+Usage:
+    python3 context_packer.py                         # Default model window
+    python3 context_packer.py --model opus            # Budget from Opus window
+    python3 context_packer.py --budget 3000 --query "retry logic"
+    python3 context_packer.py --explain               # Scores, sizes, what was dropped
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path.home() / ".claude"))  # variables.py
+
+from context_store import FRAMEWORK_DIR, ContextStore, git_sections, run
+
+DEFAULT_CONTEXT_WINDOW = 200000
+DEFAULT_BUDGET_RATIO = 0.02
+DEFAULT_HALF_LIFE_HOURS = 72
+CHARS_PER_TOKEN = 4
+MIN_PATTERN_OVERLAP = 2  # Shared terms before a pattern section counts as relevant
+PATTERN_DIRS = (Path(".ai/patterns"), Path("patterns"), FRAMEWORK_DIR / "patterns")
+
+# Base value of each kind of item before recency/relevance
+KIND_WEIGHTS = {
+    "todo": 3.0,
+    "modified": 2.5,
+    "commit": 1.5,
+    "framework_log": 1.0,
+    "pattern": 1.0,
+    "extraction_candidates": 0.8,
+    "project_additions": 0.5,
+}
+KIND_TITLES = {
+    "todo": "Immediate Tasks",
+    "modified": "Modified Files",
+    "commit": "Recent Commits",
+    "framework_log": "Framework Log",
+    "extraction_candidates": "Extraction Candidates",
+    "project_additions": "Project Additions",
+    "pattern": "Relevant Patterns",
+}
+
+WORD_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+STOPWORDS = frozenset(
+    "the and for with from this that are was were will not you your into when then than use "
+    "using md py sh json yaml all any can has have but add new fix".split())
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def terms(text):
+    return {word for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS}
+
+
+class Item:
+    __slots__ = ("kind", "title", "text", "mtime", "tokens", "terms", "score")
+
+    def __init__(self, kind, title, text, mtime):
+        self.kind = kind
+        self.title = title
+        self.text = text.strip("\n")
+        self.mtime = mtime
+        self.tokens = estimate_tokens(self.text)
+        self.terms = terms(f"{title} {text}")
+        self.score = 0.0
+
+
+def load_settings():
+    """(context windows by model key/id/name, budget ratio, half-life hours) from VARIABLES.yaml."""
+    try:
+        from variables import get
+    except ImportError:
+        return {}, DEFAULT_BUDGET_RATIO, DEFAULT_HALF_LIFE_HOURS
+    windows = {}
+    for key, model in (get("models", {}) or {}).items():
+        if model.get("context_window"):
+            for name in (key, model.get("id"), model.get("name")):
+                if name:
+                    windows[str(name).lower()] = model["context_window"]
+    return (windows,
+            float(get("context.resume_budget_ratio", DEFAULT_BUDGET_RATIO)),
+            float(get("context.recency_half_life_hours", DEFAULT_HALF_LIFE_HOURS)))
+
+
+def context_window(windows, model):
+    """Window for a model key, id or name (substring match, e.g. 'opus'), else the default."""
+    if not model:
+        return DEFAULT_CONTEXT_WINDOW
+    model = model.lower()
+    if model in windows:
+        return windows[model]
+    for name, window in windows.items():
+        if model in name:
+            return window
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def split_sections(text, level="## "):
+    """[(heading, body)] split on markdown headings outside code fences; text before the first is dropped."""
+    sections, heading, body, fenced = [], None, [], False
+    for line in text.splitlines():
+        if line.startswith("```"):
+            fenced = not fenced
+        if line.startswith(level) and not fenced:
+            if heading:
+                sections.append((heading, "\n".join(body)))
+            heading, body = line[len(level):].strip(), [line]
+        elif heading:
+            body.append(line)
+    if heading:
+        sections.append((heading, "\n".join(body)))
+    return sections
+
+
+# ── candidate collection ─────────────────────────────────
+
+def snapshot_items(store):
+    """Header line and scoreable sections from the latest snapshot."""
+    saved_at, hashes = store.state()
+    if not hashes:
+        return None, []
+    section = {name: store.get(sha) for name, sha in hashes.items()}
+    header = (f"**Branch**: {section.get('branch', 'unknown')} | "
+              f"**Framework**: {section.get('framework_version', 'unknown')} | "
+              f"**Saved**: {time.strftime('%Y-%m-%d %H:%M', time.localtime(saved_at))}")
+
+    items = []
+    for name in ("todo", "extraction_candidates", "project_additions"):
+        text = section.get(name, "")
+        if text and not text.startswith("No "):
+            items.append(Item(name, KIND_TITLES[name], text, saved_at))
+    # The framework log grows over time; newer (later) entries count as more recent
+    log_sections = split_sections(section.get("framework_log", ""))
+    for age, (heading, body) in enumerate(reversed(log_sections)):
+        items.append(Item("framework_log", heading, body, saved_at - age * 3600))
+    return header, items
+
+
+def commit_items(limit=20):
+    log = run("git", "log", f"-{limit}", "--format=%h%x09%ct%x09%s") or ""
+    items = []
+    for line in log.splitlines():
+        sha, ts, subject = line.split("\t", 2)
+        items.append(Item("commit", sha, f"{sha} {subject}", float(ts)))
+    return items
+
+
+def modified_items():
+    changes = git_sections()["modified"]
+    items = []
+    for line in changes.splitlines():
+        if len(line) < 4 or line == "No changes":
+            continue
+        path = line[3:]
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = time.time()  # Deleted: as recent as it gets
+        items.append(Item("modified", path, line, mtime))
+    return items
+
+
+def pattern_items():
+    items, seen = [], set()
+    for directory in PATTERN_DIRS:
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.rglob("*.md")):
+            resolved = path.resolve()
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            mtime = path.stat().st_mtime
+            for heading, body in split_sections(path.read_text(errors="replace")):
+                item = Item("pattern", f"{path} › {heading}", body, mtime)
+                item.terms |= terms(path.stem.replace("_", " "))
+                items.append(item)
+    return items
+
+
+# ── scoring and packing ──────────────────────────────────
+
+def score_items(items, query_terms, now, half_life_hours):
+    """score = kind weight × recency decay × (1 + relevance to the current work)."""
+    for item in items:
+        age_hours = max(0.0, (now - item.mtime) / 3600)
+        recency = 0.5 ** (age_hours / half_life_hours)
+        overlap = len(item.terms & query_terms)
+        relevance = overlap / math.sqrt(len(item.terms) * len(query_terms)) if overlap else 0.0
+        # Patterns are only worth loading when they relate to the work at hand
+        if item.kind == "pattern":
+            recency = 0.5 + 0.5 * recency
+            relevance = relevance * 4 if overlap >= MIN_PATTERN_OVERLAP else -1
+        item.score = KIND_WEIGHTS[item.kind] * recency * (1 + relevance)
+
+
+def pack(items, budget):
+    """Greedy by score per token. Returns (packed, skipped)."""
+    packed, skipped, used = [], [], 0
+    for item in sorted(items, key=lambda i: i.score / i.tokens, reverse=True):
+        if item.score <= 0:
+            continue
+        if used + item.tokens <= budget:
+            packed.append(item)
+            used += item.tokens
+        else:
+            skipped.append(item)
+    return packed, skipped
+
+
+def render(header, packed, skipped, budget):
+    used = sum(item.tokens for item in packed)
+    lines = ["# Session Context (packed)"]
+    if header:
+        lines.append(header)
+    lines.append(f"*{used}/{budget} tokens*")
+
+    for kind in KIND_TITLES:
+        group = [item for item in packed if item.kind == kind]
+        if not group:
+            continue
+        lines += ["", f"## {KIND_TITLES[kind]}"]
+        if kind in ("commit", "modified"):
+            group.sort(key=lambda item: item.mtime, reverse=True)
+            lines += ["```", *(item.text for item in group), "```"]
+        elif kind in ("pattern", "framework_log"):
+            for item in group:
+                lines += ["", f"### {item.title}", *item.text.splitlines()[1:]]
+        else:
+            lines.append(group[0].text)
+
+    references = sorted((item for item in skipped if item.kind == "pattern"),
+                        key=lambda item: item.score, reverse=True)[:5]
+    if references:
+        lines += ["", "## Load on Demand"]
+        lines += [f"- {item.title} (~{item.tokens} tokens)" for item in references]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack resume context into a token budget")
+    parser.add_argument("--model", help="Model key, id or name for the context window (e.g. sonnet, opus)")
+    parser.add_argument("--budget", type=int, help="Token budget (overrides the VARIABLES.yaml ratio)")
+    parser.add_argument("--query", default="", help="Extra terms describing the work to resume")
+    parser.add_argument("--no-patterns", action="store_true", help="Skip pattern docs")
+    parser.add_argument("--explain", action="store_true", help="Print scores instead of the packed context")
+    args = parser.parse_args(argv)
+
+    windows, ratio, half_life = load_settings()
+    budget = args.budget or int(context_window(windows, args.model or os.getenv("CLAUDE_MODEL")) * ratio)
+
+    header, items = snapshot_items(ContextStore())
+    work_items = items + commit_items() + modified_items()
+    # What the session was about: TODOs, commits, changed paths, branch name
+    query_terms = terms(args.query + " " + (header or ""))
+    for item in work_items:
+        if item.kind in ("todo", "commit", "modified"):
+            query_terms |= terms(item.text.replace("/", " ").replace("_", " "))
+
+    candidates = work_items + ([] if args.no_patterns else pattern_items())
+    if not candidates:
+        print("❌ Nothing to pack (no snapshot, commits or changes).", file=sys.stderr)
+        return 1
+    score_items(candidates, query_terms or {"todo"}, time.time(), half_life)
+    packed, skipped = pack(candidates, budget)
+
+    if args.explain:
+        chosen = set(map(id, packed))
+        print(f"Budget: {budget} tokens ({sum(item.tokens for item in packed)} used)")
+        for item in sorted(candidates, key=lambda i: i.score / i.tokens, reverse=True):
+            mark = "✅" if id(item) in chosen else "  "
+            print(f"{mark} {item.score / item.tokens:8.4f} {item.score:6.2f} {item.tokens:6}  "
+                  f"{item.kind:<22} {item.title[:60]}")
+        return 0
+
+    print(render(header, packed, skipped, budget), end="")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
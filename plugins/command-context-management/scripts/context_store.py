@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Context Store - Incremental session snapshots
+
+Each save collects the session sections (git state, recent commits, TODOs,
+framework log, ...) and stores only what changed since the previous
+snapshot:
+- Section bodies are content-addressed blobs (objects/<sha256>), so an
+  unchanged TODO list or framework log is stored once
+- snapshots.jsonl records per snapshot only the sections whose hash changed
+  (with a full keyframe every KEYFRAME_EVERY snapshots)
+- latest.json holds the materialized latest state, so resume is one read
+- A save where nothing changed writes nothing
+
+File sections are re-read only when their (mtime, size) changes and git
+state comes from a single `git status --porcelain=v2 --branch`, which makes
+saves cheap enough for the Stop hook. Old snapshots are pruned by count and
+age, and blobs no longer referenced are deleted. latest.json also tracks
+the snapshot count and the oldest snapshot's time, so a save knows without
+reading the manifest whether pruning would drop anything, and only prunes
+then.
+
+Layout (.ai/context/):
+    latest_session.md          Rendered latest snapshot (what resume shows)
+    snapshots/snapshots.jsonl  Snapshot deltas
+    snapshots/latest.json      Latest full state + file stat cache
+    snapshots/objects/         Section blobs
+
+Usage:
+    python3 context_store.py save [--quiet]
+    python3 context_store.py show [SNAPSHOT_ID] [--section todo|framework_log|...]
+    python3 context_store.py list
+    python3 context_store.py prune [--keep 50] [--days 14] [--legacy]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+CONTEXT_DIR = Path(".ai/context")
+FRAMEWORK_DIR = Path("../claude-dev-framework")
+KEYFRAME_EVERY = 20
+DEFAULT_KEEP = 50
+DEFAULT_KEEP_DAYS = 14
+AUTO_PRUNE_FACTOR = 2  # save prunes once there are this many times `keep` snapshots
+
+# File-backed sections (TODO and framework log used to be copied per save)
+FILE_SECTIONS = {
+    "project_additions": Path(".claude-plugin/project-marketplace.json"),
+    "extraction_candidates": Path(".ai/learnings/GENERIC_PATTERNS.md"),
+    "todo": Path(".ai/context/TODO.md"),
+    "framework_log": Path(".ai/PROJECT_FRAMEWORK_LOG.md"),
+}
+MISSING = {
+    "project_additions": "No project marketplace",
+    "extraction_candidates": "No patterns yet",
+    "todo": "No TODOs",
+    "framework_log": "No framework log",
+}
+
+
+def run(*cmd, cwd=None):
+    try:
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.rstrip("\n") if result.returncode == 0 else None
+
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _after(text, marker, lines):
+    """Marker line plus the following lines (grep -A equivalent)."""
+    out = text.splitlines()
+    for i, line in enumerate(out):
+        if marker in line:
+            return "\n".join(out[i:i + lines + 1])
+    return None
+
+
+def extract_file_section(name, text):
+    if name == "project_additions":
+        return _after(text, "metadata", 5)
+    if name == "extraction_candidates":
+        return _after(text, "## Discovered Patterns", 20)
+    if name == "todo":
+        return "\n".join(text.splitlines()[:20])
+    return text
+
+
+def git_sections():
+    """Branch, status, in-progress files and recent commits from two git calls."""
+    status = run("git", "status", "--porcelain=v2", "--branch")
+    if status is None:
+        return {"branch": "unknown", "git_status": "Git not available", "modified": "No changes",
+                "in_progress": "No files in progress", "commits": "No commits"}
+
+    branch, ahead, changes = "unknown", "", []
+    for line in status.splitlines():
+        if line.startswith("# branch.head "):
+            branch = line.split(" ", 2)[2]
+        elif line.startswith("# branch.ab "):
+            ahead = line.split(" ", 2)[2]
+        elif line.startswith("1 "):
+            changes.append((line[2:4].replace(".", " "), line.split(" ", 8)[8]))
+        elif line.startswith("2 "):
+            changes.append((line[2:4].replace(".", " "), line.split("\t")[0].split(" ", 9)[9]))
+        elif line.startswith("u "):
+            changes.append(("UU", line.split(" ", 10)[10]))
+        elif line.startswith("? "):
+            changes.append(("??", line[2:]))
+
+    short = "\n".join(f"{xy} {path}" for xy, path in changes)
+    summary = [f"On branch {branch}"]
+    if ahead and ahead != "+0 -0":
+        summary.append(f"Ahead/behind upstream: {ahead}")
+    summary.append(f"{len(changes)} changed file(s)" if changes else "nothing to commit, working tree clean")
+
+    return {
+        "branch": branch,
+        "git_status": "\n".join(summary),
+        "modified": short or "No changes",
+        "in_progress": "\n".join([f"{xy} {path}" for xy, path in changes if xy == " M"][:10])
+                       or "No files in progress",
+        "commits": run("git", "log", "-5", "--oneline") or "No commits",
+    }
+
+
+class ContextStore:
+    """Delta snapshots of session context with content-addressed sections."""
+
+    def __init__(self, context_dir=CONTEXT_DIR):
+        self.context_dir = Path(context_dir)
+        self.store_dir = self.context_dir / "snapshots"
+        self.objects_dir = self.store_dir / "objects"
+        self.manifest_path = self.store_dir / "snapshots.jsonl"
+        self.latest_path = self.store_dir / "latest.json"
+        self.rendered_path = self.context_dir / "latest_session.md"
+
+    # ── storage ──────────────────────────────────────────────
+
+    def _object_path(self, sha):
+        return self.objects_dir / sha[:2] / sha
+
+    def put(self, text):
+        sha = digest(text)
+        path = self._object_path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(text)
+            os.replace(tmp, path)
+        return sha
+
+    def get(self, sha):
+        return self._object_path(sha).read_text()
+
+    def load_latest(self):
+        try:
+            latest = json.loads(self.latest_path.read_text())
+        except (OSError, ValueError):
+            return {"id": 0, "sections": {}, "file_stats": {}, "since_keyframe": 0, "count": 0, "oldest_at": None}
+        if "count" not in latest:
+            # Written before the count was tracked: count once
+            entries = self.entries()
+            latest["count"] = len(entries)
+            latest["oldest_at"] = entries[0]["saved_at"] if entries else None
+        return latest
+
+    def _write_json(self, path, data):
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=1))
+        os.replace(tmp, path)
+
+    def entries(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    # ── collection ───────────────────────────────────────────
+
+    def collect(self, latest):
+        """Current section texts; unchanged files reuse the stored hash without being read."""
+        sections = git_sections()
+        sections["framework_version"] = run("git", "describe", "--tags", cwd=FRAMEWORK_DIR) \
+            if FRAMEWORK_DIR.is_dir() else None
+        sections["framework_version"] = sections["framework_version"] or "unknown"
+
+        hashes, file_stats = {}, {}
+        for name, path in FILE_SECTIONS.items():
+            try:
+                st = path.stat()
+            except OSError:
+                sections[name] = MISSING[name]
+                continue
+            key = [st.st_mtime_ns, st.st_size]
+            file_stats[name] = key
+            cached = latest["file_stats"].get(name)
+            if cached == key and name in latest["sections"]:
+                hashes[name] = latest["sections"][name]
+            else:
+                text = path.read_text(errors="replace")
+                sections[name] = extract_file_section(name, text) or MISSING[name]
+
+        for name, text in sections.items():
+            hashes[name] = self.put(text)
+        return hashes, file_stats
+
+    def save(self, now=None):
+        """Record a snapshot if anything changed. Returns (snapshot id, changed section names)."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        latest = self.load_latest()
+        hashes, file_stats = self.collect(latest)
+
+        previous = latest["sections"]
+        changed = {name: sha for name, sha in hashes.items() if previous.get(name) != sha}
+        removed = [name for name in previous if name not in hashes]
+        if not changed and not removed:
+            if file_stats != latest["file_stats"]:
+                latest["file_stats"] = file_stats
+                self._write_json(self.latest_path, latest)
+            return latest["id"], []
+
+        snapshot_id = latest["id"] + 1
+        keyframe = latest["since_keyframe"] + 1 >= KEYFRAME_EVERY or not previous
+        entry = {"id": snapshot_id, "saved_at": now or time.time()}
+        if keyframe:
+            entry["sections"] = hashes
+        else:
+            entry.update(changed=changed, removed=removed)
+        with open(self.manifest_path, 'a') as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+        latest = {"id": snapshot_id, "saved_at": entry["saved_at"], "sections": hashes,
+                  "file_stats": file_stats, "since_keyframe": 0 if keyframe else latest["since_keyframe"] + 1,
+                  "count": latest["count"] + 1, "oldest_at": latest["oldest_at"] or entry["saved_at"]}
+        self._write_json(self.latest_path, latest)
+
+        tmp = self.rendered_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(self.render(hashes, entry["saved_at"]))
+        if self.rendered_path.is_symlink():
+            self.rendered_path.unlink()  # Old layout pointed at session_*.md
+        os.replace(tmp, self.rendered_path)
+        return snapshot_id, sorted(changed) + sorted(removed)
+
+    # ── reconstruction ───────────────────────────────────────
+
+    def state(self, snapshot_id=None):
+        """(saved_at, {section: hash}) for a snapshot id (default: latest)."""
+        latest = self.load_latest()
+        if snapshot_id is None or snapshot_id == latest["id"]:
+            return latest.get("saved_at"), latest["sections"]
+
+        sections, saved_at = {}, None
+        for entry in self.entries():
+            if entry["id"] > snapshot_id:
+                break
+            if "sections" in entry:
+                sections = dict(entry["sections"])
+            else:
+                sections.update(entry["changed"])
+                for name in entry["removed"]:
+                    sections.pop(name, None)
+            saved_at = entry["saved_at"]
+        if saved_at is None:
+            raise KeyError(snapshot_id)
+        return saved_at, sections
+
+    def render(self, hashes, saved_at):
+        text = {name: self.get(sha) for name, sha in hashes.items()}
+        saved = datetime.fromtimestamp(saved_at).strftime("%a %b %d %H:%M:%S %Y") if saved_at else "unknown"
+        return f"""# Session Context Snapshot
+**Saved**: {saved}
+**Branch**: {text.get("branch", "unknown")}
+**Framework**: v2.0.0 (locked)
+
+---
+
+## Git Status
+
+```
+{text.get("git_status", "")}
+```
+
+---
+
+## Modified Files
+
+```
+{text.get("modified", "No changes")}
+```
+
+---
+
+## Recent Commits (last 5)
+
+```
+{text.get("commits", "No commits")}
+```
+
+---
+
+## Project State
+
+### Framework Version
+- **Locked**: v2.0.0
+- **Location**: ../claude-dev-framework
+- **Status**: {text.get("framework_version", "unknown")}
+
+### Project Additions
+{text.get("project_additions", MISSING["project_additions"])}
+
+### Extraction Candidates
+{text.get("extraction_candidates", MISSING["extraction_candidates"])}
+
+---
+
+## Next Steps
+
+### Immediate Tasks
+{text.get("todo", MISSING["todo"])}
+
+### In Progress
+{text.get("in_progress", "No files in progress")}
+
+---
+
+## How to Resume
+
+```bash
+# 1. Verify framework still locked
+.ai/scripts/verify_framework_immutability.sh
+
+# 2. Review this session
+.ai/scripts/resume_context.sh
+
+# 3. Check what was in progress
+git status
+
+# 4. Start Claude Code
+claude
+
+# 5. Say: "Review the session context and help me continue"
+```
+
+---
+
+## Cost & Usage (if available)
+
+To check costs after resuming, use:
+```
+/cost
+/usage
+```
+
+---
+
+**Session End**: {saved}
+"""
+
+    # ── retention ────────────────────────────────────────────
+
+    def prune_due(self, keep=DEFAULT_KEEP, keep_days=DEFAULT_KEEP_DAYS, now=None):
+        """Whether prune() would drop a snapshot, from latest.json alone.
+        Snapshots are in time order, so the oldest goes first or nothing does."""
+        latest = self.load_latest()
+        oldest = latest["oldest_at"]
+        return (latest["count"] > keep and oldest is not None
+                and oldest < (now or time.time()) - keep_days * 86400)
+
+    def prune(self, keep=DEFAULT_KEEP, keep_days=DEFAULT_KEEP_DAYS, legacy=False, now=None):
+        """Drop snapshots beyond `keep` and older than `keep_days`; GC unreferenced blobs."""
+        now = now or time.time()
+        entries = self.entries()
+        cutoff = now - keep_days * 86400
+        # A snapshot survives if it is among the last `keep` or newer than the cutoff
+        first_kept = next((i for i, e in enumerate(entries)
+                           if i >= len(entries) - keep or e["saved_at"] >= cutoff), len(entries))
+        dropped = first_kept
+        if entries and dropped:
+            kept = entries[first_kept:]
+            if kept:
+                # The oldest survivor must be self-contained
+                _, sections = self.state(kept[0]["id"])
+                kept[0] = {"id": kept[0]["id"], "saved_at": kept[0]["saved_at"], "sections": sections}
+            tmp = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in kept))
+            os.replace(tmp, self.manifest_path)
+            latest = self.load_latest()
+            latest["count"] = len(kept)
+            latest["oldest_at"] = kept[0]["saved_at"] if kept else None
+            self._write_json(self.latest_path, latest)
+
+        # Garbage-collect blobs nobody references any more
+        referenced = set(self.load_latest()["sections"].values())
+        for entry in self.entries():
+            referenced.update((entry.get("sections") or entry.get("changed") or {}).values())
+        removed_objects = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob("*/*"):
+                if path.name not in referenced:
+                    path.unlink()
+                    removed_objects += 1
+
+        removed_legacy = 0
+        if legacy:
+            for pattern in ("session_*.md", "TODO_*.md", "FRAMEWORK_LOG_*.md"):
+                for path in self.context_dir.glob(pattern):
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed_legacy += 1
+        return dropped, removed_objects, removed_legacy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental session context snapshots")
+    sub = parser.add_subparsers(dest="command")
+    save = sub.add_parser("save", help="Record a snapshot (no-op if nothing changed)")
+    save.add_argument("--quiet", action="store_true", help="No output (Stop hook)")
+    show = sub.add_parser("show", help="Print a snapshot (default: latest)")
+    show.add_argument("snapshot", nargs="?", type=int)
+    show.add_argument("--section", help="Print one raw section (e.g. todo, framework_log)")
+    sub.add_parser("list", help="List stored snapshots")
+    prune = sub.add_parser("prune", help="Apply the retention policy")
+    prune.add_argument("--keep", type=int, default=DEFAULT_KEEP, help=f"Snapshots to keep (default {DEFAULT_KEEP})")
+    prune.add_argument("--days", type=int, default=DEFAULT_KEEP_DAYS,
+                       help=f"Also keep anything newer than this (default {DEFAULT_KEEP_DAYS})")
+    prune.add_argument("--legacy", action="store_true", help="Also delete old session_*.md / TODO_*.md copies")
+    args = parser.parse_args(argv)
+    store = ContextStore()
+
+    if args.command == "save":
+        snapshot_id, changed = store.save()
+        if changed and store.prune_due(keep=DEFAULT_KEEP * AUTO_PRUNE_FACTOR):
+            store.prune()
+        if not args.quiet:
+            if changed:
+                print(f"✅ Snapshot {snapshot_id} saved ({', '.join(changed)} changed)")
+            else:
+                print(f"ℹ️  Nothing changed since snapshot {snapshot_id}")
+            print(f"   Latest session: {store.rendered_path}")
+        return 0
+    if args.command == "show":
+        try:
+            saved_at, sections = store.state(args.snapshot)
+        except KeyError:
+            print(f"❌ Snapshot {args.snapshot} not found (pruned?)", file=sys.stderr)
+            return 1
+        if not sections:
+            print("❌ No saved session found.", file=sys.stderr)
+            return 1
+        if args.section:
+            if args.section not in sections:
+                print(f"❌ Unknown section: {args.section} ({', '.join(sorted(sections))})", file=sys.stderr)
+                return 1
+            print(store.get(sections[args.section]))
+            return 0
+        print(store.render(sections, saved_at))
+        return 0
+    if args.command == "list":
+        for entry in store.entries():
+            kind = "full " if "sections" in entry else "delta"
+            changed = ", ".join(sorted(entry.get("changed", {}))) or "-"
+            saved = datetime.fromtimestamp(entry["saved_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{entry['id']:>5}  {saved}  {kind}  {changed}")
+        return 0
+    if args.command == "prune":
+        dropped, objects, legacy = store.prune(args.keep, args.days, args.legacy)
+        print(f"✅ Pruned {dropped} snapshots, {objects} unreferenced sections, {legacy} legacy files")
+        return 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,24 @@
 #!/bin/bash
 # Resume Context - Load last saved session state
+#
+# Shows the last session packed into a token budget (context_packer.py):
+# the most recent and relevant TODOs, commits, changes and patterns.
+#   --full            Show the whole snapshot instead
+#   other arguments   Passed to context_packer.py (--model, --budget, --query)
 
 set -e
 
+FULL=false
+if [ "$1" = "--full" ]; then
+    FULL=true
+    shift
+fi
+
 CONTEXT_DIR=".ai/context"
 LATEST_SESSION="$CONTEXT_DIR/latest_session.md"
+SCRIPT_DIR="$(dirname "${BASH_SOURCE[0]}")"
+CONTEXT_STORE="$SCRIPT_DIR/context_store.py"
+CONTEXT_PACKER="$SCRIPT_DIR/context_packer.py"
 
 echo "🔄 Resuming from last session..."
 echo ""
@@ -23,7 +37,12 @@ echo "════════════════════════
 echo "📖 Last Session Context"
 echo "════════════════════════════════════════════════════"
 echo ""
-cat "$LATEST_SESSION"
+# Rebuilt from the snapshot store; older saves only have the markdown
+if [ "$FULL" = true ]; then
+    python3 "$CONTEXT_STORE" show 2>/dev/null || cat "$LATEST_SESSION"
+else
+    python3 "$CONTEXT_PACKER" "$@" 2>/dev/null || cat "$LATEST_SESSION"
+fi
 echo ""
 echo "════════════════════════════════════════════════════"
 echo ""
@@ -59,7 +78,7 @@ echo ""
 echo "🚀 Ready to continue!"
 echo ""
 echo "Next steps:"
-echo "  1. Review session context above"
+echo "  1. Review session context above (full snapshot: resume_context.sh --full)"
 echo "  2. Check git status for in-progress work"
 echo "  3. Start Claude Code: claude"
 echo "  4. Say: 'Review the session context and help me continue'"
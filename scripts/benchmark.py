@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Benchmarks
+Latency, process spawns and peak RSS of the framework's always-on pieces.
+
+Drives each entry point the way Claude Code does - a synthetic JSON payload
+on stdin, in a throwaway $HOME so no real logs, markers or ledgers are
+touched:
+- statusline: config/statusline.py, config/statusline.sh
+- hooks:      session-start, session-end, track-agent, safety-check, cost-alert,
+              and the same events through hook_dispatcher.py (one-shot, no worker)
+- sync:       sync_marketplace() over synthetic frameworks of N plugins
+              (forced regeneration and the unchanged-hash fast path)
+- split:      split_marketplace.py build_marketplaces() + write_marketplaces()
+              over synthetic marketplaces of N plugins
+
+Per case it reports p50/p99 latency, spawns per invocation (processes and
+threads created, the entry point itself included; from the kernel fork
+counter in /proc/stat, so Linux only) and peak RSS (wait4 rusage).
+In-process builders run in a worker subprocess so their RSS is their own.
+
+Baselines are stored in .ai/benchmarks/baseline.json. --check compares a
+run against it and exits 1 on a regression, so a hook or script change
+that adds a fork or doubles latency is caught before it ships.
+
+Usage:
+    python3 scripts/benchmark.py                         # All groups
+    python3 scripts/benchmark.py --only hooks,statusline -n 50
+    python3 scripts/benchmark.py --only sync,split --sizes 10,1000,10000
+    python3 scripts/benchmark.py --save-baseline         # Record baseline
+    python3 scripts/benchmark.py --check                 # Exit 1 on regression
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CONFIG_DIR = BASE_DIR / "config"
+HOOKS_DIR = CONFIG_DIR / "hooks"
+BASELINE_PATH = BASE_DIR / ".ai" / "benchmarks" / "baseline.json"
+
+GROUPS = ("statusline", "hooks", "sync", "split")
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_ITERATIONS = 20
+
+# Regression thresholds for --check
+LATENCY_TOLERANCE = 0.25    # p50 may grow 25%...
+LATENCY_FLOOR_MS = 2.0      # ...or 2ms, whichever is larger (timer noise on tiny cases)
+RSS_TOLERANCE = 0.25
+
+STATUSLINE_PAYLOAD = {
+    "session_id": "bench-session",
+    "transcript_path": "",  # Filled in per sandbox
+    "model": {"id": "claude-3-5-sonnet-20241022", "display_name": "Sonnet 3.5"},
+    "workspace": {"current_dir": "/home/dev/projects/book-cataloger"},
+    "cost": {"total": 0.42, "lines_added": 127, "lines_removed": 43, "duration": 720},
+}
+
+HOOK_CASES = {
+    "session-start.sh": {},
+    "track-agent.sh": {"message": "/role-backend implement the retry logic"},
+    "safety-check.sh": {"tool": "Bash", "arguments": {"command": "ls -la src/"}},
+    "cost-alert.sh": {"session_id": "bench-session", "model": {"display_name": "Sonnet 3.5"},
+                      "cost": {"total": 0.42}},
+    "session-end.sh": {"session_id": "bench-session", "duration": 720, "cost": {"total": 0.42},
+                       "transcript_path": ""},
+}
+
+# hook_dispatcher.py event for each shell hook (benchmarked with the same payload)
+DISPATCHER_EVENTS = {
+    "session-start.sh": "SessionStart",
+    "track-agent.sh": "UserPromptSubmit",
+    "safety-check.sh": "PreToolUse",
+    "cost-alert.sh": "Stop",
+    "session-end.sh": "SessionEnd",
+}
+
+
+# ── measurement ──────────────────────────────────────────
+
+def fork_count():
+    """Processes created since boot (Linux), or None."""
+    try:
+        with open("/proc/stat", 'r') as f:
+            for line in f:
+                if line.startswith("processes "):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def rss_kb(maxrss):
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss  # macOS reports bytes
+
+
+def run_once(cmd, payload, env, cwd):
+    """One invocation: (seconds, spawns or None, peak RSS KB)."""
+    forks = fork_count()
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, env=env, cwd=cwd)
+    try:
+        proc.stdin.write(payload)
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass  # Entry point exited without reading stdin
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    after = fork_count()
+    spawns = after - forks if forks is not None and after is not None else None
+    return elapsed, spawns, rss_kb(usage.ru_maxrss)
+
+
+def summarize(samples, spawns, rss):
+    samples = sorted(samples)
+    spawns = [s for s in spawns if s is not None]
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+        "runs": len(samples),
+        # The minimum filters out forks by unrelated processes during the run
+        "spawns": min(spawns) if spawns else None,
+        "peak_rss_kb": max(rss) if rss else None,
+    }
+
+
+def bench_command(cmd, payload, iterations, env, cwd):
+    run_once(cmd, payload, env, cwd)  # Warm caches (VARIABLES snapshot, page cache)
+    samples, spawns, rss = [], [], []
+    for _ in range(iterations):
+        elapsed, forks, peak = run_once(cmd, payload, env, cwd)
+        samples.append(elapsed)
+        spawns.append(forks)
+        rss.append(peak)
+    return summarize(samples, spawns, rss)
+
+
+def bench_worker(case, size, iterations, env, cwd):
+    """Run an in-process case in a worker subprocess; its samples come back as JSON."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "_worker", case, str(size), str(iterations)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, cwd=cwd)
+    out = proc.stdout.read()
+    err = proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{case} worker failed: {err.decode(errors='replace').strip()[-300:]}")
+    data = json.loads(out)
+    return summarize(data["samples"], data["spawns"], [rss_kb(usage.ru_maxrss)])
+
+
+# ── sandbox and fixtures ─────────────────────────────────
+
+def make_sandbox(root):
+    """Throwaway $HOME + project dir; returns (env, cwd)."""
+    home = root / "home"
+    project = root / "book-cataloger"
+    (home / ".claude" / "logs").mkdir(parents=True)
+    project.mkdir()
+
+    transcript = root / "transcript.jsonl"
+    with open(transcript, 'w') as f:
+        for i in range(200):
+            f.write(json.dumps({"type": "user", "message": {"content": f"message {i} " * 20}}) + "\n")
+            f.write(json.dumps({"type": "assistant", "message": {
+                "usage": {"input_tokens": 1200 + i, "cache_read_input_tokens": 30000, "output_tokens": 400}}}) + "\n")
+    STATUSLINE_PAYLOAD["transcript_path"] = str(transcript)
+    HOOK_CASES["session-end.sh"]["transcript_path"] = str(transcript)
+
+    env = {
+        **os.environ,
+        "HOME": str(home),
+        "CLAUDE_FRAMEWORK_ROOT": str(BASE_DIR),
+        "CLAUDE_MONITORING_DIR": str(home / ".claude" / "monitoring"),
+        "CLAUDE_SAFETY_SOCKET": str(home / ".claude" / ".safety.sock"),
+        "CLAUDE_HOOKS_SOCKET": str(home / ".claude" / ".hooks.sock"),
+        "CLAUDE_CURRENT_AGENT": "Backend",
+    }
+    return env, project
+
+
+def synthetic_framework(root, size):
+    """Framework checkout with `size` plugins: (VARIABLES.yaml path, marketplace.json path)."""
+    import yaml
+    plugins = []
+    for i in range(size):
+        name = f"agent-{i:05d}"
+        manifest_dir = root / "plugins" / name / ".claude-plugin"
+        manifest_dir.mkdir(parents=True)
+        (manifest_dir / "plugin.json").write_text(json.dumps({
+            "name": name, "version": "2.0.1", "description": f"Synthetic plugin {i}",
+            "author": {"name": "ORG_NAME"}, "license": "MIT"}, indent=2))
+        plugins.append({"name": name, "description": f"Synthetic plugin {i}",
+                        "category": "development", "type": "agent"})
+    variables = {
+        "owner": {"name": "ORG_NAME", "github": "bench-org"},
+        "marketplaces": {"framework": {
+            "name": "ClaudeDevFramework", "version": "2.0.1",
+            "github_repo": "fda3r6sbvdgq09gse2/claude-dev-framework",
+            "description": "Synthetic marketplace", "plugins": plugins}},
+    }
+    variables_path = root / "VARIABLES.yaml"
+    variables_path.write_text(yaml.safe_dump(variables))
+    (root / ".claude-plugin").mkdir()
+    return variables_path, root / ".claude-plugin" / "marketplace.json"
+
+
+def synthetic_marketplace(root, size, known_names):
+    """Source marketplace with `size` plugins plus command/hook files to discover."""
+    plugins = []
+    for i in range(size):
+        name = known_names[i] if i < len(known_names) else f"plugin-{i:05d}"
+        plugins.append({"name": name, "description": f"Synthetic plugin {i}", "version": "2.0.1",
+                        "category": "development",
+                        "source": {"source": "file", "path": str(root / "plugins" / name)}})
+    commands = root / ".claude" / "commands"
+    commands.mkdir(parents=True)
+    for i in range(max(1, size // 10)):
+        (commands / f"{('sprint', 'role', 'supercharge')[i % 3]}-cmd{i}.md").write_text("# cmd\n")
+    hooks = root / "config" / "hooks"
+    hooks.mkdir(parents=True)
+    for name in HOOK_CASES:
+        (hooks / name).write_text("#!/bin/bash\n")
+    return {"name": "ClaudeDevFramework", "version": "2.0.1", "owner": {"name": "ORG_NAME"},
+            "plugins": plugins, "metadata": {"license": "MIT"}}
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timed(fn, iterations):
+    samples, spawns = [], []
+    for _ in range(iterations):
+        forks = fork_count()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+        after = fork_count()
+        spawns.append(after - forks if forks is not None and after is not None else None)
+    return samples, spawns
+
+
+def worker(case, size, iterations):
+    """In-process timings for the sync/split builders (run via `_worker`)."""
+    sys.path.insert(0, str(CONFIG_DIR))
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        root = Path(tmp)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        if case.startswith("sync"):
+            sync = load_module("sync_marketplace_from_variables",
+                               BASE_DIR / ".ai" / "scripts" / "sync_marketplace_from_variables.py")
+            variables_path, marketplace_path = synthetic_framework(root, size)
+            force = case == "sync-force"
+            with quiet:
+                sync.sync_marketplace(variables_path, marketplace_path, root, force=True)
+                samples, spawns = timed(
+                    lambda: sync.sync_marketplace(variables_path, marketplace_path, root, force=force),
+                    iterations)
+        else:
+            split = load_module("split_marketplace", BASE_DIR / "scripts" / "split_marketplace.py")
+            known = [name for component in split.COMPONENTS.values() for name in component["plugins"]]
+            source = synthetic_marketplace(root, size, known)
+            out_dir = root / ".claude-plugin"
+            out_dir.mkdir()
+            with quiet:
+                samples, spawns = timed(
+                    lambda: split.write_marketplaces(split.build_marketplaces(source, root), out_dir),
+                    iterations)
+    print(json.dumps({"samples": samples, "spawns": spawns}))
+    return 0
+
+
+# ── suite ────────────────────────────────────────────────
+
+def run_suite(groups, iterations, sizes):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        env, cwd = make_sandbox(Path(tmp))
+
+        if "statusline" in groups:
+            payload = json.dumps(STATUSLINE_PAYLOAD).encode("utf-8")
+            for name in ("statusline.py", "statusline.sh"):
+                results[name] = bench_command([str(CONFIG_DIR / name)], payload, iterations, env, cwd)
+                print_row(name, results[name])
+
+        if "hooks" in groups:
+            for name, payload in HOOK_CASES.items():
+                results[name] = bench_command([str(HOOKS_DIR / name)], json.dumps(payload).encode("utf-8"),
+                                              iterations, env, cwd)
+                print_row(name, results[name])
+            for script, event in DISPATCHER_EVENTS.items():
+                name = f"dispatch:{event}"
+                results[name] = bench_command([sys.executable, str(HOOKS_DIR / "hook_dispatcher.py"), event],
+                                              json.dumps(HOOK_CASES[script]).encode("utf-8"), iterations, env, cwd)
+                print_row(name, results[name])
+            results.update(bench_dispatcher_worker(iterations, env, cwd))
+
+        for group, cases in (("sync", ("sync-force", "sync-noop")), ("split", ("split",))):
+            if group not in groups:
+                continue
+            for size in sizes:
+                # Big fixtures are slow to build and each call is long; fewer runs suffice
+                runs = max(3, iterations // max(1, size // 1000))
+                for case in cases:
+                    name = f"{case}[{size}]"
+                    results[name] = bench_worker(case, size, runs, env, cwd)
+                    print_row(name, results[name])
+    return results
+
+
+def bench_dispatcher_worker(iterations, env, cwd):
+    """The dispatcher events again with its worker running (socket round-trip per call)."""
+    results = {}
+    socket_path = Path(env["CLAUDE_HOOKS_SOCKET"])
+    dispatcher = str(HOOKS_DIR / "hook_dispatcher.py")
+    server = subprocess.Popen([sys.executable, dispatcher, "serve"], env=env, cwd=cwd,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 5
+        while not socket_path.exists() and time.time() < deadline:
+            time.sleep(0.02)
+        if not socket_path.exists():
+            print("⚠️  hook_dispatcher.py serve did not start; skipping worker cases")
+            return results
+        for script, event in DISPATCHER_EVENTS.items():
+            name = f"worker:{event}"
+            results[name] = bench_command([sys.executable, dispatcher, event],
+                                          json.dumps(HOOK_CASES[script]).encode("utf-8"), iterations, env, cwd)
+            print_row(name, results[name])
+    finally:
+        server.terminate()
+        server.wait()
+    return results
+
+
+def print_header():
+    print(f"{'Case':<26} {'p50 (ms)':>10} {'p99 (ms)':>10} {'spawns':>7} {'RSS (MB)':>9} {'runs':>5}")
+
+
+def print_row(name, result, note=""):
+    spawns = "-" if result["spawns"] is None else result["spawns"]
+    rss = "-" if result["peak_rss_kb"] is None else f"{result['peak_rss_kb'] / 1024:.1f}"
+    print(f"{name:<26} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} {spawns:>7} {rss:>9} "
+          f"{result['runs']:>5}{note}")
+
+
+# ── baselines ────────────────────────────────────────────
+
+def save_baseline(results, path=BASELINE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"created": datetime.now().isoformat(timespec="seconds"), "host": platform.node(),
+            "python": platform.python_version(), "results": results}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def regressions(results, baseline):
+    """[(case, reason)] where results are worse than the baseline."""
+    found = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        allowed = max(before["p50_ms"] * (1 + LATENCY_TOLERANCE), before["p50_ms"] + LATENCY_FLOOR_MS)
+        if result["p50_ms"] > allowed:
+            found.append((name, f"p50 {before['p50_ms']:.2f} → {result['p50_ms']:.2f} ms"))
+        if None not in (result["spawns"], before.get("spawns")) and result["spawns"] > before["spawns"]:
+            found.append((name, f"spawns {before['spawns']} → {result['spawns']}"))
+        if None not in (result["peak_rss_kb"], before.get("peak_rss_kb")) \
+                and result["peak_rss_kb"] > before["peak_rss_kb"] * (1 + RSS_TOLERANCE):
+            found.append((name, f"RSS {before['peak_rss_kb'] / 1024:.1f} → {result['peak_rss_kb'] / 1024:.1f} MB"))
+    return found
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "_worker":
+        return worker(argv[1], int(argv[2]), int(argv[3]))
+
+    parser = argparse.ArgumentParser(description="Benchmark the framework's hot paths")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"Groups to run ({', '.join(GROUPS)})")
+    parser.add_argument("-n", "--iterations", type=int, default=DEFAULT_ITERATIONS, help="Runs per case")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Synthetic marketplace sizes for sync/split")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write results to {BASELINE_PATH}")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any case regressed vs. the baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file")
+    args = parser.parse_args(argv)
+
+    groups = [group.strip() for group in args.only.split(",") if group.strip()]
+    unknown = [group for group in groups if group not in GROUPS]
+    if unknown:
+        print(f"❌ Unknown group: {', '.join(unknown)} ({', '.join(GROUPS)})", file=sys.stderr)
+        return 2
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    print('⏱️  Framework Hot-Path Benchmarks')
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    print()
+    print_header()
+    try:
+        results = run_suite(groups, args.iterations, sizes)
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if fork_count() is None:
+        print("\nℹ️  Spawn counts need /proc/stat (Linux)")
+    print()
+
+    if args.check:
+        try:
+            baseline = json.loads(args.baseline.read_text())
+        except (OSError, ValueError):
+            print(f"❌ No baseline at {args.baseline} (run with --save-baseline first)", file=sys.stderr)
+            return 1
+        if baseline.get("host") != platform.node():
+            print(f"⚠️  Baseline was recorded on {baseline.get('host')}; timings may not be comparable")
+        found = regressions(results, baseline.get("results", {}))
+        if found:
+            print(f"❌ {len(found)} regression(s) vs. baseline from {baseline.get('created')}:")
+            for name, reason in found:
+                print(f"   • {name}: {reason}")
+            return 1
+        print(f"✅ No regressions vs. baseline from {baseline.get('created')}")
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            previous = json.loads(args.baseline.read_text()).get("results", {})
+            results = {**previous, **results}  # Keep cases that weren't re-run
+        save_baseline(results, args.baseline)
+        print(f"📝 Baseline saved to {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -51,10 +51,14 @@ fi
 # If no agents specified, try to read from plan
 if [ ${#AGENTS[@]} -eq 0 ]; then
     echo "No agents specified. Reading from sprint plan..."
-    # This would need to parse the plan.md file
-    # For now, default to common agents
-    AGENTS=("backend" "frontend" "integration" "testing")
-    print_warning "Using default agents: ${AGENTS[*]}"
+    if plan_agents=$(python3 "$(dirname "${BASH_SOURCE[0]}")/sprint_runner.py" "$SPRINT_NUMBER" --list-agents 2>/dev/null) \
+        && [ -n "$plan_agents" ]; then
+        read -r -a AGENTS <<< "$plan_agents"
+        print_success "Agents from plan: ${AGENTS[*]}"
+    else
+        AGENTS=("backend" "frontend" "integration" "testing")
+        print_warning "Could not read agents from plan.md, using default agents: ${AGENTS[*]}"
+    fi
 fi
 
 # Check worktrees exist
@@ -212,6 +216,10 @@ echo "2️⃣  Copy/paste commands from above (or from $INSTRUCTIONS_FILE)"
 echo ""
 echo "3️⃣  Agents work in parallel"
 echo ""
+echo "   Or run them unattended, scheduled by the plan's task dependencies:"
+echo "    python3 scripts/sprint_runner.py $SPRINT_NUMBER --dry-run   # critical path"
+echo "    python3 scripts/sprint_runner.py $SPRINT_NUMBER --max-parallel 4"
+echo ""
 echo "4️⃣  When all agents complete, integrate with:"
 echo "    ./scripts/integrate-sprint.sh $SPRINT_NUMBER"
 echo ""
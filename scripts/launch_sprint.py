@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Sprint launcher.
+
+Sets up .ai/sprints/sprint-N/ (plan, execution log, user testing stub,
+planning HMRP), updates the current-sprint markers and creates every
+agent's worktree and branch. Replaces the interactive steps of
+launch-sprint.sh, which now calls this script.
+
+- Non-interactive: --yes (or no TTY) never prompts; --commit and
+  --switch-main opt in to the pre-flight actions
+- Agents come from --agents, or from `agents:` in VARIABLES.yaml
+  (--team, default core_team without the CEO, who plans from main)
+- Worktrees are created together: one optional fetch, all missing branches
+  in a single `git update-ref --stdin` transaction, then concurrent
+  `git worktree add` (worktrees share the main object store)
+- Idempotent and resumable: existing files, branches and worktrees are
+  left alone, and finished steps are recorded in launch-state.json
+
+Usage:
+    python scripts/launch_sprint.py 7A "Camera Scanner Polish"
+    python scripts/launch_sprint.py 7A "Camera Scanner Polish" --yes --agents backend frontend
+    python scripts/launch_sprint.py 7A "Camera Scanner Polish" --yes --commit --switch-main --fetch
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "config"))
+
+DEFAULT_TEAM = "core_team"
+PLANNING_AGENTS = ("ceo",)  # Work from the main checkout, no worktree
+
+
+class LaunchError(Exception):
+    """A launch step failed."""
+
+
+# ── git helpers ──────────────────────────────────────────────
+
+def git(*args, cwd=None, check=True, input=None):
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, input=input)
+    if check and result.returncode != 0:
+        raise LaunchError(f"git {' '.join(args)}: {result.stderr.strip() or result.stdout.strip()}")
+    return result.stdout.strip()
+
+
+def existing_worktrees(project_dir):
+    """{path: branch} from one `git worktree list --porcelain`."""
+    worktrees, path = {}, None
+    for line in git("worktree", "list", "--porcelain", cwd=project_dir).splitlines():
+        if line.startswith("worktree "):
+            path = Path(line[len("worktree "):]).resolve()
+            worktrees[path] = None
+        elif line.startswith("branch ") and path:
+            worktrees[path] = line[len("branch refs/heads/"):]
+    return worktrees
+
+
+def existing_branches(project_dir):
+    return set(git("for-each-ref", "--format=%(refname:short)", "refs/heads", cwd=project_dir).splitlines())
+
+
+def worktree_path(project_dir, agent):
+    return project_dir.parent / f"{project_dir.name}-{agent}"
+
+
+def branch_name(sprint, agent):
+    return f"feature/sprint-{sprint}-{agent}"
+
+
+def ensure_worktrees(project_dir, sprint, agents, base="HEAD", fetch=False, jobs=None):
+    """Create every missing per-agent branch and worktree. Returns {agent: 'created'|'exists'}."""
+    project_dir = Path(project_dir).resolve()
+    if fetch:
+        remotes = git("remote", cwd=project_dir).split()
+        if remotes:
+            git("fetch", "--quiet", remotes[0], cwd=project_dir)
+
+    worktrees = existing_worktrees(project_dir)
+    branches = existing_branches(project_dir)
+    missing = [agent for agent in agents if worktree_path(project_dir, agent).resolve() not in worktrees]
+    status = {agent: "exists" for agent in agents if agent not in missing}
+    if not missing:
+        return status
+
+    for agent in missing:
+        path = worktree_path(project_dir, agent)
+        if path.exists() and any(path.iterdir()):
+            raise LaunchError(f"{path} exists but is not a worktree of {project_dir}")
+
+    # All new branches in one ref transaction
+    base_sha = git("rev-parse", "--verify", f"{base}^{{commit}}", cwd=project_dir)
+    new_branches = [branch_name(sprint, agent) for agent in missing if branch_name(sprint, agent) not in branches]
+    if new_branches:
+        transaction = "".join(f"create refs/heads/{branch} {base_sha}\n" for branch in new_branches)
+        git("update-ref", "--stdin", cwd=project_dir, input=transaction)
+
+    def add(agent):
+        git("worktree", "add", "--quiet", str(worktree_path(project_dir, agent)), branch_name(sprint, agent),
+            cwd=project_dir)
+        return agent
+
+    with ThreadPoolExecutor(max_workers=jobs or len(missing)) as pool:
+        for agent in pool.map(add, missing):
+            status[agent] = "created"
+    return status
+
+
+# ── sprint files ─────────────────────────────────────────────
+
+def now_text():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def sprint_files(sprint, name):
+    """{relative path: content} for the sprint documentation stubs."""
+    created = now_text()
+    return {
+        "plan.md": f"""# Sprint {sprint}: {name}
+*Created: {created}*
+
+## Sprint Goal
+[To be filled by CEO/Planning session]
+
+## Features
+1. [Feature 1]
+2. [Feature 2]
+3. [Feature 3]
+
+## Success Criteria
+- [ ] [Criterion 1]
+- [ ] [Criterion 2]
+- [ ] [Criterion 3]
+
+## Agent Assignments
+[To be determined during planning]
+
+## Time Estimate
+[To be determined during planning]
+""",
+        "execution-log.md": f"""# Sprint {sprint} Execution Log
+
+## Turn Tracking
+
+### Turn 1 - [Agent Name]
+**Time**: [timestamp]
+**Task**: [task description]
+**Status**: [in progress/completed/blocked]
+**Context**: [X%]
+""",
+        "user-testing.md": f"""# Sprint {sprint} User Testing
+
+## Test Environment
+- Date: [date]
+- Branch: main (post-merge)
+- Version: sprint-{sprint}
+
+## Features Tested
+[To be filled during user testing]
+
+## Bugs Found
+[To be filled during user testing]
+
+## Feedback
+[To be filled by user]
+""",
+        "HMRP_planning.md": HMRP_PLANNING.replace("[NUMBER]", sprint).replace("[NAME]", name),
+    }
+
+
+HMRP_PLANNING = """═══════════════════════════════════════════════════════════
+📋 SPRINT_PLANNING: Sprint [NUMBER] - [NAME]
+═══════════════════════════════════════════════════════════
+
+## 🎯 PURPOSE
+Plan and coordinate Sprint [NUMBER] with agent task assignments
+
+## 👤 FOR
+Creator
+
+## 🤖 TARGET
+CEO Agent
+
+## ⏱️ ESTIMATED TIME
+30-60 minutes
+
+## 🚦 PRIORITY
+🔴 CRITICAL - Required before sprint execution
+
+───────────────────────────────────────────────────────────
+## 📝 GLUE COMMAND
+───────────────────────────────────────────────────────────
+
+claude
+/role-ceo
+
+Read sprint context and previous feedback:
+@.ai/sprints/sprint-[NUMBER]/plan.md
+@.ai/current_task.md
+
+[Then provide your sprint goals]
+
+───────────────────────────────────────────────────────────
+## 🎮 EXECUTION STEPS
+───────────────────────────────────────────────────────────
+
+### Step 1: Start CEO Agent
+```bash
+claude
+/role-ceo
+```
+
+### Step 2: Provide Sprint Goals
+Paste this template:
+```
+Plan Sprint [NUMBER]: [Name]
+
+Goals:
+1. [Goal 1]
+2. [Goal 2]
+3. [Goal 3]
+
+Constraints:
+- Time: [X hours]
+- Priority: [features to focus on]
+
+Success criteria:
+- [Measurable outcome 1]
+- [Measurable outcome 2]
+```
+
+### Step 3: Review CEO's Task Breakdown
+CEO will provide:
+- Agent assignments
+- Time estimates
+- Dependencies
+- Deliverables
+
+### Step 4: Approve or Modify
+- ✅ Approve: "Launch sprint"
+- ❌ Modify: "Change [specific aspect]"
+
+───────────────────────────────────────────────────────────
+## 📊 EXPECTED OUTPUT
+───────────────────────────────────────────────────────────
+
+CEO provides:
+- Complete task breakdown
+- Agent assignments with XP estimates
+- Dependency map
+- Launch instructions
+
+───────────────────────────────────────────────────────────
+## ✅ COMPLETION CRITERIA
+───────────────────────────────────────────────────────────
+
+Planning complete when:
+- [ ] All tasks assigned to agents
+- [ ] Dependencies identified
+- [ ] Time estimates provided
+- [ ] Human approves plan
+- [ ] Ready to launch agents
+
+═══════════════════════════════════════════════════════════
+"""
+
+
+def write_if_missing(path, content):
+    """Create path with content unless it already exists. Returns True if written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(path, 'x') as f:
+            f.write(content)
+    except FileExistsError:
+        return False
+    return True
+
+
+def write_atomic(path, content):
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp.write_text(content)
+    os.replace(tmp, path)
+
+
+def team_agents(team=DEFAULT_TEAM, variables_path=None):
+    """Agent ids for a team in VARIABLES.yaml `agents:` (planning agents excluded)."""
+    try:
+        from variables import get
+    except ImportError:
+        return []
+    members = get(f"agents.{team}", [], variables_path) or []
+    return [m["id"] for m in members if isinstance(m, dict) and m.get("id") and m["id"] not in PLANNING_AGENTS]
+
+
+# ── launcher ─────────────────────────────────────────────────
+
+class SprintLauncher:
+    """Resumable sprint setup; completed steps are recorded in launch-state.json."""
+
+    def __init__(self, project_dir, sprint, name, agents, interactive=False):
+        self.project_dir = Path(project_dir).resolve()
+        self.sprint = sprint
+        self.name = name
+        self.agents = list(dict.fromkeys(agents))
+        self.interactive = interactive
+        self.sprint_dir = self.project_dir / ".ai" / "sprints" / f"sprint-{sprint}"
+        self.state_path = self.sprint_dir / "launch-state.json"
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            return json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {"sprint": self.sprint, "steps": {}}
+
+    def _done(self, step, detail=True):
+        self.state["steps"][step] = {"at": now_text(), "detail": detail}
+        self.sprint_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.state_path, json.dumps(self.state, indent=2))
+
+    def _confirm(self, question, default):
+        if not self.interactive:
+            return default
+        reply = input(f"{question} (y/n) ").strip().lower()
+        return reply.startswith("y")
+
+    # ── steps ────────────────────────────────────────────────
+
+    def preflight(self, commit=False, switch_main=False, main_branch="main"):
+        if git("status", "--porcelain", cwd=self.project_dir):
+            print("⚠️  Uncommitted changes detected")
+            if self._confirm("Commit changes before starting sprint?", commit):
+                git("add", ".", cwd=self.project_dir)
+                git("commit", "-m", f"Pre-sprint commit before Sprint {self.sprint}", cwd=self.project_dir)
+                print("✅ Changes committed")
+
+        current = git("branch", "--show-current", cwd=self.project_dir)
+        if current != main_branch:
+            print(f"⚠️  Not on {main_branch} branch (currently on: {current or 'detached HEAD'})")
+            if self._confirm(f"Switch to {main_branch}?", switch_main):
+                git("checkout", main_branch, cwd=self.project_dir)
+                print(f"✅ Switched to {main_branch}")
+        print("✅ Pre-flight checks complete")
+
+    def create_docs(self):
+        written = [
+            name for name, content in sprint_files(self.sprint, self.name).items()
+            if write_if_missing(self.sprint_dir / name, content)
+        ]
+        for name in written:
+            print(f"✅ Created {name}")
+        if not written:
+            print("ℹ️  Sprint documents already exist, left unchanged")
+        self._done("docs", written)
+
+    def update_markers(self):
+        ai_dir = self.project_dir / ".ai"
+        marker = ai_dir / "current_sprint.txt"
+        if marker.exists() and marker.read_text().strip() == self.sprint:
+            print("ℹ️  Sprint markers already point at this sprint")
+        else:
+            write_atomic(marker, f"{self.sprint}\n")
+            write_atomic(ai_dir / "current_sprint.md", f"""# Current Sprint: {self.sprint}
+*{self.name}*
+
+**Status**: Planning
+**Started**: {now_text()}
+
+## Quick Links
+- Plan: .ai/sprints/sprint-{self.sprint}/plan.md
+- Execution Log: .ai/sprints/sprint-{self.sprint}/execution-log.md
+- User Testing: .ai/sprints/sprint-{self.sprint}/user-testing.md
+""")
+            print("✅ Updated sprint markers")
+        self._done("markers")
+
+    def create_worktrees(self, base="HEAD", fetch=False, jobs=None):
+        status = ensure_worktrees(self.project_dir, self.sprint, self.agents, base, fetch, jobs)
+        for agent in self.agents:
+            icon = "✅ Created" if status[agent] == "created" else "ℹ️  Exists:"
+            print(f"{icon} {agent} → {worktree_path(self.project_dir, agent)} ({branch_name(self.sprint, agent)})")
+        self._done("worktrees", status)
+
+    def run(self, commit=False, switch_main=False, main_branch="main", base="HEAD", fetch=False, jobs=None):
+        steps = self.state["steps"]
+        if steps:
+            print(f"ℹ️  Resuming launch (done: {', '.join(steps)})")
+
+        self.sprint_dir.mkdir(parents=True, exist_ok=True)
+        if "preflight" not in steps:
+            self.preflight(commit, switch_main, main_branch)
+            self._done("preflight")
+        if "docs" not in steps:
+            self.create_docs()
+        if "markers" not in steps:
+            self.update_markers()
+        # Always re-checked: cheap, and agents may have been added
+        if self.agents:
+            self.create_worktrees(base, fetch, jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Set up a sprint and its agent worktrees")
+    parser.add_argument("sprint", help="Sprint number, e.g. 7A")
+    parser.add_argument("name", help="Sprint name")
+    parser.add_argument("--yes", "-y", action="store_true", help="Non-interactive: never prompt")
+    parser.add_argument("--commit", action="store_true", help="Commit uncommitted changes first")
+    parser.add_argument("--switch-main", action="store_true", help="Switch to the main branch first")
+    parser.add_argument("--main-branch", default="main")
+    parser.add_argument("--agents", nargs="+", help="Agent ids (default: VARIABLES.yaml agents.<team>)")
+    parser.add_argument("--team", default=DEFAULT_TEAM, help="VARIABLES.yaml agents group (default core_team)")
+    parser.add_argument("--no-worktrees", action="store_true", help="Only create sprint documents")
+    parser.add_argument("--base", default="HEAD", help="Start point for new agent branches")
+    parser.add_argument("--fetch", action="store_true", help="Fetch once before creating branches")
+    parser.add_argument("--jobs", type=int, help="Concurrent worktree creations")
+    args = parser.parse_args(argv)
+
+    agents = [] if args.no_worktrees else (args.agents or team_agents(args.team))
+    launcher = SprintLauncher(Path.cwd(), args.sprint, args.name, agents,
+                              interactive=not args.yes and sys.stdin.isatty())
+
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    print(f'🚀 Sprint {args.sprint} Launch: {args.name}')
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    try:
+        launcher.run(args.commit, args.switch_main, args.main_branch, args.base, args.fetch, args.jobs)
+    except LaunchError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        print("   Fix the problem and re-run the same command to resume.", file=sys.stderr)
+        return 1
+
+    sprint_dir = launcher.sprint_dir.relative_to(launcher.project_dir)
+    print()
+    print(f'✅ Sprint {args.sprint} initialized: {sprint_dir}')
+    print()
+    print('Next steps:')
+    print(f'  1. Review the planning HMRP: cat {sprint_dir}/HMRP_planning.md')
+    print('  2. Start planning session: claude, then /role-ceo')
+    print('  3. Provide sprint goals to CEO agent')
+    print(f'  4. After planning, launch agents with: ./scripts/execute-sprint.sh {args.sprint}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
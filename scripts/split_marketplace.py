@@ -16,44 +16,96 @@ Usage:
 """
 
 import json
-from pathlib import Path
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-# Define component types and their plugin mappings
-AGENT_PLUGINS = [
-    'backend-agent',
-    'frontend-agent',
-    'integration-agent',
-    'testing-agent',
-    'ceo-agent',
-    'documentation-agent',
-    'devops-agent',
-    'qa-automation-agent',
-    'ux-product-agent'
-]
-
-# Commands will be discovered from .claude/commands/
-COMMAND_PLUGINS = [
-    'sprint-commands',
-    'role-commands',
-    'supercharge-commands'
-]
-
-# Hooks will be discovered from config/hooks/
-HOOK_PLUGINS = [
-    'framework-hooks'
-]
-
-# MCP servers (future)
-MCP_PLUGINS = [
-    'playwright-mcp',
-    'github-mcp'
-]
-
-# Utility plugins (non-agent components)
-UTILITY_PLUGINS = [
-    'context-management'
-]
+# Component marketplaces, in output order. Each entry says where its plugins
+# come from: 'plugins' selects source marketplace entries by name, 'commands'
+# and 'hooks' are generated from discovered files, None is a placeholder.
+COMPONENTS = {
+    'agents': {
+        'file': 'agents-marketplace.json',
+        'name': 'ClaudeDevFramework-Agents',
+        'description': 'Specialized AI agent workers for parallel software development',
+        'component_type': 'agents',
+        'category': 'development',
+        'source': 'plugins',
+        'plugins': [
+            'backend-agent',
+            'frontend-agent',
+            'integration-agent',
+            'testing-agent',
+            'ceo-agent',
+            'documentation-agent',
+            'devops-agent',
+            'qa-automation-agent',
+            'ux-product-agent'
+        ],
+    },
+    'commands': {
+        'file': 'commands-marketplace.json',
+        'name': 'ClaudeDevFramework-Commands',
+        'description': 'Sprint management and workflow automation slash commands',
+        'component_type': 'commands',
+        'category': 'productivity',
+        'source': 'commands',  # Discovered from .claude/commands/
+        'plugins': [
+            'sprint-commands',
+            'role-commands',
+            'supercharge-commands'
+        ],
+    },
+    'hooks': {
+        'file': 'hooks-marketplace.json',
+        'name': 'ClaudeDevFramework-Hooks',
+        'description': 'Automated validation, testing, and workflow hooks',
+        'component_type': 'hooks',
+        'category': 'automation',
+        'source': 'hooks',  # Discovered from config/hooks/
+        'plugins': [
+            'framework-hooks'
+        ],
+    },
+    'mcp': {
+        'file': 'mcp-marketplace.json',
+        'name': 'ClaudeDevFramework-MCP',
+        'description': 'Model Context Protocol servers for external tool integration',
+        'component_type': 'mcpServers',
+        'category': 'integration',
+        'source': None,  # Future MCP servers
+        'plugins': [
+            'playwright-mcp',
+            'github-mcp'
+        ],
+    },
+    'utilities': {
+        'file': 'utilities-marketplace.json',
+        'name': 'ClaudeDevFramework-Utilities',
+        'description': 'Development utilities and helper plugins for enhanced productivity',
+        'component_type': 'utilities',
+        'category': 'utilities',
+        'source': 'plugins',
+        'plugins': [
+            'context-management'
+        ],
+        'write': False,  # Not split out yet
+    },
+}
+
+# Files discovered per kind: (directory relative to repo root, suffix). Non-recursive.
+DISCOVERY = {
+    'commands': ('.claude/commands', '.md'),
+    'hooks': ('config/hooks', '.sh'),
+}
+
+# Hook wiring for the generated framework-hooks plugin
+FRAMEWORK_HOOKS = {
+    'SessionStart': [('*', './config/hooks/session-start.sh')],
+    'SessionEnd': [('*', './config/hooks/session-end.sh')],
+    'PostToolUse': [('Bash(git commit:*)', './config/hooks/safety-check.sh')],
+}
 
 
 def read_marketplace(path: Path) -> dict:
@@ -80,200 +132,152 @@ def convert_to_relative_path(absolute_path: str, base_dir: Path) -> str:
     return absolute_path
 
 
-def create_agents_marketplace(source_marketplace: dict, base_dir: Path) -> dict:
-    """Create the agents-marketplace.json file."""
-    # Filter agent plugins
-    agent_plugins = [
-        p for p in source_marketplace['plugins']
-        if p['name'] in AGENT_PLUGINS
-    ]
-
-    # Convert absolute paths to relative
-    for plugin in agent_plugins:
-        if 'source' in plugin and isinstance(plugin['source'], dict) and 'path' in plugin['source']:
-            plugin['source']['path'] = convert_to_relative_path(
-                plugin['source']['path'], base_dir
-            )
-
-    return {
-        'name': 'ClaudeDevFramework-Agents',
-        'version': source_marketplace['version'],
-        'owner': source_marketplace['owner'],
-        'description': 'Specialized AI agent workers for parallel software development',
-        'plugins': agent_plugins,
-        'metadata': {
-            **source_marketplace.get('metadata', {}),
-            'component_type': 'agents',
-            'category': 'development'
-        }
+def index_plugins(source_marketplace: dict) -> dict:
+    """Group source plugins by component key in one pass (source order preserved)."""
+    component_of = {
+        name: key
+        for key, component in COMPONENTS.items()
+        if component['source'] == 'plugins'
+        for name in component['plugins']
     }
-
-
-def create_commands_marketplace(source_marketplace: dict, base_dir: Path) -> dict:
-    """Create the commands-marketplace.json file."""
-    # Create command plugins from .claude/commands/ directory
-    commands_dir = base_dir / '.claude' / 'commands'
-
-    command_plugins = []
-
-    if commands_dir.exists():
-        # Group commands into logical plugins
-        command_files = list(commands_dir.glob('*.md'))
-
-        # Group by prefix
-        groups = {}
-        for cmd_file in command_files:
-            name = cmd_file.stem
-            prefix = name.split('-')[0] if '-' in name else 'misc'
-            if prefix not in groups:
-                groups[prefix] = []
-            groups[prefix].append(name)
-
-        # Create plugin entries
-        for group_name, commands in groups.items():
-            plugin = {
-                'name': f'{group_name}-commands',
-                'source': {
-                    'source': 'file',
-                    'path': f'./plugins/{group_name}-commands'
-                },
-                'description': f'{group_name.title()} workflow commands',
-                'category': 'productivity',
-                'commands': [f'./.claude/commands/{cmd}.md' for cmd in commands],
-                'version': source_marketplace['version']
-            }
-            command_plugins.append(plugin)
-
-    return {
-        'name': 'ClaudeDevFramework-Commands',
-        'version': source_marketplace['version'],
-        'owner': source_marketplace['owner'],
-        'description': 'Sprint management and workflow automation slash commands',
-        'plugins': command_plugins,
-        'metadata': {
-            **source_marketplace.get('metadata', {}),
-            'component_type': 'commands',
-            'category': 'productivity'
+    index = {key: [] for key in COMPONENTS}
+    for plugin in source_marketplace['plugins']:
+        key = component_of.get(plugin['name'])
+        if key:
+            index[key].append(plugin)
+    return index
+
+
+def discover_files(base_dir: Path) -> dict:
+    """Find component files for every DISCOVERY kind with a single walk of base_dir."""
+    roots = {root: (kind, suffix) for kind, (root, suffix) in DISCOVERY.items()}
+    found = {kind: [] for kind in DISCOVERY}
+
+    for dirpath, dirnames, filenames in os.walk(base_dir):
+        rel = Path(dirpath).relative_to(base_dir).as_posix()
+        rel = '' if rel == '.' else rel
+        if rel in roots:
+            kind, suffix = roots[rel]
+            found[kind].extend(Path(dirpath) / f for f in sorted(filenames) if f.endswith(suffix))
+        # Only descend towards discovery roots
+        dirnames[:] = [
+            d for d in dirnames
+            if any(root == f'{rel}/{d}'.lstrip('/') or root.startswith(f'{rel}/{d}/'.lstrip('/'))
+                   for root in roots)
+        ]
+    return found
+
+
+def relocated(plugin: dict, base_dir: Path) -> dict:
+    """Copy of a source plugin with an absolute source path made relative."""
+    plugin = dict(plugin)
+    source = plugin.get('source')
+    if isinstance(source, dict) and 'path' in source:
+        plugin['source'] = {**source, 'path': convert_to_relative_path(source['path'], base_dir)}
+    return plugin
+
+
+def command_plugins(command_files: list, version: str) -> list:
+    """Group command files by name prefix into one plugin per group."""
+    groups = {}
+    for cmd_file in command_files:
+        name = cmd_file.stem
+        prefix = name.split('-')[0] if '-' in name else 'misc'
+        groups.setdefault(prefix, []).append(name)
+
+    return [
+        {
+            'name': f'{group_name}-commands',
+            'source': {
+                'source': 'file',
+                'path': f'./plugins/{group_name}-commands'
+            },
+            'description': f'{group_name.title()} workflow commands',
+            'category': 'productivity',
+            'commands': [f'./.claude/commands/{cmd}.md' for cmd in commands],
+            'version': version
         }
-    }
-
+        for group_name, commands in groups.items()
+    ]
 
-def create_hooks_marketplace(source_marketplace: dict, base_dir: Path) -> dict:
-    """Create the hooks-marketplace.json file."""
-    hooks_dir = base_dir / 'config' / 'hooks'
-
-    hook_plugins = []
-
-    if hooks_dir.exists():
-        hook_scripts = list(hooks_dir.glob('*.sh'))
-
-        # Create a single hooks plugin with all scripts
-        if hook_scripts:
-            plugin = {
-                'name': 'framework-hooks',
-                'source': {
-                    'source': 'file',
-                    'path': './plugins/framework-hooks'
-                },
-                'description': 'Automated validation, testing, and workflow hooks',
-                'category': 'automation',
-                'hooks': {
-                    'SessionStart': [
-                        {
-                            'matcher': '*',
-                            'hooks': [
-                                {'type': 'command', 'command': './config/hooks/session-start.sh'}
-                            ]
-                        }
-                    ],
-                    'SessionEnd': [
-                        {
-                            'matcher': '*',
-                            'hooks': [
-                                {'type': 'command', 'command': './config/hooks/session-end.sh'}
-                            ]
-                        }
-                    ],
-                    'PostToolUse': [
-                        {
-                            'matcher': 'Bash(git commit:*)',
-                            'hooks': [
-                                {'type': 'command', 'command': './config/hooks/safety-check.sh'}
-                            ]
-                        }
-                    ]
-                },
-                'version': source_marketplace['version']
-            }
-            hook_plugins.append(plugin)
 
-    return {
-        'name': 'ClaudeDevFramework-Hooks',
-        'version': source_marketplace['version'],
-        'owner': source_marketplace['owner'],
+def hook_plugins(hook_scripts: list, version: str) -> list:
+    """A single framework-hooks plugin when any hook scripts exist."""
+    if not hook_scripts:
+        return []
+    return [{
+        'name': 'framework-hooks',
+        'source': {
+            'source': 'file',
+            'path': './plugins/framework-hooks'
+        },
         'description': 'Automated validation, testing, and workflow hooks',
-        'plugins': hook_plugins,
-        'metadata': {
-            **source_marketplace.get('metadata', {}),
-            'component_type': 'hooks',
-            'category': 'automation'
+        'category': 'automation',
+        'hooks': {
+            event: [
+                {'matcher': matcher, 'hooks': [{'type': 'command', 'command': command}]}
+                for matcher, command in entries
+            ]
+            for event, entries in FRAMEWORK_HOOKS.items()
+        },
+        'version': version
+    }]
+
+
+def build_marketplaces(source_marketplace: dict, base_dir: Path) -> dict:
+    """Build every component marketplace without mutating source_marketplace."""
+    version = source_marketplace['version']
+    by_component = index_plugins(source_marketplace)
+    files = discover_files(base_dir)
+
+    marketplaces = {}
+    for key, component in COMPONENTS.items():
+        source = component['source']
+        if source == 'plugins':
+            plugins = [relocated(p, base_dir) for p in by_component[key]]
+        elif source == 'commands':
+            plugins = command_plugins(files['commands'], version)
+        elif source == 'hooks':
+            plugins = hook_plugins(files['hooks'], version)
+        else:
+            plugins = []
+
+        marketplaces[key] = {
+            'name': component['name'],
+            'version': version,
+            'owner': source_marketplace['owner'],
+            'description': component['description'],
+            'plugins': plugins,
+            'metadata': {
+                **source_marketplace.get('metadata', {}),
+                'component_type': component['component_type'],
+                'category': component['category']
+            }
         }
-    }
-
+    return marketplaces
 
-def create_mcp_marketplace(source_marketplace: dict, base_dir: Path) -> dict:
-    """Create the mcp-marketplace.json file."""
-    # For now, create an empty marketplace for future MCP servers
-    mcp_plugins = []
 
-    return {
-        'name': 'ClaudeDevFramework-MCP',
-        'version': source_marketplace['version'],
-        'owner': source_marketplace['owner'],
-        'description': 'Model Context Protocol servers for external tool integration',
-        'plugins': mcp_plugins,
-        'metadata': {
-            **source_marketplace.get('metadata', {}),
-            'component_type': 'mcpServers',
-            'category': 'integration'
-        }
-    }
+def write_marketplace(marketplace: dict, output_path: Path):
+    """Write marketplace to JSON file with pretty formatting (atomic rename)."""
+    tmp = output_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(marketplace, f, indent=2)
+    os.replace(tmp, output_path)
+    return output_path, len(marketplace['plugins'])
 
 
-def create_utilities_marketplace(source_marketplace: dict, base_dir: Path) -> dict:
-    """Create the utilities-marketplace.json file."""
-    # Filter utility plugins (non-agent, non-command plugins)
-    utility_plugins = [
-        p for p in source_marketplace['plugins']
-        if p['name'] in UTILITY_PLUGINS
+def write_marketplaces(marketplaces: dict, marketplace_dir: Path) -> list:
+    """Write all enabled component marketplaces concurrently."""
+    jobs = [
+        (marketplaces[key], marketplace_dir / component['file'])
+        for key, component in COMPONENTS.items()
+        if component.get('write', True)
     ]
-
-    # Convert absolute paths to relative
-    for plugin in utility_plugins:
-        if 'source' in plugin and isinstance(plugin['source'], dict) and 'path' in plugin['source']:
-            plugin['source']['path'] = convert_to_relative_path(
-                plugin['source']['path'], base_dir
-            )
-
-    return {
-        'name': 'ClaudeDevFramework-Utilities',
-        'version': source_marketplace['version'],
-        'owner': source_marketplace['owner'],
-        'description': 'Development utilities and helper plugins for enhanced productivity',
-        'plugins': utility_plugins,
-        'metadata': {
-            **source_marketplace.get('metadata', {}),
-            'component_type': 'utilities',
-            'category': 'utilities'
-        }
-    }
-
-
-def write_marketplace(marketplace: dict, output_path: Path):
-    """Write marketplace to JSON file with pretty formatting."""
-    with open(output_path, 'w') as f:
-        json.dump(marketplace, f, indent=2)
-    print(f'✅ Created {output_path} with {len(marketplace["plugins"])} plugins')
+    with ThreadPoolExecutor(max_workers=len(jobs) or 1) as pool:
+        written = list(pool.map(lambda job: write_marketplace(*job), jobs))
+    for output_path, count in written:
+        print(f'✅ Created {output_path} with {count} plugins')
+    return written
 
 
 def main():
@@ -304,17 +308,8 @@ def main():
     print('🏗️  Creating component-based marketplaces...')
     print()
 
-    agents_marketplace = create_agents_marketplace(source_marketplace, base_dir)
-    write_marketplace(agents_marketplace, marketplace_dir / 'agents-marketplace.json')
-
-    commands_marketplace = create_commands_marketplace(source_marketplace, base_dir)
-    write_marketplace(commands_marketplace, marketplace_dir / 'commands-marketplace.json')
-
-    hooks_marketplace = create_hooks_marketplace(source_marketplace, base_dir)
-    write_marketplace(hooks_marketplace, marketplace_dir / 'hooks-marketplace.json')
-
-    mcp_marketplace = create_mcp_marketplace(source_marketplace, base_dir)
-    write_marketplace(mcp_marketplace, marketplace_dir / 'mcp-marketplace.json')
+    marketplaces = build_marketplaces(source_marketplace, base_dir)
+    write_marketplaces(marketplaces, marketplace_dir)
 
     print()
     print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
@@ -322,10 +317,9 @@ def main():
     print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
     print()
     print('Created marketplaces:')
-    print('  • agents-marketplace.json (agents component)')
-    print('  • commands-marketplace.json (commands component)')
-    print('  • hooks-marketplace.json (hooks component)')
-    print('  • mcp-marketplace.json (mcpServers component)')
+    for component in COMPONENTS.values():
+        if component.get('write', True):
+            print(f"  • {component['file']} ({component['component_type']} component)")
     print()
     print('📝 Note: Original marketplace.json preserved for backward compatibility')
     print()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware sprint runner.
+
+Parses .ai/sprints/sprint-N/plan.md into a task DAG and launches each task's
+agent in its worktree as soon as the task's dependencies have finished, so
+sprint wall time follows the critical path rather than a list order.
+
+Two plan layouts are understood:
+- Task blocks (skills/sprint-planning):
+      ### TASK-001: Build ISBN endpoint
+      **Owner:** Backend
+      **Estimate:** 2 hours
+      **Dependencies:** None            (or TASK-002, TASK-003)
+- Agent sections under "## Agent Assignments" (CEO planning template):
+      ### Frontend Agent
+      **Dependencies**: Backend API endpoints
+      **Time Estimate**: 3 hours
+  Here each agent is one task and dependencies are the agents mentioned.
+
+Agents run concurrently up to --max-parallel, one session per worktree at a
+time (../<project>-<agent>, branch feature/sprint-N-<agent>).
+
+With --route each task gets a model from config/model_router.py: the
+cheapest model covering its complexity and context within this week's quota
+(optional **Complexity:** 1-10/low/high and **Context:** 120k fields; else
+inferred from title and estimate). The model id is passed to the command as
+{model} (default command: claude --model {model} -p {prompt}) and each task's
+wall time is recorded against that model's weekly quota.
+
+Usage:
+    python scripts/sprint_runner.py 7A --dry-run          # Waves + critical path, launch nothing
+    python scripts/sprint_runner.py 7A --max-parallel 3   # Run the sprint
+    python scripts/sprint_runner.py 7A --command 'claude -p {prompt}'
+    python scripts/sprint_runner.py 7A --list-agents      # Agents named in the plan
+    python scripts/sprint_runner.py 7A --route --dry-run  # Show the model picked per task
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import shlex
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "config"))
+
+from launch_sprint import LaunchError, ensure_worktrees as create_worktrees
+from model_router import ModelRouter, parse_complexity, parse_tokens
+
+DEFAULT_COMMAND = "claude -p {prompt}"
+ROUTED_COMMAND = "claude --model {model} -p {prompt}"
+DEFAULT_PROMPT = "/role-{agent}\n\nSprint {sprint} {task}: {title}\n\nRead the sprint plan at {plan} and complete this task."
+DEFAULT_ESTIMATE_HOURS = 1.0
+
+TASK_HEADING_RE = re.compile(r"^###\s+(TASK-\d+)\s*:?\s*(.*)$", re.IGNORECASE)
+AGENT_HEADING_RE = re.compile(r"^###\s+(.+?)\s+Agent\s*$", re.IGNORECASE)
+FIELD_RE = re.compile(r"^\*\*([A-Za-z ]+?):?\*\*:?\s*(.*)$")
+TASK_REF_RE = re.compile(r"TASK-\d+", re.IGNORECASE)
+HOURS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(h|hour|hours|hr|hrs|m|min|mins|minutes)?\b", re.IGNORECASE)
+
+
+class PlanError(Exception):
+    """The sprint plan cannot be turned into a runnable DAG."""
+
+
+class Task:
+    """One schedulable unit: an agent doing some work in its worktree."""
+
+    __slots__ = ("id", "title", "agent", "estimate", "deps", "complexity", "context", "route")
+
+    def __init__(self, task_id, title, agent, estimate=DEFAULT_ESTIMATE_HOURS, deps=(),
+                 complexity=None, context=None):
+        self.id = task_id
+        self.title = title
+        self.agent = agent
+        self.estimate = estimate
+        self.deps = list(deps)
+        self.complexity = complexity
+        self.context = context
+        self.route = None  # model_router.Route when --route
+
+
+# ── Plan parsing ─────────────────────────────────────────────
+
+def agent_id(name):
+    """'QA Automation Agent' / 'Backend' -> 'qa-automation' / 'backend'."""
+    name = re.sub(r"\bagent\b", "", name, flags=re.IGNORECASE)
+    return "-".join(name.lower().split())
+
+
+def parse_hours(text):
+    match = HOURS_RE.search(text or "")
+    if not match:
+        return DEFAULT_ESTIMATE_HOURS
+    value = float(match.group(1))
+    unit = (match.group(2) or "h").lower()
+    return value / 60 if unit.startswith("m") else value
+
+
+def _sections(lines, heading_re):
+    """Yield (heading match, {field: value}) for each matching ### section."""
+    current, fields = None, {}
+    for line in lines:
+        line = line.strip()
+        if line.startswith("#"):
+            if current:
+                yield current, fields
+            current, fields = heading_re.match(line), {}
+            if line.startswith("## "):
+                current = None
+            continue
+        field = FIELD_RE.match(line)
+        if current and field:
+            fields[field.group(1).strip().lower()] = field.group(2).strip()
+    if current:
+        yield current, fields
+
+
+def parse_plan(plan_path):
+    """Return {task_id: Task} from a sprint plan.md."""
+    lines = Path(plan_path).read_text().splitlines()
+
+    tasks = {}
+    for heading, fields in _sections(lines, TASK_HEADING_RE):
+        task_id = heading.group(1).upper()
+        owner = fields.get("owner") or fields.get("agent") or ""
+        if not owner:
+            raise PlanError(f"{task_id} has no **Owner:**")
+        tasks[task_id] = Task(
+            task_id,
+            heading.group(2).strip() or task_id,
+            agent_id(owner),
+            parse_hours(fields.get("estimate") or fields.get("time estimate")),
+            [ref.upper() for ref in TASK_REF_RE.findall(fields.get("dependencies", ""))],
+            parse_complexity(fields.get("complexity")),
+            parse_tokens(fields.get("context")),
+        )
+    if tasks:
+        return tasks
+
+    # Agent-per-section layout: dependencies are the other agents mentioned
+    sections = [(agent_id(h.group(1)), f) for h, f in _sections(lines, AGENT_HEADING_RE)]
+    agents = [agent for agent, _ in sections]
+    for agent, fields in sections:
+        deps_text = fields.get("dependencies", "").lower()
+        deps = [other for other in agents
+                if other != agent and re.search(rf"\b{re.escape(other.replace('-', ' '))}\b",
+                                                deps_text.replace("-", " "))]
+        tasks[agent] = Task(
+            agent,
+            fields.get("focus") or f"{agent} tasks",
+            agent,
+            parse_hours(fields.get("time estimate") or fields.get("time")),
+            deps,
+            parse_complexity(fields.get("complexity")),
+            parse_tokens(fields.get("context")),
+        )
+    if not tasks:
+        raise PlanError(f"No TASK-nnn blocks or '### <Name> Agent' sections found in {plan_path}")
+    return tasks
+
+
+# ── DAG analysis ─────────────────────────────────────────────
+
+def topological_waves(tasks):
+    """Group task ids into waves that can run together; raises PlanError on bad deps or cycles."""
+    for task in tasks.values():
+        unknown = [dep for dep in task.deps if dep not in tasks]
+        if unknown:
+            raise PlanError(f"{task.id} depends on unknown task(s): {', '.join(unknown)}")
+
+    remaining = {task_id: set(task.deps) for task_id, task in tasks.items()}
+    waves = []
+    while remaining:
+        ready = sorted(task_id for task_id, deps in remaining.items() if not deps)
+        if not ready:
+            raise PlanError(f"Dependency cycle among: {', '.join(sorted(remaining))}")
+        waves.append(ready)
+        for task_id in ready:
+            del remaining[task_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return waves
+
+
+def critical_path(tasks):
+    """Longest estimate-weighted dependency chain: ([task ids], hours)."""
+    finish, via = {}, {}
+    for wave in topological_waves(tasks):
+        for task_id in wave:
+            task = tasks[task_id]
+            before = max(task.deps, key=lambda dep: finish[dep], default=None)
+            finish[task_id] = (finish[before] if before else 0) + task.estimate
+            via[task_id] = before
+    if not finish:
+        return [], 0.0
+
+    end = max(finish, key=finish.get)
+    path = [end]
+    while via[path[-1]]:
+        path.append(via[path[-1]])
+    return path[::-1], finish[end]
+
+
+# ── Execution ────────────────────────────────────────────────
+
+def worktree_path(project_dir, agent):
+    return project_dir.parent / f"{project_dir.name}-{agent}"
+
+
+def ensure_worktrees(project_dir, sprint, agents):
+    """Create missing per-agent worktrees (batched, see launch_sprint.py)."""
+    for agent, status in create_worktrees(project_dir, sprint, list(agents)).items():
+        if status == "created":
+            print(f"✅ Created worktree for {agent}: {worktree_path(project_dir, agent)}")
+
+
+def route_tasks(tasks, router):
+    """Assign a model to every task, reserving quota as it goes (critical path first)."""
+    path, _ = critical_path(tasks)
+    for task_id in path + [t for t in tasks if t not in path]:
+        task = tasks[task_id]
+        task.route = router.route(task.complexity, task.context, task.estimate, task.title, reserve=True)
+
+
+def build_argv(command, task, sprint, plan_path, worktree):
+    values = {"agent": task.agent, "task": task.id, "title": task.title, "sprint": sprint,
+              "plan": str(plan_path), "worktree": str(worktree),
+              "model": task.route.model_id if task.route else ""}
+    values["prompt"] = DEFAULT_PROMPT.format(**values)
+    return [arg.format(**values) for arg in shlex.split(command)]
+
+
+async def run_sprint(tasks, sprint, plan_path, project_dir, command=DEFAULT_COMMAND,
+                     max_parallel=4, log_dir=None, router=None):
+    """Launch every task once its dependencies succeed. Returns {task_id: result dict}."""
+    topological_waves(tasks)  # Validate before launching anything
+    limit = asyncio.Semaphore(max_parallel)
+    worktree_locks = defaultdict(asyncio.Lock)  # One agent session per worktree
+    finished = {task_id: asyncio.Event() for task_id in tasks}
+    results = {}
+    sprint_start = time.monotonic()
+
+    async def run_task(task):
+        for dep in task.deps:
+            await finished[dep].wait()
+        failed = [dep for dep in task.deps if results[dep]["status"] != "ok"]
+        if failed:
+            results[task.id] = {"status": "skipped", "agent": task.agent, "estimate_hours": task.estimate,
+                                "reason": f"dependency failed: {', '.join(failed)}"}
+            finished[task.id].set()
+            return
+
+        worktree = worktree_path(project_dir, task.agent)
+        argv = build_argv(command, task, sprint, plan_path, worktree)
+        log_path = (log_dir / f"{task.id}.log") if log_dir else None
+        async with worktree_locks[task.agent], limit:
+            started = time.monotonic()
+            print(f"▶️  {task.id} ({task.agent}) started at +{started - sprint_start:.0f}s")
+            try:
+                with open(log_path, 'wb') if log_path else open("/dev/null", 'wb') as log:
+                    proc = await asyncio.create_subprocess_exec(
+                        *argv, cwd=worktree, stdin=asyncio.subprocess.DEVNULL,
+                        stdout=log, stderr=asyncio.subprocess.STDOUT)
+                    returncode = await proc.wait()
+            except OSError as e:
+                returncode, error = None, str(e)
+            else:
+                error = None
+            elapsed = time.monotonic() - started
+
+        ok = returncode == 0
+        if router and task.route:
+            # Blocking flock + file write: keep it off the event loop
+            await asyncio.to_thread(router.record, task.route.key, elapsed / 3600, reserved=task.estimate)
+        results[task.id] = {
+            "status": "ok" if ok else "failed",
+            "agent": task.agent,
+            "estimate_hours": task.estimate,
+            **({"model": task.route.key} if task.route else {}),
+            "returncode": returncode,
+            "started_offset_seconds": round(started - sprint_start, 2),
+            "wall_seconds": round(elapsed, 2),
+            "log": str(log_path) if log_path else None,
+            **({"error": error} if error else {}),
+        }
+        print(f"{'✅' if ok else '❌'} {task.id} ({task.agent}) {'finished' if ok else 'failed'} "
+              f"in {elapsed:.1f}s")
+        finished[task.id].set()
+
+    await asyncio.gather(*(run_task(task) for task in tasks.values()))
+    return results
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+def print_dry_run(tasks):
+    print("Execution waves (tasks in a wave run in parallel):")
+    for number, wave in enumerate(topological_waves(tasks), 1):
+        print(f"  Wave {number}: " + ", ".join(f"{t} [{tasks[t].agent}, {tasks[t].estimate:g}h]" for t in wave))
+    if any(task.route for task in tasks.values()):
+        print()
+        print("Models:")
+        for task in tasks.values():
+            print(f"  {'⚠️ ' if task.route.fallback else '  '}{task.id:<12} {task.route.key:<18} {task.route.reason}")
+    path, hours = critical_path(tasks)
+    serial = sum(task.estimate for task in tasks.values())
+    print()
+    print(f"Critical path ({hours:g}h): " + " → ".join(path))
+    print(f"Serial estimate: {serial:g}h")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a sprint plan as a dependency DAG across agent worktrees")
+    parser.add_argument("sprint", help="Sprint number, e.g. 7A")
+    parser.add_argument("--plan", type=Path, help="Plan file (default .ai/sprints/sprint-N/plan.md)")
+    parser.add_argument("--dry-run", action="store_true", help="Print waves and the critical path only")
+    parser.add_argument("--list-agents", action="store_true", help="Print the agents named in the plan")
+    parser.add_argument("--max-parallel", type=int, default=4, help="Concurrent agent sessions (default 4)")
+    parser.add_argument("--command",
+                        help="Launch command; {prompt} {agent} {task} {title} {sprint} {plan} {worktree} {model}")
+    parser.add_argument("--route", action="store_true",
+                        help="Pick a model per task (config/model_router.py) and track weekly quota")
+    args = parser.parse_args(argv)
+
+    project_dir = Path.cwd()
+    sprint_dir = project_dir / ".ai" / "sprints" / f"sprint-{args.sprint}"
+    plan_path = (args.plan or sprint_dir / "plan.md").resolve()
+
+    try:
+        tasks = parse_plan(plan_path)
+        if args.list_agents:
+            print(" ".join(dict.fromkeys(task.agent for task in tasks.values())))
+            return 0
+        topological_waves(tasks)
+        router = ModelRouter() if args.route else None
+        if router:
+            route_tasks(tasks, router)
+        if args.dry_run:
+            print_dry_run(tasks)
+            return 0
+    except FileNotFoundError:
+        print(f"❌ Error: {plan_path} not found", file=sys.stderr)
+        return 1
+    except (PlanError, ValueError) as e:  # ValueError: --route without models: in VARIABLES.yaml
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    print(f'🚀 Running Sprint {args.sprint}: {len(tasks)} tasks, up to {args.max_parallel} in parallel')
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+
+    try:
+        ensure_worktrees(project_dir, args.sprint, dict.fromkeys(task.agent for task in tasks.values()))
+    except LaunchError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    log_dir = sprint_dir / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.monotonic()
+    command = args.command or (ROUTED_COMMAND if router else DEFAULT_COMMAND)
+    results = asyncio.run(run_sprint(tasks, args.sprint, plan_path, project_dir,
+                                     command, args.max_parallel, log_dir, router))
+    wall = time.monotonic() - started
+
+    print()
+    print(f"{'Task':<12} {'Agent':<16} {'Status':<8} {'Wall':>8}")
+    for task_id, task in tasks.items():
+        result = results[task_id]
+        wall_text = f"{result['wall_seconds']:.1f}s" if "wall_seconds" in result else "-"
+        print(f"{task_id:<12} {task.agent:<16} {result['status']:<8} {wall_text:>8}")
+    print(f"\nSprint wall time: {wall:.1f}s")
+
+    results_path = sprint_dir / "run-results.json"
+    results_path.write_text(json.dumps({"sprint": args.sprint, "wall_seconds": round(wall, 2),
+                                        "tasks": results}, indent=2))
+    print(f"📝 Results saved to {results_path}")
+    return 0 if all(r["status"] == "ok" for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,52 +11,9 @@ cd "$REPO_DIR"
 
 echo "🔍 Validating marketplace.json schema..."
 
-# Check if file exists
-if [ ! -f "$MARKETPLACE_FILE" ]; then
-    echo "❌ Error: $MARKETPLACE_FILE not found"
-    exit 1
-fi
-
-# Validate JSON syntax
-if ! jq empty "$MARKETPLACE_FILE" 2>/dev/null; then
-    echo "❌ Error: Invalid JSON syntax in $MARKETPLACE_FILE"
-    exit 1
-fi
-
-# Validate required fields
-echo "  Checking required fields..."
-REQUIRED_FIELDS=("name" "version" "owner" "plugins")
-for field in "${REQUIRED_FIELDS[@]}"; do
-    if ! jq -e ".$field" "$MARKETPLACE_FILE" > /dev/null 2>&1; then
-        echo "❌ Error: Missing required field: $field"
-        exit 1
-    fi
-done
-
-# Check for invalid 'requires' fields in plugins
-echo "  Checking for invalid 'requires' fields..."
-if jq -e '.plugins[] | select(.requires != null)' "$MARKETPLACE_FILE" > /dev/null 2>&1; then
-    echo "❌ Error: Found 'requires' fields in plugins (not supported by Claude Code schema)"
-    echo "  Plugins with 'requires' field:"
-    jq -r '.plugins[] | select(.requires != null) | "  - \(.name)"' "$MARKETPLACE_FILE"
-    exit 1
-fi
-
-# Validate command paths (must start with ./ and end with .md)
-echo "  Checking command paths..."
-INVALID_COMMANDS=$(jq -r '.plugins[] | select(.commands != null) | .commands[] | select(startswith("./") | not or endswith(".md") | not)' "$MARKETPLACE_FILE" 2>/dev/null || true)
-if [ -n "$INVALID_COMMANDS" ]; then
-    echo "❌ Error: Invalid command paths found (must start with './' and end with '.md'):"
-    echo "$INVALID_COMMANDS" | sed 's/^/  - /'
-    exit 1
-fi
-
-# Validate agent paths (must start with ./ and end with .md)
-echo "  Checking agent paths..."
-INVALID_AGENTS=$(jq -r '.plugins[] | select(.agents != null) | .agents[] | select(startswith("./") | not or endswith(".md") | not)' "$MARKETPLACE_FILE" 2>/dev/null || true)
-if [ -n "$INVALID_AGENTS" ]; then
-    echo "❌ Error: Invalid agent paths found (must start with './' and end with '.md'):"
-    echo "$INVALID_AGENTS" | sed 's/^/  - /'
+# Single pass over marketplace.json: syntax, required fields, 'requires', command/agent paths
+if ! output=$(python3 .ai/scripts/validate_plugin_manifests.py --no-manifests --marketplace "$MARKETPLACE_FILE" 2>&1); then
+    echo "$output" | grep -E '❌ ERROR' | sed 's/^ *❌ ERROR: /❌ Error: /'
     exit 1
 fi
 
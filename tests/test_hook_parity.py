@@ -0,0 +1,108 @@
+"""
+Hook Parity Tests
+hook_dispatcher.py must do what the shell hooks do.
+
+Every shell hook carries a "Python equivalent: hook_dispatcher.py <Event>
+(keep both in sync)" line; this is what keeps them in sync. Each case runs
+the shell hook and the dispatcher event with the same payload, each in its
+own throwaway $HOME, and compares exit code, stdout, stderr and what they
+leave behind: the files in ~/.claude, structured log records and cost
+ledger records (timestamps dropped). The token tracker is left out (it
+flushes in the background); both paths enqueue the same payload.
+
+Usage:
+    python3 -m pytest tests/test_hook_parity.py -q
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HOOKS_DIR = BASE_DIR / "config" / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from cost_ledger import CostLedger  # noqa: E402
+from log_writer import LogWriter  # noqa: E402
+
+LOGS = ("sessions.jsonl", "agent-usage.jsonl")
+
+# (shell hook, dispatcher event, payload, agent marker before the call)
+CASES = [
+    ("session-start.sh", "SessionStart", {}, "Backend"),
+    ("track-agent.sh", "UserPromptSubmit", {"message": "/role-backend implement the retry logic"}, None),
+    ("track-agent.sh", "UserPromptSubmit", {"message": "what does this do?"}, "Frontend"),
+    ("safety-check.sh", "PreToolUse", {"tool": "Bash", "arguments": {"command": "ls -la src/"}}, None),
+    ("safety-check.sh", "PreToolUse", {"tool": "Bash", "arguments": {"command": "rm -rf /"}}, None),
+    ("safety-check.sh", "PreToolUse", {"tool": "Bash", "arguments": {"command": "sudo apt install jq"}}, None),
+    ("safety-check.sh", "PreToolUse", {"tool": "Write", "arguments": {"file_path": "app/.env"}}, None),
+    ("safety-check.sh", "PreToolUse", {"tool": "Edit", "arguments": {"file_path": "app/main.py"}}, None),
+    ("cost-alert.sh", "Stop", {"session_id": "s1", "model": {"display_name": "Sonnet 3.5"},
+                               "cost": {"total": 0.42}}, "Backend"),
+    ("cost-alert.sh", "Stop", {"session_id": "s2", "model": {"id": "claude-opus-4"},
+                               "cost": {"total": 12.5}}, None),
+    ("session-end.sh", "SessionEnd", {"session_id": "s1", "duration": 720, "cost": {"total": 0.42}}, "Backend"),
+    ("session-end.sh", "SessionEnd", {"session_id": "s3"}, None),
+]
+
+
+def sandbox(root, agent):
+    """Throwaway $HOME + project dir; returns (env, cwd)."""
+    home = root / "home"
+    project = root / "book-cataloger"
+    (home / ".claude").mkdir(parents=True)
+    project.mkdir()
+    if agent:
+        (home / ".claude" / ".current_agent").write_text(f"{agent}\n")
+    env = {
+        **os.environ,
+        "HOME": str(home),
+        "CLAUDE_FRAMEWORK_ROOT": str(root / "no-framework"),
+        "CLAUDE_MONITORING_DIR": str(home / ".claude" / "monitoring"),
+        "CLAUDE_SAFETY_SOCKET": str(home / ".claude" / ".safety.sock"),
+        "CLAUDE_HOOKS_SOCKET": str(home / ".claude" / ".hooks.sock"),
+    }
+    return env, project
+
+
+def run(cmd, payload, root, agent):
+    env, cwd = sandbox(root, agent)
+    result = subprocess.run(cmd, input=json.dumps(payload).encode("utf-8"), capture_output=True,
+                            env=env, cwd=cwd, timeout=60)
+    return {
+        "code": result.returncode,
+        "stdout": result.stdout.decode("utf-8"),
+        "stderr": result.stderr.decode("utf-8"),
+        **state(Path(env["HOME"]) / ".claude"),
+    }
+
+
+def state(claude):
+    """What a hook left behind, minus timestamps and generated file names."""
+    logs = claude / "logs"
+    records = {}
+    for name in LOGS:
+        lines = LogWriter(name, logs_dir=logs).read() if logs.is_dir() else []
+        records[name] = [{k: v for k, v in json.loads(line).items() if k != "ts"} for line in lines if line.strip()]
+    costs = [(agent, model, cost) for _, agent, model, cost in CostLedger(logs / "costs").records()]
+    marker = claude / ".current_agent"
+    return {
+        "entries": sorted(p.name for p in claude.iterdir()),
+        "records": records,
+        "costs": costs,
+        "agent": marker.read_text() if marker.exists() else None,
+    }
+
+
+@pytest.mark.skipif(not shutil.which("jq"), reason="shell hooks need jq")
+@pytest.mark.parametrize("script,event,payload,agent", CASES,
+                         ids=[f"{event}-{i}" for i, (_, event, _, _) in enumerate(CASES)])
+def test_dispatcher_matches_shell_hook(tmp_path, script, event, payload, agent):
+    shell = run([str(HOOKS_DIR / script)], payload, tmp_path / "shell", agent)
+    python = run([sys.executable, str(HOOKS_DIR / "hook_dispatcher.py"), event], payload, tmp_path / "python", agent)
+    assert python == shell